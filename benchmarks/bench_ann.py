@@ -0,0 +1,68 @@
+"""
+Recall and latency of the IVF index against exact search.
+
+Builds a clustered synthetic corpus incrementally (as load_source would),
+then compares IVF top-k with exact top-k for several nprobe values.
+
+    python -m benchmarks.bench_ann --rows 100000 --dim 768
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from src.vector_store.ann import IVFConfig
+from src.vector_store.local_index import LocalVectorIndex
+
+
+def timed_search(index: LocalVectorIndex, queries: np.ndarray, k: int):
+    results, timings = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append({row for row, _ in index.search(query, k)})
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return results, statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((256, args.dim), dtype=np.float32)
+    corpus = centers[rng.integers(0, 256, args.rows)]
+    corpus += 0.6 * rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    picked = rng.integers(0, args.rows, args.queries)
+    queries = corpus[picked] + 0.8 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    exact = LocalVectorIndex(args.dim)
+    ivf = LocalVectorIndex(args.dim, ann=IVFConfig(min_rows=10000))
+    build = 0.0
+    for offset in range(0, args.rows, args.batch):
+        ids = [str(row) for row in range(offset, min(offset + args.batch, args.rows))]
+        vectors = corpus[offset:offset + args.batch]
+        exact.add(ids, vectors, ids, [{}] * len(ids))
+        start = time.perf_counter()
+        ivf.add(ids, vectors, ids, [{}] * len(ids))
+        build += time.perf_counter() - start
+    print(f"ivf: {ivf._ann.centroids.shape[0]} lists, incremental build {build:.2f}s")
+
+    truth, p50, p95 = timed_search(exact, queries, args.k)
+    print(f"exact        recall@{args.k}=1.000 p50={p50 * 1000:.2f}ms p95={p95 * 1000:.2f}ms")
+    for nprobe in (1, 4, 8, 16, 32):
+        ivf._ann.config.nprobe = nprobe
+        found, p50, p95 = timed_search(ivf, queries, args.k)
+        recall = statistics.mean(len(a & b) / args.k for a, b in zip(found, truth))
+        print(f"ivf nprobe={nprobe:<3d}recall@{args.k}={recall:.3f} "
+              f"p50={p50 * 1000:.2f}ms p95={p95 * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Crawl time of WebsiteDataLoader against a local fixture site.
+
+Serves a tree of pages (each links to --fanout children and back to the
+root) from an in-process aiohttp server that waits --latency-ms before
+every response. First checks the crawler's behaviour on it: depth and
+max_pages limits, robots.txt rules, URL normalization and redirect
+de-duplication. Then crawls it with increasing concurrency.
+
+    python -m benchmarks.bench_crawler --depth 3 --fanout 5 --latency-ms 50
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+from src.data_loading.website_loader import CrawlerConfig, WebsiteDataLoader
+
+
+# Links of the start page that are spellings of, or redirects to, its
+# first children, plus one robots.txt forbids
+ALIASES = ['/p/0#top', '/p/./1', '/p/2?b=2&a=1', '/p/2?a=1&b=2', '/alias', '/private/secret']
+
+ROBOTS = """User-agent: slow-agent
+Crawl-delay: 1
+Disallow: /private
+
+User-agent: *
+Disallow: /private
+"""
+
+
+def fixture_app(fanout: int, latency: float) -> web.Application:
+    """Fixture site; app["hits"] logs (time, path and query) of each page request."""
+    hits = []
+
+    async def page(request: web.Request) -> web.Response:
+        hits.append((time.perf_counter(), request.path_qs))
+        await asyncio.sleep(latency)
+        path = request.match_info["path"]
+        children = "".join(f'<a href="/{path}/{child}">child {child}</a>' for child in range(fanout))
+        if path == "p":
+            children += "".join(f'<a href="{alias}">alias</a>' for alias in ALIASES)
+        body = f"<html><title>{path}</title><body><p>Page {path}</p>{children}<a href='/'>home</a></body></html>"
+        return web.Response(text=body, content_type="text/html")
+
+    async def root(request: web.Request) -> web.Response:
+        raise web.HTTPFound("/p")
+
+    async def alias(request: web.Request) -> web.Response:
+        raise web.HTTPFound("/p/0")
+
+    async def robots(request: web.Request) -> web.Response:
+        return web.Response(text=ROBOTS)
+
+    app = web.Application()
+    app["hits"] = hits
+    app.router.add_get("/robots.txt", robots)
+    app.router.add_get("/", root)
+    app.router.add_get("/alias", alias)
+    app.router.add_get("/{path:.+}", page)
+    return app
+
+
+async def crawl(start: str, session: aiohttp.ClientSession, **options) -> list:
+    config = options.pop("config", None) or CrawlerConfig(requests_per_second=0)
+    crawler = WebsiteDataLoader(start, config=config, session=session, **options)
+    return [doc.metadata["source"] async for doc in crawler.alazy_load()]
+
+
+async def check_behaviour(start: str, fanout: int, hits: list) -> None:
+    """Assert the crawl limits and rules on the fixture site, sharing one session."""
+    async with aiohttp.ClientSession() as session:
+        # depth=0 is the start page alone
+        assert await crawl(start, session, depth=0) == [start]
+
+        # Level 1: the children and home (which redirects back to the start
+        # page); every alias collapses onto a child, /private is skipped
+        hits.clear()
+        sources = await crawl(start, session, depth=1, max_pages=1000)
+        assert sorted(sources) == sorted([start] + [f"{start}/{child}" for child in range(fanout)] + [
+            f"{start}/2?a=1&b=2"
+        ]), sources
+        # Each spelling is requested once; only redirects ('/' and /alias)
+        # reach a page again, and that copy is dropped
+        requested = Counter(path for _, path in hits)
+        expected = Counter(["/p", "/p", "/p/0", "/p/2?a=1&b=2"] + [f"/p/{child}" for child in range(fanout)])
+        assert requested == expected, requested
+
+        # max_pages stops the crawl mid-level
+        assert len(await crawl(start, session, depth=3, max_pages=4)) == 4
+
+        # Crawl-delay spaces the requests of the agent it names
+        hits.clear()
+        config = CrawlerConfig(requests_per_second=0, user_agent="slow-agent")
+        assert len(await crawl(start, session, depth=1, max_pages=3, config=config)) == 3
+        times = sorted(at for at, _ in hits)
+        assert all(b - a >= 0.9 for a, b in zip(times, times[1:])), f"Crawl-delay ignored: {times}"
+
+        # An injected session is left open for its owner
+        assert not session.closed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    if args.fanout < 3:
+        parser.error("--fanout must be at least 3, the children the start page's aliases point to")
+
+    runner = web.AppRunner(fixture_app(args.fanout, args.latency_ms / 1000))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        await check_behaviour(f"http://127.0.0.1:{port}/p", args.fanout, runner.app["hits"])
+        print("behaviour checks passed")
+        for concurrency in (1, 4, 16, 64):
+            crawler = WebsiteDataLoader(
+                f"http://127.0.0.1:{port}/p",
+                max_pages=10000,
+                depth=args.depth,
+                config=CrawlerConfig(
+                    max_concurrency=concurrency,
+                    per_host_concurrency=concurrency,
+                    requests_per_second=0
+                )
+            )
+            start = time.perf_counter()
+            depths = [doc.metadata["source"].count("/") - 3 async for doc in crawler.alazy_load()]
+            elapsed = time.perf_counter() - start
+            assert depths == sorted(depths), "pages must arrive level by level"
+            print(f"concurrency={concurrency:<3d} pages={len(depths)} max_depth={max(depths)} "
+                  f"time={elapsed:.2f}s ({len(depths) / elapsed:.0f} pages/s)")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
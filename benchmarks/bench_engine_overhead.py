@@ -0,0 +1,91 @@
+"""
+Per-request overhead of the RAG pipeline outside of model time.
+
+Compares the legacy path (compile a StateGraph and build a ChatOllama client
+for every question) with a long-lived RAGEngine. Embeddings and the chat
+model are replaced by in-process fakes so the numbers only contain
+framework overhead; no Ollama, Redis or Qdrant server is needed.
+
+    python -m benchmarks.bench_engine_overhead --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.graph import START, StateGraph
+
+from src.llm.llm_chain import initialize_model_llm
+from src.rag.engine import RAGEngine, RAGEngineConfig, State
+from src.vector_store.in_memory import InMemoryVectorStoreManager
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+def _build_engine(llm):
+    embeddings = DeterministicFakeEmbedding(size=768)
+    engine = RAGEngine(
+        RAGEngineConfig(score_threshold=-1.0, warm_up_llm=False),
+        embeddings=embeddings,
+        llm=llm,
+        vector_store_manager=InMemoryVectorStoreManager(embeddings),
+    )
+    engine.vector_store.add_documents([
+        Document(page_content=f"chunk {i}", metadata={"source": "bench"})
+        for i in range(100)
+    ])
+    return engine
+
+
+async def run_legacy(engine, question, requests):
+    """Rebuild the graph and the Ollama client for every question."""
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        initialize_model_llm("deepseek-r1")
+        graph_builder = StateGraph(State).add_sequence([engine.retrieve, engine.generate])
+        graph_builder.add_edge(START, "retrieve")
+        graph = graph_builder.compile()
+        await graph.ainvoke({"question": question})
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run_engine(engine, question, requests):
+    """Reuse the compiled graph and clients owned by the engine."""
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await engine.ask(question)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def amain():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = _build_engine(FakeListChatModel(responses=["answer"]))
+    question = "what is chunk 42?"
+
+    # Discard the first calls of each path (imports, lazy initialisation)
+    await run_legacy(engine, question, 5)
+    await run_engine(engine, question, 5)
+
+    for name, runner in (("legacy", run_legacy), ("engine", run_engine)):
+        stats = _percentiles(await runner(engine, question, args.requests))
+        print(f"{name:>7}: p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
@@ -0,0 +1,98 @@
+"""
+Peak memory and time-to-first-searchable-chunk of the streaming ingestion
+pipeline against the previous load-everything-then-split path.
+
+Generates --docs synthetic pages lazily and indexes them into a local store
+with a fake embedding model that sleeps --embed-ms per batch.
+
+    python -m benchmarks.bench_ingestion --docs 2000 --embed-ms 20
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.data_loading.text_splitter import split_text
+from src.ingestion import IngestionConfig, IngestionPipeline
+from src.vector_store.in_memory import LocalVectorStore
+
+
+class SlowEmbeddings(Embeddings):
+    def __init__(self, dim: int, latency: float):
+        self.dim = dim
+        self.latency = latency
+
+    def embed_documents(self, texts):
+        return np.random.default_rng(len(texts)).standard_normal((len(texts), self.dim)).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        await asyncio.sleep(self.latency)
+        return self.embed_documents(texts)
+
+
+def pages(count: int, words: int):
+    for page in range(count):
+        text = " ".join(f"w{page}x{word}" for word in range(words))
+        yield Document(page_content=text, metadata={"source": "bench", "page": page})
+
+
+async def first_searchable(store: LocalVectorStore, start: float) -> float:
+    while store.index is None or not len(store.index):
+        await asyncio.sleep(0.005)
+    return time.perf_counter() - start
+
+
+async def measure(name: str, ingest, store: LocalVectorStore):
+    tracemalloc.start()
+    start = time.perf_counter()
+    probe = asyncio.create_task(first_searchable(store, start))
+    await ingest()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:<10} chunks={len(store.index)} time={elapsed:.2f}s "
+          f"first_searchable={await probe:.2f}s peak_memory={peak / 1e6:.1f}MB")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--embed-ms", type=float, default=20)
+    args = parser.parse_args()
+    config = IngestionConfig(batch_size=64, max_in_flight=4)
+
+    store = LocalVectorStore(SlowEmbeddings(args.dim, args.embed_ms / 1000))
+
+    async def list_based():
+        documents = list(pages(args.docs, args.words))
+        splits = await asyncio.to_thread(split_text, documents)
+        slots = asyncio.Semaphore(config.max_in_flight)
+
+        async def add(batch):
+            async with slots:
+                await store.aadd_documents(batch)
+
+        size = config.batch_size
+        await asyncio.gather(*(add(splits[start:start + size]) for start in range(0, len(splits), size)))
+
+    await measure("list", list_based, store)
+
+    store = LocalVectorStore(SlowEmbeddings(args.dim, args.embed_ms / 1000))
+
+    async def streamed():
+        await IngestionPipeline(store, config).run(pages(args.docs, args.words))
+
+    await measure("pipeline", streamed, store)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
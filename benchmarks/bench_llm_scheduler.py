@@ -0,0 +1,95 @@
+"""
+A burst of questions against a saturated LLM, with and without the
+scheduler.
+
+The fake model serves --parallel generations at full speed and shares
+itself among more (like Ollama past OLLAMA_NUM_PARALLEL), each generation
+needing --generation-s seconds of a slot. Clients give up after
+--client-timeout seconds. --duplicates of the prompts repeat an earlier one.
+
+    python -m benchmarks.bench_llm_scheduler --burst 40 --parallel 2
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from src.llm.scheduler import LLMScheduler, SchedulerOverloaded
+
+
+class SharedModel:
+    def __init__(self, parallel: int, generation_seconds: float):
+        self.parallel = parallel
+        self.generation_seconds = generation_seconds
+        self.active = 0
+        self.generations = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.active += 1
+        self.generations += 1
+        try:
+            done, tick = 0.0, 0.01
+            while done < self.generation_seconds:
+                await asyncio.sleep(tick)
+                done += tick * min(1.0, self.parallel / self.active)
+            return f"answer to {prompt}"
+        finally:
+            self.active -= 1
+
+
+async def burst(name: str, ask, model: SharedModel, prompts, args) -> None:
+    outcomes = {"answered": 0, "rejected": 0, "timed_out": 0}
+    latencies = []
+
+    async def one(prompt: str):
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(ask(prompt), args.client_timeout)
+        except SchedulerOverloaded:
+            outcomes["rejected"] += 1
+        except asyncio.TimeoutError:
+            outcomes["timed_out"] += 1
+        else:
+            outcomes["answered"] += 1
+            latencies.append(time.perf_counter() - start)
+
+    model.generations = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one(prompt) for prompt in prompts))
+    p50 = f"{np.percentile(latencies, 50):.2f}s" if latencies else "-"
+    print(f"{name:<10} {outcomes} generations={model.generations} "
+          f"answer_p50={p50} wall={time.perf_counter() - start:.2f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=40)
+    parser.add_argument("--parallel", type=int, default=2)
+    parser.add_argument("--generation-s", type=float, default=0.5)
+    parser.add_argument("--client-timeout", type=float, default=6.0)
+    parser.add_argument("--duplicates", type=float, default=0.25)
+    parser.add_argument("--max-queue", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    prompts = []
+    for number in range(args.burst):
+        repeat = prompts and rng.random() < args.duplicates
+        prompts.append(rng.choice(prompts) if repeat else f"question {number}")
+
+    model = SharedModel(args.parallel, args.generation_s)
+    await burst("direct", model.generate, model, prompts, args)
+
+    scheduler = LLMScheduler(args.parallel, args.max_queue, args.client_timeout - args.generation_s)
+
+    async def scheduled(prompt: str):
+        return await scheduler.run(prompt, lambda: model.generate(prompt))
+
+    await burst("scheduled", scheduled, model, prompts, args)
+    print(f"scheduler {scheduler.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""
+Search latency of the in-process NumPy vector index.
+
+Fills a LocalVectorIndex with random unit vectors and times exact cosine
+top-k queries.
+
+    python -m benchmarks.bench_local_index --rows 100000 --dim 768
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from src.vector_store.local_index import LocalVectorIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = LocalVectorIndex(args.dim)
+
+    start = time.perf_counter()
+    batch = 10000
+    for offset in range(0, args.rows, batch):
+        count = min(batch, args.rows - offset)
+        index.add(
+            [str(offset + i) for i in range(count)],
+            rng.standard_normal((count, args.dim), dtype=np.float32),
+            [""] * count,
+            [{"source": f"doc-{(offset + i) % 100}"} for i in range(count)]
+        )
+    print(f"inserted {args.rows} rows in {time.perf_counter() - start:.2f}s")
+
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, args.k)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"search k={args.k}: p50={statistics.median(timings) * 1000:.2f}ms "
+          f"p95={timings[int(len(timings) * 0.95) - 1] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput of sequential and process-pool PDF extraction.
+
+Writes --files synthetic PDFs of --pages text pages each to a temporary
+directory, then loads the directory with MultiplePDFLoader for each worker
+count.
+
+    python -m benchmarks.bench_pdf --files 40 --pages 50 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from src.data_loading.pdf_loader import MultiplePDFLoader, PDFLoaderConfig
+
+
+def write_pdf(path: str, pages: int, lines: int = 45) -> None:
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica")
+    })
+    for number in range(pages):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        text = "".join(
+            f"({os.path.basename(path)} page {number} line {line} lorem ipsum dolor sit amet) Tj T* "
+            for line in range(lines)
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 10 Tf 14 TL 40 760 Td {text} ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, "wb") as handle:
+        writer.write(handle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for number in range(args.files):
+            write_pdf(os.path.join(directory, f"manual{number:03d}.pdf"), args.pages)
+        print(f"{args.files} files x {args.pages} pages, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in args.workers:
+            loader = MultiplePDFLoader(directory, PDFLoaderConfig(workers=workers))
+            start = time.perf_counter()
+            pages = sum(1 for _ in loader.iter_documents())
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3d} pages={pages} time={elapsed:.2f}s "
+                  f"({pages / elapsed:.0f} pages/s, {baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
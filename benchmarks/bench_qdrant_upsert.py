@@ -0,0 +1,119 @@
+"""
+Upsert throughput of AsyncQdrantVectorStore: one blocking request per
+ingestion batch (the previous write path) against batched, parallel
+upserts with wait=False and a final aflush barrier.
+
+Runs against Qdrant's local mode by default, so it needs no server; pass
+--url (and --grpc) to measure a real instance, where transport, request
+size and waiting for the update to be applied actually cost time.
+
+    python -m benchmarks.bench_qdrant_upsert --points 20000 --dim 768
+    python -m benchmarks.bench_qdrant_upsert --url http://localhost:6333 --grpc
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+from src.vector_store.qdrant import AsyncQdrantVectorStore
+
+COLLECTION = "bench_upsert"
+
+
+class FixedEmbeddings(Embeddings):
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        return np.zeros((len(texts), self.dim), dtype=np.float32).tolist()
+
+    def embed_query(self, text):
+        return [0.0] * self.dim
+
+
+def clients(args):
+    if args.url:
+        transport = {"url": args.url, "prefer_grpc": args.grpc}
+        return QdrantClient(**transport), AsyncQdrantClient(**transport)
+    # Local mode keeps one in-process store per client, so both get the collection
+    return QdrantClient(":memory:"), AsyncQdrantClient(":memory:")
+
+
+async def reset(client: QdrantClient, async_client: AsyncQdrantClient, dim: int, local: bool) -> None:
+    config = models.VectorParams(size=dim, distance=models.Distance.COSINE)
+    client.delete_collection(COLLECTION)
+    client.create_collection(COLLECTION, vectors_config=config)
+    if local:
+        await async_client.delete_collection(COLLECTION)
+        await async_client.create_collection(COLLECTION, vectors_config=config)
+
+
+async def measure(name: str, store: AsyncQdrantVectorStore, batches, wait: bool, args) -> None:
+    await reset(store.client, store._async_client, args.dim, not args.url)
+    start = time.perf_counter()
+    for documents, ids, vectors in batches:
+        await store.aadd_embeddings(documents, ids, vectors, wait=wait)
+    if not wait:
+        await store.aflush(documents[-1], ids[-1], vectors[-1])
+    elapsed = time.perf_counter() - start
+    count = (await store._async_client.count(COLLECTION, exact=True)).count
+    print(f"{name:<34} points={count} time={elapsed:.2f}s ({args.points / elapsed:,.0f} points/s)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--ingest-batch", type=int, default=64, help="Chunks per aadd_embeddings call")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--url", default=None, help="Qdrant server; local mode when omitted")
+    parser.add_argument("--grpc", action="store_true", help="Use gRPC with --url")
+    args = parser.parse_args()
+
+    client, async_client = clients(args)
+    await reset(client, async_client, args.dim, not args.url)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.points, args.dim), dtype=np.float32).tolist()
+    documents = [
+        Document(page_content=f"chunk {row}", metadata={"source": f"doc{row // 50}", "page": row // 10})
+        for row in range(args.points)
+    ]
+    ids = [str(uuid.uuid5(uuid.NAMESPACE_URL, str(row))) for row in range(args.points)]
+    size = args.ingest_batch
+    per_batch = [
+        (documents[start:start + size], ids[start:start + size], vectors[start:start + size])
+        for start in range(0, args.points, size)
+    ]
+    whole = [(documents, ids, vectors)]
+
+    def store(batch_size: int, parallel: int) -> AsyncQdrantVectorStore:
+        return AsyncQdrantVectorStore(
+            async_client=async_client,
+            upsert_batch_size=batch_size,
+            upsert_parallel=parallel,
+            client=client,
+            collection_name=COLLECTION,
+            embedding=FixedEmbeddings(args.dim)
+        )
+
+    print(f"target={args.url or 'local mode'} grpc={bool(args.url and args.grpc)} "
+          f"points={args.points} dim={args.dim}")
+    unbatched = store(args.points, 1)
+    batched = store(args.batch_size, args.parallel)
+    await measure(f"pipeline batches of {size}, wait", unbatched, per_batch, True, args)
+    await measure(f"pipeline batches of {size}, no wait", batched, per_batch, False, args)
+    await measure("bulk, one request, wait", unbatched, whole, True, args)
+    await measure(f"bulk, {args.batch_size} x {args.parallel}, no wait", batched, whole, False, args)
+
+    client.close()
+    await async_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+Recall and latency of the local index with and without quantization.
+
+Builds the same clustered synthetic corpus (embeddings are far from
+uniformly distributed) into a LocalVectorIndex per quantization mode and
+compares top-k against exact search. Queries are noisy copies of corpus
+rows, like a question close to a chunk.
+
+    python -m benchmarks.bench_quantization --rows 100000 --dim 768
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from src.vector_store.local_index import LocalVectorIndex
+
+MODES = [
+    ("none", True),
+    ("scalar", False),
+    ("scalar", True),
+    ("binary", False),
+    ("binary", True),
+]
+
+
+def clustered(rng, rows: int, dim: int, clusters: int = 256) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, rows)
+    return centers[labels] + 0.6 * rng.standard_normal((rows, dim), dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--oversampling", type=float, default=4.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    corpus = clustered(rng, args.rows, args.dim)
+    picked = rng.integers(0, args.rows, args.queries)
+    queries = corpus[picked] + 0.8 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    ids = [str(row) for row in range(args.rows)]
+    payload = [{}] * args.rows
+
+    truth = None
+    for quantization, rescore in MODES:
+        index = LocalVectorIndex(
+            args.dim,
+            initial_capacity=args.rows,
+            quantization=quantization,
+            rescore=rescore,
+            oversampling=args.oversampling
+        )
+        index.add(ids, corpus, ids, payload)
+
+        results, timings = [], []
+        for query in queries:
+            start = time.perf_counter()
+            results.append({row for row, _ in index.search(query, args.k)})
+            timings.append(time.perf_counter() - start)
+        if truth is None:
+            truth = results
+        recall = statistics.mean(len(found & exact) / args.k for found, exact in zip(results, truth))
+
+        memory = sum(matrix.nbytes for matrix in index._codes.values()) or index._vectors.nbytes
+        timings.sort()
+        label = f"{quantization}{' +rescore' if rescore and quantization != 'none' else ''}"
+        print(f"{label:16s} recall@{args.k}={recall:.3f} "
+              f"p50={statistics.median(timings) * 1000:.2f}ms "
+              f"p95={timings[int(len(timings) * 0.95) - 1] * 1000:.2f}ms "
+              f"scan={memory / 2 ** 20:.0f}MiB")
+
+
+if __name__ == "__main__":
+    main()
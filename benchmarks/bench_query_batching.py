@@ -0,0 +1,110 @@
+"""
+Retrieval throughput with and without query micro-batching.
+
+Fires --queries dense searches, --concurrency at a time, at a local store
+of --rows chunks. The fake embedding model costs --embed-ms per request
+plus --embed-ms-per-text per text and serves --embed-parallel requests at
+a time, like an Ollama server with OLLAMA_NUM_PARALLEL slots, and counts
+its requests.
+
+    python -m benchmarks.bench_query_batching --rows 50000 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.rag.query_batcher import QueryBatcher
+from src.vector_store.in_memory import LocalVectorStore
+
+
+class ServerEmbeddings(Embeddings):
+    def __init__(self, dim: int, latency: float, per_text: float, parallel: int):
+        self.dim = dim
+        self.slots = asyncio.Semaphore(parallel)
+        self.latency = latency
+        self.per_text = per_text
+        self.requests = 0
+
+    def embed_documents(self, texts):
+        return [
+            np.random.default_rng(abs(hash(text)) % 2**32).standard_normal(self.dim).tolist()
+            for text in texts
+        ]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        self.requests += 1
+        async with self.slots:
+            await asyncio.sleep(self.latency + self.per_text * len(texts))
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return (await self.aembed_documents([text]))[0]
+
+
+async def run(name: str, search, embeddings: ServerEmbeddings, args) -> None:
+    slots = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(number: int):
+        async with slots:
+            start = time.perf_counter()
+            await search(f"question {number}")
+            latencies.append(time.perf_counter() - start)
+
+    embeddings.requests = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one(number) for number in range(args.queries)))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {args.queries / elapsed:8.1f} queries/s  "
+          f"p50={np.percentile(latencies, 50) * 1000:6.1f}ms  p95={np.percentile(latencies, 95) * 1000:6.1f}ms  "
+          f"embedding_requests={embeddings.requests}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--embed-ms", type=float, default=10)
+    parser.add_argument("--embed-ms-per-text", type=float, default=0.5)
+    parser.add_argument("--embed-parallel", type=int, default=4)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    embeddings = ServerEmbeddings(args.dim, args.embed_ms / 1000, args.embed_ms_per_text / 1000, args.embed_parallel)
+    store = LocalVectorStore(embeddings)
+    rng = np.random.default_rng(0)
+    documents = [Document(page_content=f"chunk {row}", metadata={"source": f"doc{row // 100}"}) for row in range(args.rows)]
+    await store.aadd_embeddings(
+        documents,
+        [str(row) for row in range(args.rows)],
+        rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    )
+    search = {"k": args.k, "score_threshold": None, "filter": None}
+
+    async def direct(question: str):
+        return await store.asimilarity_search_with_score(question, **search)
+
+    batcher = QueryBatcher(embeddings, args.window_ms, args.batch_size)
+
+    async def batched(question: str):
+        return await batcher.search(store, question, search)
+
+    assert await direct("check") == await batched("check")
+    await run("direct", direct, embeddings, args)
+    await run("batched", batched, embeddings, args)
+    print(f"batcher {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,38 +1,170 @@
 # src/app.py
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Literal, Optional
+
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from src.rag.rag_pipeline import create_and_run_graph, load_source
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from src.llm.scheduler import PRIORITY_NORMAL, SchedulerOverloaded
+from src.rag.engine import RAGEngine, RetrievalOptions
+from src.rag.rag_pipeline import create_and_run_graph, get_engine, refresh_sources, set_engine, stream_graph
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the RAG engine once and share it across requests."""
+    engine = RAGEngine()
+    await engine.warm_up()
+    await engine.start_jobs()
+    set_engine(engine)
+    app.state.engine = engine
+    try:
+        yield
+    finally:
+        set_engine(None)
+        await engine.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def overloaded(e: SchedulerOverloaded) -> HTTPException:
+    """503 telling the client when to retry."""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
-app = FastAPI()
 
 class SourceLoadRequest(BaseModel):
     source: str
+    refresh: bool = False
+    namespace: Optional[str] = None
+
+class BulkLoadRequest(BaseModel):
+    sources: List[str] = Field(..., min_length=1)
+    refresh: bool = False
+    namespace: Optional[str] = None
+    fanout: Optional[int] = Field(None, ge=1)
 
 class QuestionRequest(BaseModel):
     question: str
+    k: Optional[int] = Field(None, ge=1, le=100)
+    score_threshold: Optional[float] = None
+    sources: Optional[List[str]] = None
+    filter: Optional[Dict[str, Any]] = None
+    namespace: Optional[str] = None
+    priority: Literal["high", "normal", "low"] = PRIORITY_NORMAL
+
+    def retrieval_options(self) -> RetrievalOptions:
+        return RetrievalOptions(self.k, self.score_threshold, self.sources, self.filter, self.namespace)
 
-@app.post("/load")
+@app.post("/load", status_code=202)
 async def load_source_endpoint(request: SourceLoadRequest):
     """
-    Load a document source.
+    Queue a document source for loading and return its job ID; follow it
+    with GET /jobs/{id}. With `refresh`, re-index an already loaded source
+    if it changed. With `namespace`, the source goes into that tenant's or
+    session's own collection.
     """
-    try:
-        load_source(request.source)
-        return {"message": "Source loaded successfully!"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    job = await get_engine().jobs.submit(request.source, refresh=request.refresh, namespace=request.namespace)
+    return {"message": "Source load queued.", "job_id": job.id, "status": job.status}
+
+@app.post("/load/bulk", status_code=202)
+async def bulk_load_endpoint(request: BulkLoadRequest):
+    """
+    Queue many sources at once. Duplicates, invalid sources and (without
+    `refresh`) sources already loaded are found with one batched check
+    and reported straight away; every other source gets its own job.
+    `fanout` of them (default LOAD_FANOUT) run at once.
+    """
+    results = await get_engine().queue_sources(
+        request.sources, refresh=request.refresh, namespace=request.namespace, fanout=request.fanout
+    )
+    return {"results": results}
+
+@app.get("/jobs/{job_id}")
+async def job_endpoint(job_id: str):
+    """
+    Status of a load job: stage, documents and chunks processed,
+    throughput, and the result or error once it finished.
+    """
+    job = await get_engine().jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    """
+    Cancel a queued or running load job.
+    """
+    job = await get_engine().jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return job.to_dict()
+
+@app.post("/refresh")
+async def refresh_sources_endpoint(namespace: Optional[str] = None):
+    """
+    Refresh every loaded source, re-indexing only those that changed.
+    """
+    return {"results": await refresh_sources(namespace)}
 
 @app.post("/ask")
 async def ask_question_endpoint(request: QuestionRequest):
     """
-    Ask a question about the loaded source.
+    Ask a question about the loaded source. `k`, `score_threshold`,
+    `sources` and a metadata `filter` (key -> value or list of values)
+    override the retrieval defaults for this question; `namespace` selects
+    a tenant's or session's collection. `priority` orders the question in
+    the LLM queue; when the queue is full the answer is a 503 with a
+    Retry-After header.
     """
     try:
-        answer = create_and_run_graph(request.question)
+        answer = await create_and_run_graph(request.question, request.retrieval_options(), request.priority)
         return {"answer": answer}
+    except SchedulerOverloaded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ask/stream")
+async def ask_question_stream_endpoint(request: QuestionRequest):
+    """
+    Ask a question and stream the answer as Server-Sent Events.
+
+    Emits a `sources` event with the retrieved chunk metadata, one `token`
+    event per generated token, and a final `done` event with the full answer.
+    Rejected with a 503 before streaming starts when the LLM queue is full.
+    """
+    try:
+        get_engine().llm_scheduler.check()
+    except SchedulerOverloaded as e:
+        raise overloaded(e)
+
+    async def event_stream():
+        try:
+            async for event, data in stream_graph(request.question, request.retrieval_options(), request.priority):
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.get("/sources")
+async def sources_endpoint(namespace: Optional[str] = None):
+    """
+    List the indexed sources with their chunk counts and ingest times.
+    """
+    return await get_engine().sources(namespace)
+
+@app.get("/stats")
+async def stats_endpoint():
+    """
+    Runtime counters (embedding cache hits and misses, LLM queue depth and
+    wait times, ...).
+    """
+    return get_engine().stats()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
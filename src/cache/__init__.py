@@ -1,5 +1,6 @@
 from .factory import (
     get_redis_client, 
+    get_async_redis_client,
     is_url_cached, 
     cache_url,
     CacheFactory, 
@@ -7,9 +8,11 @@ from .factory import (
 )
 from .base import BaseCacheManager, CacheConfig
 from .redis_cache import RedisCacheConfig, RedisCacheManager
+from .disk_cache import DiskCacheConfig, DiskCacheManager
 
 __all__ = [
     'get_redis_client',
+    'get_async_redis_client',
     'is_url_cached',
     'cache_url',
     'CacheFactory',
@@ -17,5 +20,7 @@ __all__ = [
     'BaseCacheManager',
     'CacheConfig',
     'RedisCacheConfig',
-    'RedisCacheManager'
+    'RedisCacheManager',
+    'DiskCacheConfig',
+    'DiskCacheManager'
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 class CacheConfig:
     """Configuration class for cache settings."""
@@ -9,6 +9,7 @@ class CacheConfig:
         host: str = "localhost", 
         port: int = 6379,
         decode_responses: bool = True,
+        max_entries: Optional[int] = None,
         **kwargs
     ):
         """
@@ -18,11 +19,14 @@ class CacheConfig:
             host (str): Cache server host.
             port (int): Cache server port.
             decode_responses (bool): Whether to decode responses.
+            max_entries (Optional[int]): Upper bound on entries written through
+                set_many; least recently used entries are evicted beyond it.
             **kwargs: Additional configuration parameters.
         """
         self.host = host
         self.port = port
         self.decode_responses = decode_responses
+        self.max_entries = max_entries
         self.extra_params = kwargs
 
 class BaseCacheManager(ABC):
@@ -105,4 +109,50 @@ class BaseCacheManager(ABC):
             int: Number of keys deleted.
         """
         pass
-    
\ No newline at end of file
+
+    def exists_many(self, keys: List[str]) -> List[bool]:
+        """
+        Check several keys.
+        
+        Args:
+            keys (List[str]): Keys to check.
+        
+        Returns:
+            List[bool]: Whether each key is cached, in key order.
+        """
+        return [bool(self.is_cached(key)) for key in keys]
+    
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Retrieve several cached values.
+        
+        Args:
+            keys (List[str]): Keys to retrieve.
+        
+        Returns:
+            List[Optional[str]]: Values in key order, None where missing.
+        """
+        return [self.get(key) for key in keys]
+    
+    def set_many(self, mapping: Dict[str, str]) -> None:
+        """
+        Cache several key-value pairs.
+        
+        Args:
+            mapping (Dict[str, str]): Values to cache by key.
+        """
+        for key, value in mapping.items():
+            self.cache(key, value)
+
+    @abstractmethod
+    def keys(self, prefix: str = "") -> List[str]:
+        """
+        List the keys starting with a prefix.
+        
+        Args:
+            prefix (str): Key prefix.
+        
+        Returns:
+            List[str]: Matching keys.
+        """
+        pass
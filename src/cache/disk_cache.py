@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .base import BaseCacheManager, CacheConfig
+
+
+class DiskCacheConfig(CacheConfig):
+    """Configuration specific to the on-disk cache."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Initialize on-disk cache configuration.
+
+        Args:
+            path (Optional[str]): SQLite database file. Falls back to
+                DISK_CACHE_PATH (default ".cache/cache.sqlite3").
+            max_entries (Optional[int]): Upper bound on stored entries. Falls
+                back to DISK_CACHE_MAX_ENTRIES (default 100000); 0 disables
+                eviction.
+            **kwargs: Additional configuration parameters.
+        """
+        super().__init__(
+            max_entries=(
+                max_entries if max_entries is not None
+                else int(os.getenv("DISK_CACHE_MAX_ENTRIES", 100000))
+            ),
+            **kwargs
+        )
+        self.path = path or os.getenv("DISK_CACHE_PATH", ".cache/cache.sqlite3")
+
+
+class DiskCacheManager(BaseCacheManager):
+    """
+    Manager for a local SQLite-backed cache.
+
+    Entries carry a last-access timestamp; once more than max_entries are
+    stored, the least recently used ones are evicted.
+    """
+
+    def _create_client(self) -> sqlite3.Connection:
+        """
+        Open (and initialise) the SQLite database.
+
+        Returns:
+            sqlite3.Connection: Connection shared by all threads.
+        """
+        directory = os.path.dirname(self._config.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        connection = sqlite3.connect(self._config.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        connection.commit()
+        return connection
+
+    def is_cached(self, key: str) -> bool:
+        """
+        Check if a key is cached on disk.
+
+        Args:
+            key (str): Key to check.
+
+        Returns:
+            bool: True if key exists, False otherwise.
+        """
+        with self._lock:
+            row = self._client.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def cache(self, key: str, value: Optional[str] = None, **kwargs) -> None:
+        """
+        Cache a key-value pair on disk.
+
+        Args:
+            key (str): Key to cache.
+            value (Optional[str]): Value to cache. Defaults to "cached".
+            **kwargs: Unused, accepted for interface compatibility.
+        """
+        self.set_many({key: value or "cached"})
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retrieve a cached value from disk.
+
+        Args:
+            key (str): Key to retrieve.
+
+        Returns:
+            Optional[str]: Cached value or None if not found.
+        """
+        return self.get_many([key])[0]
+
+    def exists_many(self, keys: List[str]) -> List[bool]:
+        """
+        Check several keys in one query per 500 keys.
+
+        Args:
+            keys (List[str]): Keys to check.
+
+        Returns:
+            List[bool]: Whether each key is cached, in key order.
+        """
+        found = set()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(key for key, in self._client.execute(
+                    f"SELECT key FROM entries WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall())
+        return [key in found for key in keys]
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Retrieve several values in one query and refresh their recency.
+
+        Args:
+            keys (List[str]): Keys to retrieve.
+
+        Returns:
+            List[Optional[str]]: Values in key order, None where missing.
+        """
+        if not keys:
+            return []
+        found: Dict[str, str] = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._client.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall())
+            if found:
+                now = time.time()
+                self._client.executemany(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._client.commit()
+        return [found.get(key) for key in keys]
+
+    def set_many(self, mapping: Dict[str, str]) -> None:
+        """
+        Cache several key-value pairs and evict beyond max_entries.
+
+        Args:
+            mapping (Dict[str, str]): Values to cache by key.
+        """
+        if not mapping:
+            return
+        now = time.time()
+        with self._lock:
+            self._client.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, accessed) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in mapping.items()]
+            )
+            if self._config.max_entries:
+                (count,) = self._client.execute("SELECT COUNT(*) FROM entries").fetchone()
+                overflow = count - self._config.max_entries
+                if overflow > 0:
+                    self._client.execute(
+                        "DELETE FROM entries WHERE key IN "
+                        "(SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                        (overflow,)
+                    )
+            self._client.commit()
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """
+        List the keys starting with a prefix, using the primary-key index.
+
+        Args:
+            prefix (str): Key prefix.
+
+        Returns:
+            List[str]: Matching keys in sorted order.
+        """
+        with self._lock:
+            rows = self._client.execute(
+                "SELECT key FROM entries WHERE key >= ? AND key < ? ORDER BY key",
+                (prefix, prefix + "\U0010ffff")
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def delete(self, key: str) -> None:
+        """
+        Delete a cached key from disk.
+
+        Args:
+            key (str): Key to delete.
+        """
+        with self._lock:
+            self._client.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._client.commit()
+
+    def delete_all(self) -> int:
+        """
+        Delete all entries from the on-disk cache.
+
+        Returns:
+            int: Number of keys deleted.
+        """
+        with self._lock:
+            deleted = self._client.execute("DELETE FROM entries").rowcount
+            self._client.commit()
+        return deleted
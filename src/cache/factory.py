@@ -1,12 +1,17 @@
+import threading
 from enum import Enum
-from typing import Optional, Any
+from typing import Dict, Optional, Any
+
+import redis.asyncio
 
 from .base import CacheConfig
+from .disk_cache import DiskCacheManager, DiskCacheConfig
 from .redis_cache import RedisCacheManager, RedisCacheConfig
 
 class CacheType(Enum):
     """Enum for cache types."""
     REDIS = "redis"
+    DISK = "disk"
     # Add more cache types as needed
 
 class CacheFactory:
@@ -31,7 +36,8 @@ class CacheFactory:
             ValueError: If unsupported cache type is requested.
         """
         managers = {
-            CacheType.REDIS: RedisCacheManager
+            CacheType.REDIS: RedisCacheManager,
+            CacheType.DISK: DiskCacheManager
         }
         
         manager_class = managers.get(cache_type)
@@ -40,10 +46,20 @@ class CacheFactory:
         
         # Use default config if not provided
         if config is None:
-            config = RedisCacheConfig()
+            config = (
+                DiskCacheConfig()
+                if cache_type == CacheType.DISK
+                else RedisCacheConfig()
+            )
         
         return manager_class(config)
 
+# Sync Redis clients by connection settings. A client owns a thread-safe
+# connection pool, so one per server is shared instead of reconnecting on
+# every call.
+_redis_clients: Dict[Any, Any] = {}
+_redis_clients_lock = threading.Lock()
+
 # Convenience functions
 def get_redis_client(
     host: Optional[str] = None, 
@@ -53,6 +69,9 @@ def get_redis_client(
     """
     Convenience function to get a Redis client.
     
+    Clients are shared per host, port and parameters, so repeated calls
+    reuse one connection pool.
+    
     Args:
         host (Optional[str]): Redis host.
         port (Optional[int]): Redis port.
@@ -67,14 +86,47 @@ def get_redis_client(
         port=port,
         **kwargs
     )
+    key = (config.host, config.port, repr(sorted(kwargs.items())))
     
-    # Create cache manager
-    manager = CacheFactory.create_cache_manager(
-        CacheType.REDIS,
-        config
+    with _redis_clients_lock:
+        client = _redis_clients.get(key)
+        if client is None:
+            # Create cache manager
+            manager = CacheFactory.create_cache_manager(
+                CacheType.REDIS,
+                config
+            )
+            client = _redis_clients[key] = manager._client
+    return client
+
+def get_async_redis_client(
+    host: Optional[str] = None, 
+    port: Optional[int] = None,
+    **kwargs
+) -> redis.asyncio.Redis:
+    """
+    Convenience function to get an asyncio Redis client.
+    
+    Args:
+        host (Optional[str]): Redis host.
+        port (Optional[int]): Redis port.
+        **kwargs: Additional Redis configuration parameters.
+    
+    Returns:
+        redis.asyncio.Redis: Async Redis client instance.
+    """
+    config = RedisCacheConfig(
+        host=host, 
+        port=port,
+        **kwargs
     )
     
-    return manager._client
+    return redis.asyncio.Redis(
+        host=config.host,
+        port=config.port,
+        decode_responses=config.decode_responses,
+        **config.extra_params
+    )
 
 def is_url_cached(client, url: str) -> bool:
     """
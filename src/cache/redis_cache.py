@@ -1,6 +1,8 @@
 import os
+import re
+import time
 import redis
-from typing import Optional, Any
+from typing import Dict, List, Optional, Any
 
 from .base import BaseCacheManager, CacheConfig
 
@@ -30,6 +32,9 @@ class RedisCacheConfig(CacheConfig):
 class RedisCacheManager(BaseCacheManager):
     """Manager for Redis cache."""
     
+    # Sorted set of keys written through set_many, scored by last access
+    LRU_INDEX_KEY = "cache:lru"
+    
     def _create_client(self) -> redis.Redis:
         """
         Create a Redis client.
@@ -113,4 +118,83 @@ class RedisCacheManager(BaseCacheManager):
             if keys:
                 return self._client.delete(*keys)
             
-            return 0
\ No newline at end of file
+            return 0
+    
+    def keys(self, prefix: str = "") -> List[str]:
+        """
+        List the keys starting with a prefix with SCAN, without blocking
+        Redis the way KEYS would.
+        
+        Args:
+            prefix (str): Key prefix.
+        
+        Returns:
+            List[str]: Matching keys.
+        """
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        return list(self._client.scan_iter(match=pattern, count=1000))
+    
+    def exists_many(self, keys: List[str]) -> List[bool]:
+        """
+        Check several keys with EXISTS in one pipelined round-trip.
+        
+        Args:
+            keys (List[str]): Keys to check.
+        
+        Returns:
+            List[bool]: Whether each key is cached, in key order.
+        """
+        if not keys:
+            return []
+        pipeline = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.exists(key)
+        return [bool(count) for count in pipeline.execute()]
+    
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Retrieve several values from Redis in one MGET round-trip.
+        
+        Args:
+            keys (List[str]): Keys to retrieve.
+        
+        Returns:
+            List[Optional[str]]: Values in key order, None where missing.
+        """
+        if not keys:
+            return []
+        values = self._client.mget(keys)
+        
+        # Refresh recency of hits so eviction stays least-recently-used
+        if self._config.max_entries:
+            now = time.time()
+            hits = {key: now for key, value in zip(keys, values) if value is not None}
+            if hits:
+                self._client.zadd(self.LRU_INDEX_KEY, hits, xx=True)
+        return values
+    
+    def set_many(self, mapping: Dict[str, str]) -> None:
+        """
+        Cache several key-value pairs in one pipelined round-trip.
+        
+        When max_entries is configured, the least recently used keys beyond
+        the bound are evicted in the same pipeline.
+        
+        Args:
+            mapping (Dict[str, str]): Values to cache by key.
+        """
+        if not mapping:
+            return
+        pipeline = self._client.pipeline(transaction=False)
+        pipeline.mset(mapping)
+        if self._config.max_entries:
+            now = time.time()
+            pipeline.zadd(self.LRU_INDEX_KEY, {key: now for key in mapping})
+            pipeline.zcard(self.LRU_INDEX_KEY)
+        results = pipeline.execute()
+        
+        if self._config.max_entries:
+            overflow = results[-1] - self._config.max_entries
+            if overflow > 0:
+                evicted = [key for key, _ in self._client.zpopmin(self.LRU_INDEX_KEY, overflow)]
+                self._client.delete(*evicted)
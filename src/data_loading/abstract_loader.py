@@ -1,6 +1,69 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterable, Iterator, Optional, Tuple
+
+from langchain_core.documents import Document
+
+_DONE = object()
+
+
+async def iterate_in_thread(documents: Iterable[Document]) -> AsyncIterator[Document]:
+    """
+    Iterate a blocking iterable from async code, one item per worker-thread call.
+
+    Args:
+        documents (Iterable[Document]): Iterable whose items may do I/O or
+            parsing when they are produced (e.g. a generator).
+
+    Yields:
+        Document: Items of the iterable, in order.
+    """
+    iterator = await asyncio.to_thread(iter, documents)
+    while True:
+        document = await asyncio.to_thread(next, iterator, _DONE)
+        if document is _DONE:
+            return
+        yield document
+
 
 class DataLoader(ABC):
     @abstractmethod
     def load(self):
         pass
+
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Yield the source's documents one at a time.
+
+        Loaders that can produce documents incrementally (page by page, file
+        by file) override this so callers never hold the whole source.
+
+        Yields:
+            Document: Loaded documents.
+        """
+        yield from self.load()
+
+    def aiter_documents(self) -> AsyncIterator[Document]:
+        """
+        Async variant of iter_documents; blocking loaders run in a worker thread.
+
+        Returns:
+            AsyncIterator[Document]: Loaded documents.
+        """
+        return iterate_in_thread(self.iter_documents())
+
+    def load_if_changed(self, fingerprint: Optional[dict] = None) -> Tuple[Optional[Iterable[Document]], Optional[dict]]:
+        """
+        Load the source unless it is unchanged since `fingerprint` was taken.
+
+        Loaders that cannot tell whether their source changed always load.
+
+        Args:
+            fingerprint (Optional[dict]): Fingerprint returned by a previous call.
+
+        Returns:
+            Tuple[Optional[Iterable[Document]], Optional[dict]]: Documents
+            (possibly a lazy iterator), or None when the source is unchanged,
+            and the source's current fingerprint.
+        """
+        return self.iter_documents(), None
@@ -1,10 +1,17 @@
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import logging
+import multiprocessing
 import os
 
 from src.data_loading.abstract_loader import DataLoader
+from src.data_loading import pdf_worker
 
 
 class PDFDataLoader(DataLoader):
@@ -41,6 +48,48 @@ class PDFDataLoader(DataLoader):
         except Exception as e:
             raise RuntimeError(f"Error loading PDF {self.file_path}: {str(e)}")
 
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Yield the PDF page by page, without parsing the whole file first.
+
+        Yields:
+            Document: One document per page.
+        """
+        try:
+            yield from self._loader.lazy_load()
+        except Exception as e:
+            raise RuntimeError(f"Error loading PDF {self.file_path}: {str(e)}")
+
+    def load_if_changed(self, fingerprint: Optional[dict] = None) -> Tuple[Optional[Iterator[Document]], dict]:
+        """
+        Load the PDF unless it is unchanged since the fingerprint was taken.
+
+        Same size and modification time means unchanged without reading the
+        file; otherwise its SHA-256 decides, so a touched but identical file
+        is not parsed again.
+
+        Args:
+            fingerprint (Optional[dict]): Fingerprint from the previous load.
+
+        Returns:
+            Tuple[Optional[Iterator[Document]], dict]: Pages, parsed lazily
+            (None if unchanged), and the file's current fingerprint.
+        """
+        fingerprint = fingerprint or {}
+        stat = os.stat(self.file_path)
+        current = {"mtime": stat.st_mtime, "size": stat.st_size}
+        if fingerprint.get("mtime") == current["mtime"] and fingerprint.get("size") == current["size"]:
+            return None, fingerprint
+
+        digest = hashlib.sha256()
+        with open(self.file_path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        current["sha256"] = digest.hexdigest()
+        if current["sha256"] == fingerprint.get("sha256"):
+            return None, current
+        return self.iter_documents(), current
+
 # Convenience function
 def load_pdf(file_path: str) -> List[Document]:
     """
@@ -55,16 +104,183 @@ def load_pdf(file_path: str) -> List[Document]:
     loader = PDFDataLoader(file_path)
     return loader.load()
 
+class PDFLoaderConfig:
+    """Configuration class for parallel PDF extraction."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        pages_per_task: int = 16
+    ):
+        """
+        Initialize PDF extraction configuration.
+
+        Args:
+            workers (Optional[int]): Extraction processes; 1 parses in the
+                calling process. Falls back to PDF_WORKERS (default: CPU count).
+            timeout (Optional[float]): Seconds a page range may take once it
+                is next in line before its file is given up. Falls back to
+                PDF_TIMEOUT (default 120).
+            pages_per_task (int): Pages extracted per worker task.
+        """
+        self.workers = workers or int(os.getenv("PDF_WORKERS", os.cpu_count() or 1))
+        self.timeout = timeout or float(os.getenv("PDF_TIMEOUT", 120))
+        self.pages_per_task = pages_per_task
+
+
+class _PageRange:
+    """One extraction task: pages [start, end) of a file."""
+
+    def __init__(self, file_path: str, start: int, end: int):
+        self.file_path = file_path
+        self.start = start
+        self.end = end
+        self.retried = False
+        self.future = None
+
+
+class ParallelPDFLoader(DataLoader):
+    """
+    Extracts PDF pages in a process pool and yields them lazily, in order.
+
+    Files are cut into page ranges that are extracted by `workers`
+    processes, so large and small PDFs alike spread over every core. At
+    most twice `workers` ranges are in flight and results are yielded in
+    file and page order as soon as the next one is ready, so memory holds
+    a few ranges' pages rather than whole files.
+
+    A file that raises, or a range that exceeds the timeout, is logged and
+    skipped; a hung or crashed worker is killed and the pool restarted
+    without losing the other ranges in flight.
+    """
+
+    def __init__(self, file_paths: Sequence[str], config: Optional[PDFLoaderConfig] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            file_paths (Sequence[str]): PDF files, loaded in this order.
+            config (Optional[PDFLoaderConfig]): Worker, timeout and task size settings.
+        """
+        self.file_paths = list(file_paths)
+        self.config = config or PDFLoaderConfig()
+
+    def load(self) -> List[Document]:
+        """
+        Load every page of every file.
+
+        Returns:
+            List[Document]: One document per page
+        """
+        return list(self.iter_documents())
+
+    def _ranges(self, failed: set) -> Iterator[_PageRange]:
+        for file_path in self.file_paths:
+            try:
+                page_count = pdf_worker.count_pages(file_path)
+            except Exception as e:
+                logging.error(f"Error loading {file_path}: {e}")
+                continue
+            for start in range(0, page_count, self.config.pages_per_task):
+                if file_path in failed:
+                    break
+                yield _PageRange(file_path, start, start + self.config.pages_per_task)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Not plain fork: loaders run in threads of an async app. A fork
+        # server imports the main module once and then forks cheap workers.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(
+            max_workers=self.config.workers,
+            mp_context=multiprocessing.get_context(method)
+        )
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor) -> None:
+        """Stop a pool without waiting for its running tasks."""
+        # ProcessPoolExecutor has no public way to kill busy workers before 3.14
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _restart(self, executor: ProcessPoolExecutor, in_flight: deque) -> ProcessPoolExecutor:
+        """Replace a broken or hung pool and resubmit the ranges in flight."""
+        self._terminate(executor)
+        executor = self._executor()
+        for task in in_flight:
+            task.future = executor.submit(pdf_worker.extract_pages, task.file_path, task.start, task.end)
+        return executor
+
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Yield the pages of every file, in order.
+
+        Yields:
+            Document: One document per page.
+        """
+        failed = set()
+        ranges = self._ranges(failed)
+        in_flight = deque()
+        executor = self._executor()
+        try:
+            while True:
+                while len(in_flight) < 2 * self.config.workers:
+                    task = next(ranges, None)
+                    if task is None:
+                        break
+                    task.future = executor.submit(pdf_worker.extract_pages, task.file_path, task.start, task.end)
+                    in_flight.append(task)
+                if not in_flight:
+                    return
+
+                task = in_flight.popleft()
+                if task.file_path in failed:
+                    task.future.cancel()
+                    continue
+                try:
+                    pages = task.future.result(timeout=self.config.timeout)
+                except TimeoutError:
+                    logging.error(f"Timed out loading {task.file_path} "
+                                  f"(pages {task.start + 1}-{task.end}); skipping the file")
+                    failed.add(task.file_path)
+                    executor = self._restart(executor, in_flight)
+                    continue
+                except BrokenProcessPool:
+                    # Some worker died; retry its range once in a fresh pool
+                    if task.retried:
+                        logging.error(f"Worker crashed loading {task.file_path}; skipping the file")
+                        failed.add(task.file_path)
+                    else:
+                        task.retried = True
+                        in_flight.appendleft(task)
+                    executor = self._restart(executor, in_flight)
+                    continue
+                except Exception as e:
+                    logging.error(f"Error loading {task.file_path}: {e}")
+                    failed.add(task.file_path)
+                    continue
+
+                for text, metadata in pages:
+                    yield Document(page_content=text, metadata=metadata)
+        finally:
+            self._terminate(executor)
+
+
 # Multiple PDF loader
 class MultiplePDFLoader(DataLoader):
-    def __init__(self, directory_path: str):
+    def __init__(self, directory_path: str, config: Optional[PDFLoaderConfig] = None):
         """
         Initialize loader for multiple PDFs in a directory.
         
         Args:
             directory_path (str): Path to directory containing PDFs
+            config (Optional[PDFLoaderConfig]): Parallel extraction settings;
+                with more than one worker, pages are extracted in a process pool
         """
         self.directory_path = directory_path
+        self.config = config or PDFLoaderConfig()
         
         # Validate directory exists
         if not os.path.isdir(directory_path):
@@ -77,21 +293,31 @@ class MultiplePDFLoader(DataLoader):
         Returns:
             List[Document]: Combined documents from all PDFs
         """
-        all_documents = []
-        
+        return list(self.iter_documents())
+
+    def iter_documents(self) -> Iterator[Document]:
+        """
+        Yield the pages of every PDF in the directory, in file name order.
+
+        Yields:
+            Document: One document per page.
+        """
+        file_paths = [
+            os.path.join(self.directory_path, filename)
+            for filename in sorted(os.listdir(self.directory_path))
+            if filename.lower().endswith('.pdf')
+        ]
+        if self.config.workers > 1:
+            yield from ParallelPDFLoader(file_paths, self.config).iter_documents()
+            return
+
         # Iterate through PDF files in the directory
-        for filename in os.listdir(self.directory_path):
-            if filename.lower().endswith('.pdf'):
-                file_path = os.path.join(self.directory_path, filename)
-                
-                try:
-                    # Load documents from each PDF
-                    pdf_documents = PDFDataLoader(file_path).load()
-                    all_documents.extend(pdf_documents)
-                except Exception as e:
-                    print(f"Error loading {filename}: {e}")
-        
-        return all_documents
+        for file_path in file_paths:
+            try:
+                # Load documents from each PDF
+                yield from PDFDataLoader(file_path).iter_documents()
+            except Exception as e:
+                print(f"Error loading {os.path.basename(file_path)}: {e}")
 
 # Convenience function for multiple PDFs
 def load_pdfs_from_directory(directory_path: str) -> List[Document]:
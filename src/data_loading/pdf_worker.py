@@ -0,0 +1,71 @@
+"""
+Page-range text extraction run in PDF worker processes.
+
+Imports nothing but pypdf, so spawned workers start quickly.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import pypdf
+
+# Defaults PyPDFParser gives documents whose PDF lacks the fields
+_DEFAULT_METADATA = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+
+# Keys PyPDFParser also stores under the names other parsers use
+_KEY_ALIASES = {"page_count": "total_pages", "file_path": "source"}
+
+
+def count_pages(file_path: str) -> int:
+    """Number of pages of a PDF, read from its page tree."""
+    return len(pypdf.PdfReader(file_path).pages)
+
+
+def document_metadata(reader: pypdf.PdfReader, file_path: str) -> Dict[str, Any]:
+    """
+    Document-level metadata of a PDF, normalized like langchain's
+    PyPDFParser: keys lowercased without the leading slash, dates in ISO
+    format, other values as stripped strings or ints.
+    """
+    metadata: Dict[str, Any] = {}
+    raw = {**_DEFAULT_METADATA, **(reader.metadata or {}), "source": file_path, "total_pages": len(reader.pages)}
+    for key, value in raw.items():
+        if type(value) not in (str, int):
+            value = str(value)
+        key = key[1:].lower() if key.startswith("/") else key.lower()
+        if key in ("creationdate", "moddate"):
+            try:
+                value = datetime.strptime(value.replace("'", ""), "D:%Y%m%d%H%M%S%z").isoformat("T")
+            except ValueError:
+                pass
+        elif isinstance(value, str):
+            value = value.strip()
+        if key in _KEY_ALIASES:
+            metadata[_KEY_ALIASES[key]] = value
+        metadata[key] = value
+    return metadata
+
+
+def extract_pages(file_path: str, start: int, end: int) -> List[Tuple[str, dict]]:
+    """
+    Extract the text of pages [start, end) of a PDF.
+
+    Matches PyPDFLoader's page text and metadata (the document metadata of
+    document_metadata plus page and page_label), so chunks get the same
+    IDs and filter fields as a sequential load.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        start (int): First page, zero-based.
+        end (int): Page after the last one.
+
+    Returns:
+        List[Tuple[str, dict]]: Text and metadata of each page.
+    """
+    reader = pypdf.PdfReader(file_path)
+    metadata = document_metadata(reader, file_path)
+    labels = reader.page_labels
+    pages = []
+    for page_number in range(start, min(end, len(reader.pages))):
+        text = reader.pages[page_number].extract_text(extraction_mode="plain").strip()
+        pages.append((text, {**metadata, "page": page_number, "page_label": labels[page_number]}))
+    return pages
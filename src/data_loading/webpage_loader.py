@@ -1,6 +1,9 @@
 from src.data_loading.abstract_loader import DataLoader
 import bs4
+import hashlib
 import os
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
 from langchain_community.document_loaders import WebBaseLoader, DirectoryLoader, TextLoader, PyPDFLoader, Docx2txtLoader
 
 class WebDataLoader(DataLoader):
@@ -11,4 +14,48 @@ class WebDataLoader(DataLoader):
         loader = WebBaseLoader(self.url)
         data = loader.load()
         return data
-    
\ No newline at end of file
+
+    def load_if_changed(self, fingerprint: Optional[dict] = None) -> Tuple[Optional[List[Document]], dict]:
+        """
+        Fetch the page with a conditional GET and parse it only if it changed.
+
+        The stored ETag and Last-Modified validators are sent back to the
+        server, so an unchanged page costs a 304 without a body. Servers
+        that send no validators are compared by the SHA-256 of the body,
+        which still skips parsing, splitting and embedding.
+
+        Args:
+            fingerprint (Optional[dict]): Validators from the previous fetch.
+
+        Returns:
+            Tuple[Optional[List[Document]], dict]: Documents (None if
+            unchanged) and the page's current validators.
+        """
+        fingerprint = fingerprint or {}
+        loader = WebBaseLoader(self.url)
+        headers = dict(loader.session.headers)
+        if fingerprint.get("etag"):
+            headers["If-None-Match"] = fingerprint["etag"]
+        if fingerprint.get("last_modified"):
+            headers["If-Modified-Since"] = fingerprint["last_modified"]
+
+        response = loader.session.get(self.url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            return None, fingerprint
+        response.raise_for_status()
+
+        current = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": hashlib.sha256(response.content).hexdigest()
+        }
+        if current["sha256"] == fingerprint.get("sha256"):
+            return None, current
+
+        response.encoding = response.apparent_encoding
+        soup = bs4.BeautifulSoup(response.text, "html.parser")
+        metadata = {"source": self.url}
+        if soup.title:
+            metadata["title"] = soup.title.get_text()
+        return [Document(page_content=soup.get_text(), metadata=metadata)], current
+    
@@ -1,163 +1,352 @@
 from langchain_core.documents import Document
-import requests
+import aiohttp
+import asyncio
+import os
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from typing import List, Set
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 import logging
-from abc import ABC, abstractmethod
 
 from src.data_loading.abstract_loader import DataLoader
 
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, so that trivially different spellings of the
+    same page are crawled once.
+
+    Lowercases scheme and host, drops default ports and fragments, resolves
+    dot segments, sorts query parameters and turns an empty path into '/'.
+
+    Args:
+        url (str): Absolute URL.
+
+    Returns:
+        str: Normalized URL.
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    path = urlparse(urljoin("http://host/", parsed.path)).path
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, path or "/", parsed.params, query, ""))
+
+
+class CrawlerConfig:
+    """Configuration class for the website crawler."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        timeout: float = 10.0,
+        user_agent: Optional[str] = None,
+        respect_robots: bool = True
+    ):
+        """
+        Initialize crawler configuration.
+
+        Args:
+            max_concurrency (Optional[int]): Requests in flight overall. Falls
+                back to CRAWL_MAX_CONCURRENCY (default 16).
+            per_host_concurrency (Optional[int]): Requests in flight per host.
+                Falls back to CRAWL_PER_HOST_CONCURRENCY (default 4).
+            requests_per_second (Optional[float]): Request rate per host; 0
+                disables the limit. Falls back to CRAWL_REQUESTS_PER_SECOND
+                (default 8). A robots.txt Crawl-delay lowers it further.
+            timeout (float): Per-request timeout in seconds.
+            user_agent (Optional[str]): User-Agent header and robots.txt agent.
+                Falls back to USER_AGENT.
+            respect_robots (bool): Skip URLs disallowed by robots.txt.
+        """
+        self.max_concurrency = max_concurrency or int(os.getenv("CRAWL_MAX_CONCURRENCY", 16))
+        self.per_host_concurrency = per_host_concurrency or int(os.getenv("CRAWL_PER_HOST_CONCURRENCY", 4))
+        self.requests_per_second = (
+            requests_per_second if requests_per_second is not None
+            else float(os.getenv("CRAWL_REQUESTS_PER_SECOND", 8))
+        )
+        self.timeout = timeout
+        self.user_agent = user_agent or os.getenv("USER_AGENT", "rag-crawler")
+        self.respect_robots = respect_robots
+
+
+class _HostState:
+    """Concurrency slot, rate-limit clock and robots rules of one host."""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lock = asyncio.Lock()
+        self.next_request_at = 0.0
+        self.robots: Optional[RobotFileParser] = None
+
 
 class WebsiteDataLoader(DataLoader):
     def __init__(
-        self, 
-        base_url: str, 
-        max_pages: int = 100, 
+        self,
+        base_url: str,
+        max_pages: int = 100,
         depth: int = 1,
-        allowed_domains: List[str] = None
+        allowed_domains: List[str] = None,
+        config: Optional[CrawlerConfig] = None,
+        session: Optional[aiohttp.ClientSession] = None
     ):
         """
         Initialize website crawler.
-        
+
         Args:
             base_url (str): Starting URL to crawl
             max_pages (int): Maximum number of pages to crawl
-            depth (int): Maximum crawl depth
+            depth (int): Maximum crawl depth; 0 crawls the start page only,
+                1 also the pages it links to, and so on
             allowed_domains (List[str]): Domains to restrict crawling
+            config (Optional[CrawlerConfig]): Concurrency, rate and robots settings
+            session (Optional[aiohttp.ClientSession]): Session to reuse; by
+                default the crawl opens (and closes) its own pooled session
         """
-        self.base_url = base_url
+        self.base_url = normalize_url(base_url)
         self.max_pages = max_pages
         self.depth = depth
-        self.allowed_domains = allowed_domains or [urlparse(base_url).netloc]
-        
-        # Tracking sets
+        self.allowed_domains = allowed_domains or [urlparse(self.base_url).netloc]
+        self.config = config or CrawlerConfig()
+        self._session = session
+
+        # Tracking set of every URL queued so far
         self.visited_urls: Set[str] = set()
-        self.urls_to_crawl: Set[str] = {base_url}
-        
-        # Crawler results
-        self.crawled_content: List[dict] = []
-    
+        self._hosts: Dict[str, _HostState] = {}
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+
     def _is_valid_url(self, url: str) -> bool:
         """
         Check if URL is valid for crawling.
-        
+
         Args:
             url (str): URL to validate
-        
+
         Returns:
             bool: Whether URL is valid
         """
         parsed_url = urlparse(url)
-        
+
         # Check domain restrictions
         domain_valid = any(
-            allowed_domain in parsed_url.netloc 
+            allowed_domain in parsed_url.netloc
             for allowed_domain in self.allowed_domains
         )
-        
+
         # Exclude non-http(s) and already visited URLs
         return (
             parsed_url.scheme in ['http', 'https'] and
             domain_valid and
             url not in self.visited_urls
         )
-    
-    def _extract_links(self, html: str, base_url: str) -> List[str]:
+
+    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """
-        Extract links from HTML content.
-        
+        Extract links from a parsed page.
+
         Args:
-            html (str): HTML content
+            soup (BeautifulSoup): Parsed HTML
             base_url (str): Base URL for resolving relative links
-        
+
         Returns:
-            List[str]: Extracted links
+            List[str]: Normalized links not queued yet, in page order
         """
-        soup = BeautifulSoup(html, 'html.parser')
         links = []
-        
         for a_tag in soup.find_all('a', href=True):
-            link = urljoin(base_url, a_tag['href'])
+            link = normalize_url(urljoin(base_url, a_tag['href']))
             if self._is_valid_url(link):
                 links.append(link)
-        
         return links
-    
+
+    def _host(self, url: str) -> _HostState:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self.config.per_host_concurrency)
+        return self._hosts[host]
+
+    async def _robots(self, session: aiohttp.ClientSession, url: str, state: _HostState) -> RobotFileParser:
+        """robots.txt rules of the URL's host, fetched once per crawl."""
+        async with state.lock:
+            if state.robots is None:
+                parsed = urlparse(url)
+                robots = RobotFileParser()
+                try:
+                    async with session.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt") as response:
+                        if response.status in (401, 403):
+                            robots.disallow_all = True
+                        elif response.status < 400:
+                            robots.parse((await response.text()).splitlines())
+                        else:
+                            robots.allow_all = True
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    robots.allow_all = True
+                state.robots = robots
+        return state.robots
+
+    async def _throttle(self, state: _HostState, robots: Optional[RobotFileParser]) -> None:
+        """Wait for the host's next request slot under the rate limit."""
+        interval = 1.0 / self.config.requests_per_second if self.config.requests_per_second else 0.0
+        crawl_delay = robots.crawl_delay(self.config.user_agent) if robots else None
+        interval = max(interval, float(crawl_delay or 0))
+        if not interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with state.lock:
+            now = loop.time()
+            wait = state.next_request_at - now
+            state.next_request_at = max(now, state.next_request_at) + interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str
+    ) -> Optional[Tuple[Document, List[str]]]:
+        """
+        Fetch one page and extract its text and links.
+
+        Returns:
+            Optional[Tuple[Document, List[str]]]: Page document and outgoing
+            links, or None if the page was skipped or failed.
+        """
+        state = self._host(url)
+        robots = await self._robots(session, url, state) if self.config.respect_robots else None
+        if robots is not None and not robots.can_fetch(self.config.user_agent, url):
+            logging.info(f"Skipping {url}: disallowed by robots.txt")
+            return None
+
+        # Host slot and rate limit first, so a slow host never holds a
+        # global slot while waiting
+        async with state.semaphore:
+            await self._throttle(state, robots)
+            async with self._global_semaphore:
+                try:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        if "html" not in response.headers.get("Content-Type", "text/html"):
+                            return None
+                        final_url = normalize_url(str(response.url))
+                        # A redirect to a page already queued is a duplicate
+                        if final_url != url and final_url in self.visited_urls:
+                            return None
+                        self.visited_urls.add(final_url)
+                        html = await response.text()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logging.error(f"Error crawling {url}: {e}")
+                    return None
+
+        soup = BeautifulSoup(html, 'html.parser')
+        metadata = {'source': final_url}
+        if soup.title:
+            metadata['title'] = soup.title.get_text()
+        document = Document(page_content=soup.get_text(separator="\n", strip=True), metadata=metadata)
+        return document, self._extract_links(soup, final_url)
+
+    def _open_session(self) -> aiohttp.ClientSession:
+        """Pooled keep-alive session sized to the concurrency limits."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.config.max_concurrency,
+                limit_per_host=self.config.per_host_concurrency
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            headers={"User-Agent": self.config.user_agent}
+        )
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """
+        Crawl breadth-first, level by level, yielding pages as they arrive.
+
+        All pages of one level are fetched concurrently (within the global
+        and per-host limits) before the next level starts, so `depth` bounds
+        the link distance from the start page.
+
+        Yields:
+            Document: Text of each crawled page.
+        """
+        session = self._session or self._open_session()
+        self._global_semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self.visited_urls = {self.base_url}
+        frontier = [self.base_url]
+        crawled = 0
+        try:
+            for _ in range(self.depth + 1):
+                if not frontier or crawled >= self.max_pages:
+                    break
+                tasks = [
+                    asyncio.ensure_future(self._fetch(session, url))
+                    for url in frontier[:self.max_pages - crawled]
+                ]
+                next_frontier = []
+                try:
+                    for next_result in asyncio.as_completed(tasks):
+                        result = await next_result
+                        if result is None:
+                            continue
+                        document, links = result
+                        crawled += 1
+                        yield document
+                        if crawled >= self.max_pages:
+                            break
+                        for link in links:
+                            if link not in self.visited_urls:
+                                self.visited_urls.add(link)
+                                next_frontier.append(link)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                frontier = next_frontier
+        finally:
+            if self._session is None:
+                await session.close()
+
+    def aiter_documents(self) -> AsyncIterator[Document]:
+        """Pages as they are crawled; see alazy_load."""
+        return self.alazy_load()
+
     def load(self) -> List[Document]:
         """
         Crawl the entire website.
-        
+
+        Runs its own event loop; from async code use alazy_load instead.
+
         Returns:
             List[Document]: Crawled page contents
         """
-        current_depth = 0
-        
-        while self.urls_to_crawl and len(self.crawled_content) < self.max_pages:
-            # Break if max depth reached
-            if current_depth > self.depth:
-                break
-            
-            # Get next URL to crawl
-            current_url = self.urls_to_crawl.pop()
-            
-            try:
-                # Fetch page content
-                response = requests.get(current_url, timeout=10)
-                response.raise_for_status()
-                
-                # Mark as visited
-                self.visited_urls.add(current_url)
-                
-                # Create Langchain Document
-                document = Document(
-                    page_content=response.text,
-                    metadata={
-                        'source': current_url
-                    }
-                )
-                
-                # Store document
-                self.crawled_content.append(document)
-                
-                # Extract new links
-                new_links = self._extract_links(response.text, current_url)
-                
-                # Add new links to crawl queue
-                self.urls_to_crawl.update(
-                    link for link in new_links 
-                    if link not in self.visited_urls
-                )
-            
-            except requests.RequestException as e:
-                logging.error(f"Error crawling {current_url}: {e}")
-            
-            current_depth += 1
-        
-        return self.crawled_content
+        async def collect() -> List[Document]:
+            return [document async for document in self.alazy_load()]
+
+        return asyncio.run(collect())
 
 # Convenience function
 def load_entire_website(
-    url: str, 
-    max_pages: int = 100, 
+    url: str,
+    max_pages: int = 100,
     depth: int = 1,
     allowed_domains: List[str] = None
 ) -> List[Document]:
     """
     Load entire website content.
-    
+
     Args:
         url (str): Starting URL to crawl
         max_pages (int): Maximum number of pages to crawl
         depth (int): Maximum crawl depth
         allowed_domains (List[str]): Domains to restrict crawling
-    
+
     Returns:
         List[Document]: Crawled page contents
     """
     crawler = WebsiteDataLoader(
-        base_url=url, 
-        max_pages=max_pages, 
+        base_url=url,
+        max_pages=max_pages,
         depth=depth,
         allowed_domains=allowed_domains
     )
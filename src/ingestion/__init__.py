@@ -0,0 +1,14 @@
+from .config import IngestionConfig, IngestionStats
+from .jobs import IngestionJob, IngestionJobRunner, LocalJobQueue, RedisJobQueue, create_job_queue
+from .pipeline import IngestionPipeline
+
+__all__ = [
+    'IngestionConfig',
+    'IngestionJob',
+    'IngestionJobRunner',
+    'IngestionPipeline',
+    'IngestionStats',
+    'LocalJobQueue',
+    'RedisJobQueue',
+    'create_job_queue'
+]
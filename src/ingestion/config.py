@@ -0,0 +1,63 @@
+import os
+from typing import Optional
+
+
+class IngestionConfig:
+    """Configuration class for batched ingestion."""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        load_workers: Optional[int] = None,
+        split_workers: Optional[int] = None,
+        write_workers: Optional[int] = None
+    ):
+        """
+        Initialize ingestion configuration.
+
+        Args:
+            batch_size (Optional[int]): Chunks per embedding/upsert request.
+                Falls back to INGEST_BATCH_SIZE (default 64).
+            max_in_flight (Optional[int]): Concurrent embedding requests.
+                Falls back to INGEST_MAX_IN_FLIGHT (default 4).
+            queue_size (Optional[int]): Items buffered between two stages.
+                Defaults to twice max_in_flight.
+            load_workers (Optional[int]): Sources loaded at once by the
+                pipeline. Falls back to INGEST_LOAD_WORKERS (default 2).
+            split_workers (Optional[int]): Documents split at once by the
+                pipeline. Falls back to INGEST_SPLIT_WORKERS (default 2).
+            write_workers (Optional[int]): Concurrent upserts of the pipeline.
+                Falls back to INGEST_WRITE_WORKERS (default 2).
+        """
+        self.batch_size = batch_size or int(os.getenv("INGEST_BATCH_SIZE", 64))
+        self.max_in_flight = max_in_flight or int(os.getenv("INGEST_MAX_IN_FLIGHT", 4))
+        self.queue_size = queue_size or 2 * self.max_in_flight
+        self.load_workers = load_workers or int(os.getenv("INGEST_LOAD_WORKERS", 2))
+        self.split_workers = split_workers or int(os.getenv("INGEST_SPLIT_WORKERS", 2))
+        self.write_workers = write_workers or int(os.getenv("INGEST_WRITE_WORKERS", 2))
+
+
+class IngestionStats:
+    """Counters reported by an ingestion run."""
+
+    def __init__(self):
+        self.documents = 0
+        self.chunks = 0
+        self.skipped = 0
+        self.batches = 0
+        self.seconds = 0.0
+        # One SourceDigest per pipeline input, in input order
+        self.sources = []
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"IngestionStats(chunks={self.chunks}, skipped={self.skipped}, batches={self.batches}, "
+            f"seconds={self.seconds:.2f}, chunks_per_second={self.chunks_per_second:.1f})"
+        )
+
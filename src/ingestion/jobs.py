@@ -0,0 +1,504 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .config import IngestionStats
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Stages of a running load, reported through the progress callback
+STAGE_CHECKING = "checking"
+STAGE_INDEXING = "indexing"
+STAGE_FINALIZING = "finalizing"
+
+# Job queue backends
+QUEUE_LOCAL = "local"
+QUEUE_REDIS = "redis"
+
+Progress = Callable[[str, Optional[IngestionStats]], None]
+
+
+class IngestionJob:
+    """A source load run in the background, and its progress."""
+
+    def __init__(
+        self,
+        source: str,
+        refresh: bool = False,
+        namespace: Optional[str] = None,
+        checked: bool = False,
+        then: Optional[str] = None,
+        job_id: Optional[str] = None,
+        status: str = JOB_QUEUED,
+        stage: str = JOB_QUEUED,
+        documents: int = 0,
+        chunks: int = 0,
+        skipped: int = 0,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        created_at: Optional[float] = None,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        updated_at: Optional[float] = None
+    ):
+        """
+        Initialize a job.
+
+        Args:
+            source (str): URL or local PDF path to load.
+            refresh (bool): Re-check the source if it is already indexed.
+            namespace (Optional[str]): Collection namespace of the source.
+            checked (bool): The source was already found not indexed, so
+                the load does not look it up again.
+            then (Optional[str]): ID of a held job to queue once this one
+                is handled, chaining the jobs of a bulk load.
+            job_id (Optional[str]): Job ID; a random one by default.
+            status (str): 'queued', 'running', 'done', 'failed' or 'cancelled'.
+            stage (str): Current stage of a running job ('checking',
+                'indexing', 'finalizing'), else its status.
+            documents (int): Documents loaded so far.
+            chunks (int): Chunks processed so far.
+            skipped (int): Chunks that were already indexed.
+            error (Optional[str]): Error message of a failed job.
+            result (Optional[Dict[str, Any]]): load_source result of a done job.
+            created_at (Optional[float]): Unix time of submission.
+            started_at (Optional[float]): Unix time a worker picked it up.
+            finished_at (Optional[float]): Unix time it finished.
+            updated_at (Optional[float]): Unix time of the last progress
+                report, used to find jobs of workers that died.
+        """
+        self.id = job_id or uuid.uuid4().hex
+        self.source = source
+        self.refresh = refresh
+        self.namespace = namespace
+        self.checked = checked
+        self.then = then
+        self.status = status
+        self.stage = stage
+        self.documents = documents
+        self.chunks = chunks
+        self.skipped = skipped
+        self.error = error
+        self.result = result
+        self.created_at = created_at if created_at is not None else time.time()
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.updated_at = updated_at if updated_at is not None else self.created_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def chunks_per_second(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.chunks / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "source": self.source,
+            "refresh": self.refresh,
+            "namespace": self.namespace,
+            "checked": self.checked,
+            "then": self.then,
+            "status": self.status,
+            "stage": self.stage,
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "skipped": self.skipped,
+            "chunks_per_second": round(self.chunks_per_second, 1),
+            "error": self.error,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IngestionJob":
+        data = dict(data)
+        data.pop("chunks_per_second", None)
+        return cls(job_id=data.pop("id"), **data)
+
+
+class LocalJobQueue:
+    """
+    In-process job queue: jobs live in memory and are lost on restart.
+
+    Stand-in for RedisJobQueue in development and single-process setups.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._cancel_requests: Set[str] = set()
+
+    async def submit(self, job: IngestionJob) -> None:
+        await self.save(job)
+        self._pending.put_nowait(job.id)
+
+    async def next(self) -> str:
+        """Wait for the ID of the next queued job."""
+        return await self._pending.get()
+
+    async def ack(self, job_id: str, release: Optional[str] = None) -> None:
+        """Mark a job taken with next as handled and queue the held job `release`."""
+        self._cancel_requests.discard(job_id)
+        if release is not None:
+            self._pending.put_nowait(release)
+
+    async def save(self, job: IngestionJob) -> None:
+        self._jobs[job.id] = job.to_dict()
+
+    async def get(self, job_id: str) -> Optional[IngestionJob]:
+        data = self._jobs.get(job_id)
+        return IngestionJob.from_dict(data) if data is not None else None
+
+    async def request_cancel(self, job_id: str) -> None:
+        self._cancel_requests.add(job_id)
+
+    async def cancel_requested(self, job_id: str) -> bool:
+        return job_id in self._cancel_requests
+
+    async def recover(self, stale_after: float) -> int:
+        """Nothing survives a restart, so there is nothing to recover."""
+        return 0
+
+
+class RedisJobQueue:
+    """
+    Durable job queue in Redis, shared by every API process.
+
+    Job records are JSON strings under `<prefix>:<id>`. Queued IDs sit in
+    the `<prefix>:queue` list; a worker atomically moves the ID it takes
+    to `<prefix>:processing` (BLMOVE) and removes it once the job is
+    handled. IDs left in the processing list by a process that died are
+    put back in the queue by recover, once their job has not reported
+    progress for a while.
+    """
+
+    def __init__(self, client, prefix: str = "jobs", ttl: int = 7 * 24 * 3600):
+        """
+        Initialize the queue.
+
+        Args:
+            client: Async Redis client (decode_responses=True).
+            prefix (str): Key prefix.
+            ttl (int): Seconds finished job records are kept.
+        """
+        self._client = client
+        self._prefix = prefix
+        self._ttl = ttl
+        self._queue = f"{prefix}:queue"
+        self._processing = f"{prefix}:processing"
+
+    def _key(self, job_id: str) -> str:
+        return f"{self._prefix}:{job_id}"
+
+    async def submit(self, job: IngestionJob) -> None:
+        await self._client.pipeline(transaction=True).set(
+            self._key(job.id), json.dumps(job.to_dict())
+        ).lpush(self._queue, job.id).execute()
+
+    async def next(self) -> str:
+        """Wait for the ID of the next queued job."""
+        while True:
+            job_id = await self._client.blmove(self._queue, self._processing, 5, "RIGHT", "LEFT")
+            if job_id is not None:
+                return job_id
+
+    async def ack(self, job_id: str, release: Optional[str] = None) -> None:
+        """Mark a job taken with next as handled and queue the held job `release`."""
+        pipeline = self._client.pipeline(transaction=True).lrem(
+            self._processing, 0, job_id
+        ).delete(f"{self._key(job_id)}:cancel")
+        if release is not None:
+            pipeline.lpush(self._queue, release)
+        await pipeline.execute()
+
+    async def save(self, job: IngestionJob) -> None:
+        await self._client.set(
+            self._key(job.id),
+            json.dumps(job.to_dict()),
+            ex=self._ttl if job.finished else None
+        )
+
+    async def get(self, job_id: str) -> Optional[IngestionJob]:
+        data = await self._client.get(self._key(job_id))
+        return IngestionJob.from_dict(json.loads(data)) if data is not None else None
+
+    async def request_cancel(self, job_id: str) -> None:
+        # Separate key, so a progress save cannot overwrite the request
+        await self._client.set(f"{self._key(job_id)}:cancel", 1, ex=self._ttl)
+
+    async def cancel_requested(self, job_id: str) -> bool:
+        return bool(await self._client.exists(f"{self._key(job_id)}:cancel"))
+
+    async def recover(self, stale_after: float) -> int:
+        """
+        Requeue jobs whose worker stopped reporting progress.
+
+        Args:
+            stale_after (float): Seconds without a progress report after
+                which a running job counts as abandoned.
+
+        Returns:
+            int: Number of jobs put back in the queue.
+        """
+        recovered = 0
+        for job_id in await self._client.lrange(self._processing, 0, -1):
+            job = await self.get(job_id)
+            if job is not None and not job.finished and time.time() - job.updated_at < stale_after:
+                continue
+            if job is not None and not job.finished:
+                job.status = job.stage = JOB_QUEUED
+                job.updated_at = time.time()
+                await self.save(job)
+                await self._client.pipeline(transaction=True).lrem(
+                    self._processing, 0, job_id
+                ).rpush(self._queue, job_id).execute()
+                recovered += 1
+            else:
+                # Finished, but its worker died before acknowledging it
+                await self.ack(job_id, job.then if job is not None else None)
+        return recovered
+
+
+def create_job_queue(backend: Optional[str] = None, client=None):
+    """
+    Create a job queue.
+
+    Args:
+        backend (Optional[str]): 'local' or 'redis'. Falls back to
+            INGEST_JOB_QUEUE (default 'local').
+        client: Async Redis client of the redis backend.
+
+    Returns:
+        LocalJobQueue or RedisJobQueue.
+    """
+    backend = (backend or os.getenv("INGEST_JOB_QUEUE", QUEUE_LOCAL)).lower()
+    if backend == QUEUE_LOCAL:
+        return LocalJobQueue()
+    if backend == QUEUE_REDIS:
+        if client is None:
+            raise ValueError("The redis job queue needs a Redis client")
+        return RedisJobQueue(client)
+    raise ValueError(f"Unsupported job queue: {backend}")
+
+
+class IngestionJobRunner:
+    """
+    Runs queued source loads on a fixed pool of workers.
+
+    `workers` loads run at once at most, so a burst of /load requests
+    queues up instead of competing with questions for the embedding
+    server and the vector store; the load function may bound them further
+    (RAGEngine.load_source takes the engine's load slots, which retrieval
+    does not use). A running job saves its progress every
+    `progress_interval` seconds; that is also when it notices a
+    cancellation requested through another process.
+    """
+
+    def __init__(
+        self,
+        load: Callable[..., Awaitable[Dict[str, Any]]],
+        queue,
+        workers: Optional[int] = None,
+        progress_interval: float = 1.0
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            load (Callable): load_source-like coroutine function taking
+                (source, refresh=, namespace=, progress=, checked=).
+            queue: LocalJobQueue or RedisJobQueue.
+            workers (Optional[int]): Jobs run at once. Falls back to
+                INGEST_JOB_WORKERS (default 2).
+            progress_interval (float): Seconds between progress saves.
+        """
+        self._load = load
+        self.queue = queue
+        self.workers = workers or int(os.getenv("INGEST_JOB_WORKERS", 2))
+        self.progress_interval = progress_interval
+        self._workers: List[asyncio.Task] = []
+        # Jobs running in this process, and those of them being cancelled
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled: Set[str] = set()
+
+    async def start(self) -> None:
+        """Requeue abandoned jobs and start the workers."""
+        if self._workers:
+            return
+        recovered = await self.queue.recover(stale_after=30 * self.progress_interval)
+        if recovered:
+            logging.info(f"Requeued {recovered} abandoned ingestion jobs")
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers. Jobs they were running stay in the processing
+        state and are requeued by the next start.
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(
+        self,
+        source: str,
+        refresh: bool = False,
+        namespace: Optional[str] = None,
+        checked: bool = False
+    ) -> IngestionJob:
+        """
+        Queue a source load.
+
+        Returns:
+            IngestionJob: The queued job.
+        """
+        job = IngestionJob(source, refresh, namespace, checked)
+        await self.queue.submit(job)
+        return job
+
+    async def submit_many(
+        self,
+        sources: List[str],
+        refresh: bool = False,
+        namespace: Optional[str] = None,
+        checked: bool = False,
+        fanout: int = 4
+    ) -> List[IngestionJob]:
+        """
+        Queue source loads of which at most `fanout` run at once.
+
+        The jobs form `fanout` chains: the first job of each chain is
+        queued, the others are held and each is queued when the job before
+        it has been handled, by whichever process ran that one. Fewer run
+        at once when fewer workers are free.
+
+        Returns:
+            List[IngestionJob]: One queued job per source, in order.
+        """
+        fanout = max(1, fanout)
+        jobs = [IngestionJob(source, refresh, namespace, checked) for source in sources]
+        for job, successor in zip(jobs, jobs[fanout:]):
+            job.then = successor.id
+        for job in jobs[fanout:]:
+            await self.queue.save(job)
+        for job in jobs[:fanout]:
+            await self.queue.submit(job)
+        return jobs
+
+    async def get(self, job_id: str) -> Optional[IngestionJob]:
+        return await self.queue.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[IngestionJob]:
+        """
+        Cancel a job. A queued job is skipped when a worker takes it; a
+        running one stops at its next await (or next progress save, when
+        it runs in another process). Chunks it already wrote stay indexed
+        but the source is not registered, so loading it again finishes it.
+
+        Returns:
+            Optional[IngestionJob]: The job, or None if it is unknown.
+        """
+        job = await self.queue.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.status == JOB_QUEUED:
+            job.status = job.stage = JOB_CANCELLED
+            job.finished_at = time.time()
+            await self.queue.save(job)
+            return job
+        if job_id in self._running:
+            self._cancel_running(job_id)
+        else:
+            await self.queue.request_cancel(job_id)
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self.queue.next()
+            job = None
+            try:
+                job = await self.queue.get(job_id)
+                if job is not None and not job.finished:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Ingestion job {job_id} could not be run: {e}")
+            # Jobs cancelled while held still pass their turn on
+            await self.queue.ack(job_id, job.then if job is not None else None)
+
+    def _cancel_running(self, job_id: str) -> None:
+        self._cancelled.add(job_id)
+        self._running[job_id].cancel()
+
+    async def _run(self, job: IngestionJob) -> None:
+        stats: Optional[IngestionStats] = None
+
+        def progress(stage: str, current: Optional[IngestionStats] = None) -> None:
+            nonlocal stats
+            job.stage = stage
+            if current is not None:
+                stats = current
+
+        def snapshot() -> None:
+            if stats is not None:
+                job.documents, job.chunks, job.skipped = stats.documents, stats.chunks, stats.skipped
+            job.updated_at = time.time()
+
+        async def report() -> None:
+            while True:
+                await asyncio.sleep(self.progress_interval)
+                snapshot()
+                await self.queue.save(job)
+                if await self.queue.cancel_requested(job.id):
+                    self._cancel_running(job.id)
+                    return
+
+        job.status = JOB_RUNNING
+        job.stage = STAGE_CHECKING
+        job.started_at = job.updated_at = time.time()
+        await self.queue.save(job)
+        self._running[job.id] = asyncio.create_task(
+            self._load(
+                job.source, refresh=job.refresh, namespace=job.namespace, progress=progress, checked=job.checked
+            )
+        )
+        reporter = asyncio.create_task(report())
+        try:
+            job.result = await self._running[job.id]
+            job.status = job.stage = JOB_DONE
+        except asyncio.CancelledError:
+            if job.id not in self._cancelled:
+                # The worker itself is stopping; the job is left to recover
+                raise
+            job.status = job.stage = JOB_CANCELLED
+        except Exception as e:
+            job.status = job.stage = JOB_FAILED
+            job.error = str(e)
+        finally:
+            reporter.cancel()
+            del self._running[job.id]
+            self._cancelled.discard(job.id)
+        snapshot()
+        job.finished_at = time.time()
+        await self.queue.save(job)
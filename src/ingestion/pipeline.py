@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional, Tuple, Union
+
+from langchain_core.documents import Document
+
+from src.data_loading.abstract_loader import DataLoader, iterate_in_thread
+from src.data_loading.text_splitter import split_text
+from src.utils.hashing import chunk_id
+from src.vector_store.registry import SourceDigest
+
+from .config import IngestionConfig, IngestionStats
+
+DocumentSource = Union[DataLoader, Iterable[Document], AsyncIterable[Document]]
+
+
+def _documents(source: DocumentSource) -> AsyncIterator[Document]:
+    """Documents of a loader or an iterable, produced lazily."""
+    if isinstance(source, DataLoader):
+        return source.aiter_documents()
+    if hasattr(source, "__aiter__"):
+        return source.__aiter__()
+    return iterate_in_thread(source)
+
+
+class IngestionPipeline:
+    """
+    Streams sources into the vector store through four stages.
+
+        load -> split -> embed -> write
+
+    Stages are connected by bounded queues and each has its own workers:
+    `load_workers` sources are read at once, `split_workers` documents are
+    split at once in worker threads, `max_in_flight` batches are embedded
+    at once and `write_workers` batches are upserted at once. A slow stage
+    fills the queue in front of it and the stages upstream wait, so memory
+    holds at most a few queues' worth of documents and batches however big
+    the input is. Every batch is searchable as soon as it is written.
+
+    Chunks keep their load order within a source, so each source's
+    SourceDigest (and content hash) is deterministic.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        config: Optional[IngestionConfig] = None,
+        splitter: Callable[[List[Document]], List[Document]] = split_text
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            vector_store: Vector store with aexisting_ids, aadd_embeddings
+                and aflush (LocalVectorStore, AsyncQdrantVectorStore).
+            config (Optional[IngestionConfig]): Batch, queue and worker settings.
+            splitter (Callable): Splits a list of documents into chunks.
+        """
+        self._vector_store = vector_store
+        self._config = config or IngestionConfig()
+        self._splitter = splitter
+
+    async def _split(self, document: Document, slots: asyncio.Semaphore) -> List[Document]:
+        try:
+            return await asyncio.to_thread(self._splitter, [document])
+        finally:
+            slots.release()
+
+    async def _load(
+        self,
+        sources: Iterable[Tuple[int, DocumentSource]],
+        splits: asyncio.Queue,
+        slots: asyncio.Semaphore,
+        stats: IngestionStats
+    ) -> None:
+        # Workers share the iterator, so each source is loaded by one worker
+        for position, source in sources:
+            async for document in _documents(source):
+                stats.documents += 1
+                await slots.acquire()
+                # Queue the split itself: it runs now, its result is consumed in order
+                await splits.put((position, asyncio.ensure_future(self._split(document, slots))))
+
+    async def _batch(self, splits: asyncio.Queue, batches: asyncio.Queue, stats: IngestionStats) -> None:
+        seen = set()
+        batch = []
+        while True:
+            item = await splits.get()
+            if item is None:
+                break
+            position, chunks = item
+            digest = stats.sources[position]
+            for chunk in await chunks:
+                point_id = chunk_id(str(chunk.metadata.get("source", "")), chunk.page_content)
+                digest.add(chunk, point_id)
+                stats.chunks += 1
+                if point_id in seen:
+                    stats.skipped += 1
+                    continue
+                seen.add(point_id)
+                batch.append((chunk, point_id))
+                if len(batch) >= self._config.batch_size:
+                    await batches.put(batch)
+                    batch = []
+        if batch:
+            await batches.put(batch)
+
+    async def _embed(self, batches: asyncio.Queue, vectors: asyncio.Queue, stats: IngestionStats) -> None:
+        while True:
+            batch = await batches.get()
+            if batch is None:
+                return
+            # Chunks already stored are not embedded again
+            existing = await self._vector_store.aexisting_ids([point_id for _, point_id in batch])
+            new = [(chunk, point_id) for chunk, point_id in batch if point_id not in existing]
+            stats.skipped += len(batch) - len(new)
+            if new:
+                embeddings = await self._vector_store.embeddings.aembed_documents(
+                    [chunk.page_content for chunk, _ in new]
+                )
+                await vectors.put((new, embeddings))
+
+    async def _write(self, vectors: asyncio.Queue, stats: IngestionStats, written: list) -> None:
+        while True:
+            item = await vectors.get()
+            if item is None:
+                return
+            new, embeddings = item
+            await self._vector_store.aadd_embeddings(
+                [chunk for chunk, _ in new],
+                [point_id for _, point_id in new],
+                embeddings,
+                wait=False
+            )
+            stats.batches += 1
+            # Last point of this run, for the closing flush
+            written[:] = [new[-1][0], new[-1][1], embeddings[-1]]
+
+    @staticmethod
+    async def _stage(workers: List[asyncio.Task], downstream: asyncio.Queue, consumers: int) -> None:
+        """Wait for a stage's workers, then tell each downstream worker to stop."""
+        await asyncio.gather(*workers)
+        for _ in range(consumers):
+            await downstream.put(None)
+
+    async def run(self, *sources: DocumentSource, stats: Optional[IngestionStats] = None) -> IngestionStats:
+        """
+        Load, split, embed and write sources.
+
+        Args:
+            *sources: DataLoaders or (async) iterables of documents.
+            stats (Optional[IngestionStats]): Counters to update while the
+                run progresses, e.g. for a job's progress report. A new
+                object by default.
+
+        Returns:
+            IngestionStats: Counts, throughput and, in `sources`, one
+            SourceDigest per input for registering it.
+
+        Raises:
+            Exception: The first error raised by any stage; the other stages
+            are cancelled.
+        """
+        config = self._config
+        stats = stats if stats is not None else IngestionStats()
+        stats.sources = [SourceDigest() for _ in sources]
+        splits: asyncio.Queue = asyncio.Queue(maxsize=config.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=config.queue_size)
+        vectors: asyncio.Queue = asyncio.Queue(maxsize=config.queue_size)
+        slots = asyncio.Semaphore(config.split_workers)
+        pending = iter(enumerate(sources))
+        written: list = []
+        start = time.perf_counter()
+
+        loaders = [
+            asyncio.create_task(self._load(pending, splits, slots, stats))
+            for _ in range(min(config.load_workers, len(sources)))
+        ]
+        batcher = asyncio.create_task(self._batch(splits, batches, stats))
+        embedders = [
+            asyncio.create_task(self._embed(batches, vectors, stats))
+            for _ in range(config.max_in_flight)
+        ]
+        writers = [
+            asyncio.create_task(self._write(vectors, stats, written))
+            for _ in range(config.write_workers)
+        ]
+        stages = [
+            asyncio.create_task(self._stage(loaders, splits, 1)),
+            asyncio.create_task(self._stage([batcher], batches, len(embedders))),
+            asyncio.create_task(self._stage(embedders, vectors, len(writers)))
+        ]
+        tasks = [*loaders, batcher, *embedders, *writers, *stages]
+        try:
+            await asyncio.gather(*stages, *writers)
+            # Batches were written without waiting for Qdrant to apply them;
+            # one barrier on a point of this run makes the whole load searchable
+            if written:
+                await self._vector_store.aflush(*written)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Splits queued but never consumed
+            while not splits.empty():
+                item = splits.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            stats.seconds = time.perf_counter() - start
+
+        logging.info(f"Ingested {stats.documents} documents, {stats.chunks} chunks in {stats.seconds:.2f}s "
+                     f"({stats.chunks_per_second:.1f} chunks/s)")
+        return stats
@@ -0,0 +1,275 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set
+
+# Priorities of LLM calls, most urgent first
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+PRIORITIES = {PRIORITY_HIGH: 0, PRIORITY_NORMAL: 1, PRIORITY_LOW: 2}
+
+# Job states
+_QUEUED = "queued"
+_RUNNING = "running"
+_DONE = "done"
+
+
+class SchedulerOverloaded(Exception):
+    """The LLM queue is full, or a call waited past its queue deadline."""
+
+    def __init__(self, message: str, retry_after: int):
+        """
+        Args:
+            message (str): Reason for the rejection.
+            retry_after (int): Seconds after which a retry is likely to be
+                admitted, for a Retry-After header.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Job:
+    __slots__ = (
+        "key", "call", "rank", "sequence", "enqueued", "context", "future", "task", "timer", "state", "waiters"
+    )
+
+    def __init__(self, key: Hashable, call: Callable[[], Awaitable[Any]], rank: int, sequence: int):
+        self.key = key
+        self.call = call
+        self.rank = rank
+        self.sequence = sequence
+        self.enqueued = time.monotonic()
+        # The submitter's context, so callbacks (e.g. LangGraph token
+        # streaming) reach its request whichever call frees the slot
+        self.context = contextvars.copy_context()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.state = _QUEUED
+        self.waiters = 0
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.rank, self.sequence) < (other.rank, other.sequence)
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls.
+
+    At most `slots` calls run at once, matching the parallel generations
+    Ollama serves; the others wait in a priority queue (FIFO within a
+    priority). A call that is still queued after `queue_timeout` seconds
+    fails instead of starting late, and a call arriving while `max_queue`
+    calls are already waiting is rejected straight away, both with
+    SchedulerOverloaded carrying a retry hint derived from the recent
+    generation time.
+
+    Calls with the same key that overlap share one generation
+    (single-flight): the first runs, the others await its result. A call
+    whose waiters are all cancelled is dropped from the queue, or
+    cancelled if it is running.
+    """
+
+    def __init__(self, slots: int = 2, max_queue: int = 32, queue_timeout: Optional[float] = 30.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            slots (int): Calls running at once.
+            max_queue (int): Calls allowed to wait for a slot.
+            queue_timeout (Optional[float]): Seconds a call may wait for a
+                slot; None waits indefinitely.
+        """
+        self.slots = max(1, slots)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._heap: List[_Job] = []
+        self._queued = 0
+        self._running: Set[_Job] = set()
+        self._inflight: Dict[Hashable, _Job] = {}
+        self._sequence = itertools.count()
+        # Moving average of generation time, for retry hints
+        self._service_seconds: Optional[float] = None
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self._stats = {"submitted": 0, "coalesced": 0, "rejected": 0, "expired": 0, "completed": 0, "failed": 0}
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a slot."""
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        """Calls holding a slot."""
+        return len(self._running)
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is likely worked off."""
+        service = self._service_seconds or 1.0
+        return max(1, math.ceil(service * (self._queued + len(self._running)) / self.slots))
+
+    def check(self) -> None:
+        """
+        Reject early when a new call would not be admitted.
+
+        Lets callers turn a request away before doing the work that leads
+        up to the LLM call.
+
+        Raises:
+            SchedulerOverloaded: The queue is full.
+        """
+        if len(self._running) >= self.slots and self._queued >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise SchedulerOverloaded(
+                f"LLM queue is full ({self._queued} waiting)", self.retry_after()
+            )
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        priority: str = PRIORITY_NORMAL
+    ) -> Any:
+        """
+        Run an LLM call once a slot is free.
+
+        Args:
+            key (Hashable): Identity of the call, e.g. the prompt text;
+                overlapping calls with the same key share one result.
+            call (Callable[[], Awaitable[Any]]): Starts the call.
+            priority (str): 'high', 'normal' or 'low'.
+
+        Returns:
+            Any: Result of the call.
+
+        Raises:
+            SchedulerOverloaded: The queue is full, or the call waited
+                longer than queue_timeout.
+            Exception: Whatever the call raised.
+        """
+        self._stats["submitted"] += 1
+        job = self._inflight.get(key)
+        if job is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self.check()
+            job = _Job(key, call, PRIORITIES.get(priority, PRIORITIES[PRIORITY_NORMAL]), next(self._sequence))
+            self._inflight[key] = job
+            self._enqueue(job)
+        job.waiters += 1
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            job.waiters -= 1
+            if job.waiters == 0:
+                self._abandon(job)
+            raise
+
+    def _enqueue(self, job: _Job) -> None:
+        heapq.heappush(self._heap, job)
+        self._queued += 1
+        if self.queue_timeout is not None:
+            job.timer = asyncio.get_running_loop().call_later(self.queue_timeout, self._expire, job)
+        self._pump()
+
+    def _pump(self) -> None:
+        """Start queued calls while slots are free."""
+        while self._heap and len(self._running) < self.slots:
+            job = heapq.heappop(self._heap)
+            # Expired and abandoned jobs stay in the heap until popped
+            if job.state != _QUEUED:
+                continue
+            self._queued -= 1
+            if job.timer is not None:
+                job.timer.cancel()
+            job.state = _RUNNING
+            self._waits.append(time.monotonic() - job.enqueued)
+            self._running.add(job)
+            job.task = job.context.run(asyncio.create_task, self._execute(job))
+
+    async def _execute(self, job: _Job) -> None:
+        start = time.monotonic()
+        try:
+            result = await job.call()
+        except asyncio.CancelledError:
+            if not job.future.done():
+                job.future.cancel()
+        except Exception as e:
+            self._stats["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self._stats["completed"] += 1
+            elapsed = time.monotonic() - start
+            self._service_seconds = (
+                elapsed if self._service_seconds is None else 0.8 * self._service_seconds + 0.2 * elapsed
+            )
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._finish(job)
+
+    def _finish(self, job: _Job) -> None:
+        job.state = _DONE
+        self._running.discard(job)
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+        self._pump()
+
+    def _expire(self, job: _Job) -> None:
+        if job.state != _QUEUED:
+            return
+        self._stats["expired"] += 1
+        self._queued -= 1
+        job.state = _DONE
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+        job.future.set_exception(SchedulerOverloaded(
+            f"LLM call waited more than {self.queue_timeout:g}s for a slot", self.retry_after()
+        ))
+
+    def _abandon(self, job: _Job) -> None:
+        """Drop a call nobody waits for any more."""
+        if job.state == _QUEUED:
+            self._queued -= 1
+            job.state = _DONE
+            if job.timer is not None:
+                job.timer.cancel()
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            job.future.cancel()
+        elif job.state == _RUNNING and job.task is not None:
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            job.task.cancel()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Scheduler counters.
+
+        Returns:
+            Dict[str, float]: Slot use, queue depth, call outcomes, and the
+            median, 95th percentile and maximum queue wait of recent calls
+            in milliseconds.
+        """
+        waits = sorted(self._waits)
+
+        def percentile(share: float) -> float:
+            return waits[min(len(waits) - 1, int(share * len(waits)))] * 1000 if waits else 0.0
+
+        return {
+            "slots": self.slots,
+            "active": len(self._running),
+            "queued": self._queued,
+            "max_queue": self.max_queue,
+            **self._stats,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p95": percentile(0.95),
+            "wait_ms_max": waits[-1] * 1000 if waits else 0.0,
+            "service_ms": (self._service_seconds or 0.0) * 1000
+        }
@@ -1,15 +1,83 @@
+import asyncio
 import sys
-from src.rag.rag_pipeline import create_and_run_graph, load_source
+from src.rag.engine import RAGEngine
+from src.rag.rag_pipeline import create_and_run_graph, load_source, load_sources, refresh_sources, set_engine, stream_graph
 
-def main():
+async def ainput(message: str) -> str:
+    """Read a line from stdin without blocking the event loop."""
+    return await asyncio.to_thread(input, message)
+
+async def amain():
     """Main entry point for the interactive RAG application."""
     print("Welcome to the Interactive RAG Application!")
 
+    engine = RAGEngine()
+    await engine.warm_up()
+    set_engine(engine)
+    try:
+        if "--refresh" in sys.argv:
+            await print_refresh_results()
+        elif "--load" in sys.argv:
+            position = sys.argv.index("--load") + 1
+            await print_load_results(sys.argv[position] if position < len(sys.argv) else "-")
+        else:
+            await run_repl(stream="--stream" in sys.argv)
+    finally:
+        await engine.shutdown()
+
+async def print_refresh_results() -> None:
+    """Refresh every loaded source (e.g. from a nightly job) and summarize."""
+    results = await refresh_sources()
+    for status in ("indexed", "unchanged", "error"):
+        count = sum(1 for result in results if result["status"] == status)
+        print(f"{status}: {count}")
+    for result in results:
+        if result["status"] == "error":
+            print(f"  {result['source']}: {result['error']}")
+
+def read_sources(path: str) -> list:
+    """Read one source per line from a file, or from stdin for '-'."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+async def print_load_results(path: str) -> None:
+    """Load every source listed in a file (or stdin) and report each one."""
+    results = await load_sources(await asyncio.to_thread(read_sources, path))
+    for result in results:
+        detail = result.get("error") or (f"{result['chunks']} chunks" if "chunks" in result else "")
+        print(f"{result['status']:<10} {result['source']}" + (f" ({detail})" if detail else ""))
+    for status in ("indexed", "unchanged", "skipped", "duplicate", "invalid", "error"):
+        count = sum(1 for result in results if result["status"] == status)
+        if count:
+            print(f"{status}: {count}")
+
+async def print_streamed_answer(question: str) -> None:
+    """Print the retrieved sources, then the answer token by token."""
+    async for event, data in stream_graph(question):
+        if event == "sources":
+            sources = sorted({metadata.get("source", "unknown") for metadata in data})
+            print("\nSources:", ", ".join(sources) or "none")
+            print("\nAnswer: ", end="", flush=True)
+        elif event == "token":
+            print(data, end="", flush=True)
+    print()
+
+async def run_repl(stream: bool = False):
+    """
+    Prompt for sources and questions until the user exits.
+
+    Args:
+        stream (bool): Print answers token by token as they are generated.
+    """
     source = None  # Initially no source set
 
     while True:
         if not source:
-            source = input("\nEnter URL or local path (or type 'exit' to quit): ").strip()
+            source = (await ainput("\nEnter URL or local path (or type 'exit' to quit): ")).strip()
             if source.lower() == 'exit':
                 print("Goodbye!")
                 break
@@ -19,7 +87,7 @@ def main():
 
             print("Loading source...")
             try:
-                load_source(source)
+                await load_source(source)
                 print("Source loaded successfully!")
             except Exception as e:
                 print(f"Error loading source: {e}")
@@ -27,7 +95,7 @@ def main():
                 continue
 
         while True:
-            question = input("\nEnter your question (or type 'set source' to add a source, 'exit' to quit): ").strip()
+            question = (await ainput("\nEnter your question (or type 'set source' to add a source, 'stream' to toggle streaming, 'exit' to quit): ")).strip()
 
             if question.lower() == 'exit':
                 print("Goodbye!")
@@ -36,14 +104,24 @@ def main():
                 source = None
                 print("You can now set a new source.")
                 break  # Go back to setting a new source
+            if question.lower() == 'stream':
+                stream = not stream
+                print(f"Streaming {'enabled' if stream else 'disabled'}.")
+                continue
 
             try:
-                answer = create_and_run_graph(question)
-                print("\nAnswer:", answer)
+                if stream:
+                    await print_streamed_answer(question)
+                else:
+                    answer = await create_and_run_graph(question)
+                    print("\nAnswer:", answer)
             except Exception as e:
                 print(f"\nAn error occurred: {e}")
 
             print("-" * 40)
 
+def main():
+    asyncio.run(amain())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,183 @@
+import math
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.documents import Document
+
+# Rough size of a token in English text; deepseek-r1 and nomic tokenizers
+# land close to it, and the budget only needs to be predictable.
+CHARS_PER_TOKEN = 4
+
+SEPARATOR = "\n\n"
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_WORD = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text, at CHARS_PER_TOKEN characters per token."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def clean_whitespace(text: str) -> str:
+    """
+    Collapse runs of spaces and tabs, strip line ends and squeeze blank
+    lines, as left behind by PDF extraction and HTML-to-text conversion.
+    """
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[position:position + size]) for position in range(len(words) - size + 1)}
+
+
+def _join(first: str, second: str, min_overlap: int = 20) -> str:
+    """Concatenate two chunks, dropping the text the second repeats from the first."""
+    if second in first:
+        return first
+    for size in range(min(len(first), len(second)), min_overlap - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return first + "\n" + second
+
+
+class PackedContext:
+    """Result of packing retrieved chunks into a token budget."""
+
+    def __init__(self, documents: List[Document], text: str, tokens: int, original_tokens: int, chunks: int):
+        """
+        Args:
+            documents (List[Document]): Packed passages, best first.
+            text (str): Context string for the prompt.
+            tokens (int): Tokens of `text`.
+            original_tokens (int): Tokens of the unpacked chunks joined with
+                blank lines, as generate used to send them.
+            chunks (int): Retrieved chunks that made it into the context;
+                the others were duplicates or did not fit the budget.
+        """
+        self.documents = documents
+        self.text = text
+        self.tokens = tokens
+        self.original_tokens = original_tokens
+        self.chunks = chunks
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+class ContextPacker:
+    """
+    Packs retrieved chunks into a prompt context of bounded size.
+
+    Chunks are cleaned of redundant whitespace, near-duplicates are dropped
+    (the better scored copy is kept), chunks from the same source page are
+    merged into one passage, and passages are added best score first until
+    the token budget is full.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 2000,
+        duplicate_threshold: float = 0.8,
+        count_tokens: Callable[[str], int] = estimate_tokens
+    ):
+        """
+        Initialize the packer.
+
+        Args:
+            token_budget (int): Maximum tokens of packed context.
+            duplicate_threshold (float): Share of word trigrams a chunk has in
+                common with a better one (relative to the shorter of the two)
+                above which it counts as a duplicate.
+            count_tokens (Callable[[str], int]): Token counter; an estimate
+                by default.
+        """
+        self.token_budget = token_budget
+        self.duplicate_threshold = duplicate_threshold
+        self.count_tokens = count_tokens
+
+    def _deduplicate(self, ranked: List[Tuple[Document, float, str]]) -> List[Tuple[Document, float, str]]:
+        kept, kept_shingles = [], []
+        for document, score, text in ranked:
+            shingles = _shingles(text)
+            duplicate = not shingles or any(
+                len(shingles & other) / min(len(shingles), len(other)) >= self.duplicate_threshold
+                for other in kept_shingles
+            )
+            if not duplicate:
+                kept.append((document, score, text))
+                kept_shingles.append(shingles)
+        return kept
+
+    @staticmethod
+    def _merge(ranked: List[Tuple[Document, float, str]]) -> List[Tuple[Document, str, int]]:
+        # Chunks of one page become one passage, placed at its best chunk's
+        # rank; within the page they follow start_index when the splitter
+        # recorded it, else rank order.
+        pages: Dict[Tuple, List[Tuple[Document, float, str]]] = {}
+        for document, score, text in ranked:
+            metadata = document.metadata
+            key = (metadata.get("source"), metadata.get("page")) if "source" in metadata else (id(document),)
+            pages.setdefault(key, []).append((document, score, text))
+        merged = []
+        for chunks in pages.values():
+            best_document = chunks[0][0]
+            chunks.sort(key=lambda chunk: chunk[0].metadata.get("start_index", 0))
+            text = chunks[0][2]
+            for _, _, chunk_text in chunks[1:]:
+                text = _join(text, chunk_text)
+            merged.append((Document(page_content=text, metadata=best_document.metadata), text, len(chunks)))
+        return merged
+
+    def _truncate(self, text: str, budget: int) -> str:
+        cut = text[:budget * CHARS_PER_TOKEN]
+        while cut and self.count_tokens(cut) > budget:
+            cut = cut[:int(len(cut) * 0.9)]
+        return cut.rsplit(" ", 1)[0] if " " in cut else cut
+
+    def pack(self, documents: Sequence[Document], scores: Optional[Sequence[float]] = None) -> PackedContext:
+        """
+        Pack chunks into the token budget.
+
+        Args:
+            documents (Sequence[Document]): Retrieved chunks.
+            scores (Optional[Sequence[float]]): Their retrieval scores, higher
+                is better. Without scores the given order is the ranking.
+
+        Returns:
+            PackedContext: Packed context and its token counts.
+        """
+        original_tokens = self.count_tokens(SEPARATOR.join(document.page_content for document in documents))
+        if scores is None:
+            scores = [-rank for rank in range(len(documents))]
+        ranked = sorted(
+            ((document, score, clean_whitespace(document.page_content)) for document, score in zip(documents, scores)),
+            key=lambda chunk: chunk[1],
+            reverse=True
+        )
+        passages = self._merge(self._deduplicate(ranked))
+
+        packed, pieces, used, chunks = [], [], 0, 0
+        separator_tokens = self.count_tokens(SEPARATOR)
+        for document, text, count in passages:
+            cost = self.count_tokens(text) + (separator_tokens if pieces else 0)
+            if used + cost > self.token_budget:
+                if pieces:
+                    continue
+                # Never return an empty context because the best passage is long
+                text = self._truncate(text, self.token_budget)
+                document = Document(page_content=text, metadata=document.metadata)
+                cost = self.count_tokens(text)
+            packed.append(document)
+            pieces.append(text)
+            used += cost
+            chunks += count
+
+        text = SEPARATOR.join(pieces)
+        return PackedContext(packed, text, self.count_tokens(text), original_tokens, chunks)
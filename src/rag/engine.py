@@ -0,0 +1,747 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.prompts import PromptTemplate
+from langgraph.graph import START, StateGraph
+from typing_extensions import List, TypedDict
+
+from src.data_loading.pdf_loader import PDFDataLoader
+from src.data_loading.webpage_loader import WebDataLoader
+from src.cache.factory import get_async_redis_client
+from src.ingestion import IngestionConfig, IngestionJobRunner, IngestionPipeline, IngestionStats, create_job_queue
+from src.ingestion.jobs import STAGE_FINALIZING, STAGE_INDEXING, Progress
+from src.llm.llm_chain import initialize_model_llm
+from src.llm.scheduler import PRIORITY_NORMAL, LLMScheduler
+from src.rag.context_packing import ContextPacker
+from src.rag.query_batcher import QueryBatcher
+from src.utils.source_type import determine_source_type
+from src.vector_store.base import VectorStoreConfig
+from src.vector_store.embeddings import initialize_embeddings
+from src.vector_store.factory import VectorStoreFactory, VectorStoreType
+from src.vector_store.sparse import RETRIEVAL_DENSE, RETRIEVAL_HYBRID
+
+
+template = """Use the following pieces of context to answer the question at the end.
+If you don't know the answer, just say that you don't know, don't try to make up an answer.
+Use three sentences maximum and keep the answer as concise as possible.
+Always say "thanks for asking!" at the end of the answer.
+
+{context}
+
+Question: {question}
+
+Helpful Answer:"""
+prompt = PromptTemplate.from_template(template)
+
+NO_ANSWER = "I don't know. thanks for asking!"
+
+
+class RetrievalOptions:
+    """Per-question retrieval settings; unset fields use the engine configuration."""
+
+    def __init__(
+        self,
+        k: Optional[int] = None,
+        score_threshold: Optional[float] = None,
+        sources: Optional[List[str]] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None
+    ):
+        """
+        Initialize retrieval options.
+
+        Args:
+            k (Optional[int]): Number of chunks to retrieve.
+            score_threshold (Optional[float]): Minimum similarity score.
+            sources (Optional[List[str]]): Only search chunks of these sources.
+            metadata_filter (Optional[Dict[str, Any]]): Metadata key -> value,
+                or list of accepted values, that chunks must match.
+            namespace (Optional[str]): Tenant or session whose collection is
+                searched; None for the default collection.
+        """
+        self.k = k
+        self.score_threshold = score_threshold
+        self.sources = sources
+        self.metadata_filter = metadata_filter
+        self.namespace = namespace
+
+    def filter(self) -> Optional[Dict[str, Any]]:
+        """Metadata filter combining `sources` and `metadata_filter`."""
+        conditions = dict(self.metadata_filter or {})
+        if self.sources:
+            conditions["source"] = list(self.sources)
+        return conditions or None
+
+
+# Define state for application
+class State(TypedDict):
+    question: str
+    options: Optional[RetrievalOptions]
+    context: List[Document]
+    scores: List[float]
+    answer: str
+    priority: str
+
+
+class RAGEngineConfig:
+    """Configuration class for the RAG engine."""
+
+    def __init__(
+        self,
+        llm_model_name: Optional[str] = None,
+        use_in_memory_store: bool = False,
+        vector_store_config: Optional[VectorStoreConfig] = None,
+        score_threshold: float = 0.50,
+        top_k: Optional[int] = None,
+        warm_up_llm: bool = True,
+        max_concurrency: Optional[int] = None,
+        load_concurrency: Optional[int] = None,
+        ingestion_config: Optional[IngestionConfig] = None,
+        mmr_lambda: Optional[float] = None,
+        mmr_fetch_k: Optional[int] = None,
+        context_token_budget: Optional[int] = None,
+        batch_window_ms: Optional[float] = None,
+        batch_max_size: Optional[int] = None,
+        llm_slots: Optional[int] = None,
+        llm_max_queue: Optional[int] = None,
+        llm_queue_timeout: Optional[float] = None,
+        load_fanout: Optional[int] = None
+    ):
+        """
+        Initialize RAG engine configuration.
+
+        Args:
+            llm_model_name (Optional[str]): Ollama chat model. Falls back to LLM_MODEL_NAME.
+            use_in_memory_store (bool): Flag to use in-memory or Qdrant store.
+            vector_store_config (Optional[VectorStoreConfig]): Configuration for vector store.
+            score_threshold (float): Minimum similarity score for retrieved chunks.
+            top_k (Optional[int]): Chunks retrieved per question. Falls back to
+                RETRIEVAL_K (default 4).
+            warm_up_llm (bool): Whether warm_up() should load the chat model in Ollama.
+            max_concurrency (Optional[int]): Maximum number of retrievals
+                running at once. Falls back to RAG_MAX_CONCURRENCY (default 8).
+            load_concurrency (Optional[int]): Maximum number of source loads
+                running at once, separate from retrievals so ingestion never
+                takes their slots. Falls back to LOAD_MAX_CONCURRENCY (default 2).
+            ingestion_config (Optional[IngestionConfig]): Batch size, queue size
+                and per-stage workers of the ingestion pipeline.
+            mmr_lambda (Optional[float]): Relevance/diversity trade-off of the
+                maximal marginal relevance stage, from 0 (diversity only) to 1
+                (relevance only). Falls back to MMR_LAMBDA; MMR is off when
+                neither is set.
+            mmr_fetch_k (Optional[int]): Candidates fetched for MMR to pick
+                from. Falls back to MMR_FETCH_K (default 20).
+            context_token_budget (Optional[int]): Maximum estimated tokens of
+                retrieved context in the prompt. Falls back to
+                CONTEXT_TOKEN_BUDGET (default 2000).
+            batch_window_ms (Optional[float]): How long a dense search waits
+                to be batched with concurrent questions. Falls back to
+                RETRIEVAL_BATCH_WINDOW_MS; batching is off when 0 (default).
+            batch_max_size (Optional[int]): Questions per retrieval batch.
+                Falls back to RETRIEVAL_BATCH_SIZE (default 16).
+            llm_slots (Optional[int]): LLM generations running at once; set it
+                to Ollama's OLLAMA_NUM_PARALLEL. Falls back to LLM_SLOTS (default 2).
+            llm_max_queue (Optional[int]): Questions allowed to wait for a
+                generation slot before new ones are rejected. Falls back to
+                LLM_MAX_QUEUE (default 32).
+            llm_queue_timeout (Optional[float]): Seconds a question may wait
+                for a generation slot. Falls back to LLM_QUEUE_TIMEOUT (default 30).
+            load_fanout (Optional[int]): Sources of a bulk load processed at
+                once. Falls back to LOAD_FANOUT (default 4).
+        """
+        self.llm_model_name = llm_model_name
+        self.use_in_memory_store = use_in_memory_store
+        self.vector_store_config = vector_store_config
+        self.score_threshold = score_threshold
+        self.top_k = top_k or int(os.getenv("RETRIEVAL_K", 4))
+        self.warm_up_llm = warm_up_llm
+        self.max_concurrency = max_concurrency or int(os.getenv("RAG_MAX_CONCURRENCY", 8))
+        self.load_concurrency = load_concurrency or int(os.getenv("LOAD_MAX_CONCURRENCY", 2))
+        self.ingestion_config = ingestion_config
+        if mmr_lambda is None and os.getenv("MMR_LAMBDA"):
+            mmr_lambda = float(os.getenv("MMR_LAMBDA"))
+        if mmr_lambda is not None and not 0 <= mmr_lambda <= 1:
+            raise ValueError(f"mmr_lambda must be between 0 and 1, got {mmr_lambda}")
+        self.mmr_lambda = mmr_lambda
+        self.mmr_fetch_k = mmr_fetch_k or int(os.getenv("MMR_FETCH_K", 20))
+        self.context_token_budget = context_token_budget or int(os.getenv("CONTEXT_TOKEN_BUDGET", 2000))
+        if batch_window_ms is None:
+            batch_window_ms = float(os.getenv("RETRIEVAL_BATCH_WINDOW_MS", 0))
+        self.batch_window_ms = batch_window_ms
+        self.batch_max_size = batch_max_size or int(os.getenv("RETRIEVAL_BATCH_SIZE", 16))
+        self.llm_slots = llm_slots or int(os.getenv("LLM_SLOTS", 2))
+        if llm_max_queue is None:
+            llm_max_queue = int(os.getenv("LLM_MAX_QUEUE", 32))
+        self.llm_max_queue = llm_max_queue
+        self.llm_queue_timeout = llm_queue_timeout or float(os.getenv("LLM_QUEUE_TIMEOUT", 30))
+        self.load_fanout = load_fanout or int(os.getenv("LOAD_FANOUT", 4))
+
+
+class RAGEngine:
+    """
+    Long-lived RAG runtime.
+
+    Owns the embedding and LLM clients, the vector store handle and the
+    compiled LangGraph graph, so that a question only pays for retrieval
+    and generation. Create it once per process and reuse it.
+
+    Every network-bound step is awaited, so concurrent questions overlap
+    their waits on Ollama, Qdrant and Redis instead of queueing.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RAGEngineConfig] = None,
+        embeddings=None,
+        llm=None,
+        vector_store_manager=None,
+        cache_client=None
+    ):
+        """
+        Initialize the RAG engine.
+
+        Args:
+            config (Optional[RAGEngineConfig]): Engine configuration.
+            embeddings: Embedding model. Defaults to initialize_embeddings().
+            llm: Chat model. Defaults to initialize_model_llm().
+            vector_store_manager: Vector store manager. Defaults to the one
+                selected by the configuration.
+            cache_client: Async Redis client. Defaults to get_async_redis_client().
+        """
+        self._config = config or RAGEngineConfig()
+
+        self.embeddings = embeddings or initialize_embeddings()
+        self.llm = llm or initialize_model_llm(self._config.llm_model_name)
+
+        if vector_store_manager is None:
+            store_type = (
+                VectorStoreType.IN_MEMORY
+                if self._config.use_in_memory_store
+                else VectorStoreType.QDRANT
+            )
+            vector_store_manager = VectorStoreFactory.create_vector_store_manager(
+                self.embeddings,
+                store_type,
+                self._config.vector_store_config
+            )
+        self.vector_store_manager = vector_store_manager
+        self.vector_store = self.vector_store_manager.create_vector_store()
+        self.cache_client = cache_client or get_async_redis_client()
+        self.pipeline = IngestionPipeline(self.vector_store, self._config.ingestion_config)
+        # Background /load jobs; workers start with start_jobs. Their loads
+        # take the load slots, never the retrieval ones
+        self.jobs = IngestionJobRunner(self.load_source, create_job_queue(client=self.cache_client))
+        self.context_packer = ContextPacker(self._config.context_token_budget)
+        self._context_stats = {"packed": 0, "original_tokens": 0, "tokens": 0}
+        self.query_batcher = (
+            QueryBatcher(self.embeddings, self._config.batch_window_ms, self._config.batch_max_size)
+            if self._config.batch_window_ms > 0
+            else None
+        )
+
+        self._semaphore = asyncio.Semaphore(self._config.max_concurrency)
+        # Loads have their own slots, so a refresh or a burst of loads
+        # cannot hold the ones questions retrieve with
+        self._load_slots = asyncio.Semaphore(self._config.load_concurrency)
+        self.llm_scheduler = LLMScheduler(
+            self._config.llm_slots,
+            self._config.llm_max_queue,
+            self._config.llm_queue_timeout
+        )
+        self.graph = self._build_graph()
+
+    def _build_graph(self):
+        """
+        Compile the retrieve -> generate graph.
+
+        Returns:
+            Compiled LangGraph graph.
+        """
+        graph_builder = StateGraph(State)
+        graph_builder.add_node("retrieve", self.retrieve)
+        graph_builder.add_node("generate", self.generate)
+        graph_builder.add_edge(START, "retrieve")
+        graph_builder.add_edge("retrieve", "generate")
+        return graph_builder.compile()
+
+    async def warm_up(self) -> None:
+        """
+        Pay connection and model-loading costs before the first request.
+
+        Embeds a probe string (loads the embedding model in Ollama and opens
+        the HTTP connection) and, unless disabled, asks the chat model for a
+        single token so its weights are resident.
+        """
+        start = time.perf_counter()
+        await self.embeddings.aembed_query("warm up")
+        if self._config.warm_up_llm:
+            await self.llm.ainvoke("ping", options={"num_predict": 1})
+        logging.info(f"RAG engine warmed up in {time.perf_counter() - start:.2f}s")
+
+    async def start_jobs(self) -> None:
+        """Start the workers running queued source loads."""
+        await self.jobs.start()
+
+    async def shutdown(self) -> None:
+        """Release the clients owned by the engine."""
+        await self.jobs.stop()
+        if self.query_batcher is not None:
+            await self.query_batcher.aclose()
+        await self.vector_store_manager.aclose()
+        await self.cache_client.aclose()
+
+    def stats(self) -> dict:
+        """
+        Runtime counters exposed by the engine's components.
+
+        Returns:
+            dict: Counters keyed by component.
+        """
+        stats = {}
+        if hasattr(self.embeddings, "stats"):
+            stats["embedding_cache"] = self.embeddings.stats()
+        context = self._context_stats
+        stats["context_packing"] = {
+            **context,
+            "saved_tokens": context["original_tokens"] - context["tokens"],
+            "saved_ratio": 1 - context["tokens"] / context["original_tokens"] if context["original_tokens"] else 0.0
+        }
+        if self.query_batcher is not None:
+            stats["query_batching"] = self.query_batcher.stats()
+        stats["llm_scheduler"] = self.llm_scheduler.stats()
+        return stats
+
+    @asynccontextmanager
+    async def _scope(self, namespace: Optional[str] = None) -> AsyncIterator[Tuple[Any, Any]]:
+        """
+        Vector store manager and store of a namespace, for the duration of
+        a request.
+
+        Namespace managers come from the manager's LRU pool, so after the
+        first request the collection check and store construction are not
+        repeated. The manager is leased from the pool until the block exits,
+        so it is not evicted while the request still uses it.
+
+        Args:
+            namespace (Optional[str]): Tenant or session; None for the
+                default collection.
+
+        Yields:
+            Tuple[Any, Any]: (vector store manager, vector store).
+        """
+        if not namespace:
+            yield self.vector_store_manager, self.vector_store
+            return
+        # Checking out or in may snapshot an evicted namespace: blocking calls
+        manager = await asyncio.to_thread(self.vector_store_manager.for_namespace, namespace)
+        try:
+            # First use of a collection checks or creates it: blocking calls
+            yield manager, await asyncio.to_thread(manager.create_vector_store)
+        finally:
+            await asyncio.to_thread(self.vector_store_manager.checkin, manager)
+
+    async def sources(self, namespace: Optional[str] = None) -> List[dict]:
+        """
+        Summaries of the indexed sources from the source registry.
+
+        Args:
+            namespace (Optional[str]): Tenant or session; None for the
+                default collection.
+
+        Returns:
+            List[dict]: Source, chunk count, content hash and ingest time.
+        """
+        async with self._scope(namespace) as (manager, _):
+            return await asyncio.to_thread(manager.list_sources)
+
+    # Define application steps
+    async def retrieve(self, state: State):
+        # Generation is bounded by the LLM scheduler; the semaphore bounds
+        # the embedding and vector store work of concurrent questions
+        async with self._semaphore:
+            return await self._retrieve(state)
+
+    async def _retrieve(self, state: State):
+        options = state.get("options") or RetrievalOptions()
+        async with self._scope(options.namespace) as (_, vector_store):
+            return await self._search(state, options, vector_store)
+
+    async def _search(self, state: State, options: RetrievalOptions, vector_store: Any):
+        k = options.k or self._config.top_k
+        score_threshold = (
+            options.score_threshold if options.score_threshold is not None else self._config.score_threshold
+        )
+        # The threshold and filters are applied by the vector store (payload
+        # filters and score_threshold in Qdrant), not after fetching
+        search = {"k": k, "score_threshold": score_threshold, "filter": options.filter()}
+        if self._config.mmr_lambda is not None:
+            # Diverse top-k from a wider pool, so near-duplicate chunks do
+            # not crowd the prompt
+            results = await vector_store.amax_marginal_relevance_search_with_score(
+                state["question"],
+                fetch_k=max(self._config.mmr_fetch_k, k),
+                lambda_mult=self._config.mmr_lambda,
+                **search
+            )
+        elif getattr(vector_store, "retrieval_mode", RETRIEVAL_DENSE) == RETRIEVAL_HYBRID:
+            # Fused keyword + dense ranking; the threshold gates the dense side
+            results = await vector_store.ahybrid_search_with_score(state["question"], **search)
+        elif self.query_batcher is not None and hasattr(vector_store, "asimilarity_search_batch_with_score_by_vector"):
+            # Concurrent questions share one embedding call and one search request
+            results = await self.query_batcher.search(vector_store, state["question"], search)
+        else:
+            results = await vector_store.asimilarity_search_with_score(state["question"], **search)
+        if not results:
+            # No relevant document found → empty context
+            return {"context": [], "scores": [], "answer": NO_ANSWER}
+        return {
+            "context": [doc for doc, _ in results],
+            "scores": [score for _, score in results],
+            "answer": None
+        }
+
+    async def generate(self, state: State):
+        # If 'answer' is already set, no need to call the LLM
+        if state.get("answer"):
+            return {"answer": state["answer"]}
+
+        packed = self.context_packer.pack(state["context"], state.get("scores"))
+        self._context_stats["packed"] += 1
+        self._context_stats["original_tokens"] += packed.original_tokens
+        self._context_stats["tokens"] += packed.tokens
+        logging.debug(
+            f"Packed {packed.chunks}/{len(state['context'])} chunks into {packed.tokens} tokens "
+            f"({packed.saved_tokens} saved)"
+        )
+        messages = await prompt.ainvoke({"question": state["question"], "context": packed.text})
+        # Identical prompts in flight share one generation
+        response = await self.llm_scheduler.run(
+            messages.to_string(),
+            lambda: self.llm.ainvoke(messages),
+            state.get("priority") or PRIORITY_NORMAL
+        )
+        return {"answer": response.content}
+
+    async def ask(
+        self,
+        question: str,
+        options: Optional[RetrievalOptions] = None,
+        priority: str = PRIORITY_NORMAL
+    ) -> str:
+        """
+        Answer a question against the loaded sources.
+
+        Args:
+            question (str): User question.
+            options (Optional[RetrievalOptions]): k, score threshold and
+                filters for this question.
+            priority (str): Place of the generation in the LLM queue:
+                'high', 'normal' or 'low'.
+
+        Returns:
+            str: Generated answer.
+
+        Raises:
+            SchedulerOverloaded: The LLM queue is full or the question waited
+                too long for a generation slot.
+        """
+        # Turn the question away before retrieval if it cannot be generated
+        self.llm_scheduler.check()
+        response = await self.graph.ainvoke({"question": question, "options": options, "priority": priority})
+        return response["answer"]
+
+    async def stream(
+        self,
+        question: str,
+        options: Optional[RetrievalOptions] = None,
+        priority: str = PRIORITY_NORMAL
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Answer a question, yielding events as the graph produces them.
+
+        Uses LangGraph's "updates" mode to emit the retrieved sources as soon
+        as the retrieve node finishes, and "messages" mode to forward LLM
+        tokens from the generate node while ChatOllama is still producing them.
+
+        Args:
+            question (str): User question.
+            options (Optional[RetrievalOptions]): k, score threshold and
+                filters for this question.
+            priority (str): Place of the generation in the LLM queue.
+
+        Yields:
+            Tuple[str, Any]: ("sources", list of metadata dicts), then
+            ("token", str) for each token, then ("done", full answer).
+        """
+        streamed_tokens = False
+        answer = ""
+
+        self.llm_scheduler.check()
+        async for mode, chunk in self.graph.astream(
+            {"question": question, "options": options, "priority": priority},
+            stream_mode=["updates", "messages"]
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") == "generate" and message.content:
+                    streamed_tokens = True
+                    yield "token", message.content
+            elif "retrieve" in chunk:
+                context = chunk["retrieve"].get("context") or []
+                yield "sources", [doc.metadata for doc in context]
+            elif "generate" in chunk:
+                answer = chunk["generate"]["answer"]
+
+        # Short-circuit answers (nothing retrieved) and answers shared with
+        # an identical question in flight were not streamed
+        if not streamed_tokens and answer:
+            yield "token", answer
+        yield "done", answer
+
+    async def load_source(
+        self,
+        source: str,
+        refresh: bool = False,
+        namespace: Optional[str] = None,
+        progress: Optional[Progress] = None,
+        checked: bool = False
+    ) -> dict:
+        """
+        Load, split and index a source.
+
+        Without `refresh`, sources that are already indexed are skipped.
+        With it, the loader first checks whether the source changed (HTTP
+        conditional GET, file size/mtime/hash) and stops there if it did
+        not. Otherwise only chunks that are not stored yet get embedded,
+        and chunks the source no longer contains are deleted afterwards.
+
+        The source streams through the ingestion pipeline (load, split,
+        embed, write), so its chunks become searchable batch by batch and
+        it is never held in memory as a whole. Registry lookups are
+        blocking, so they run in a worker thread.
+
+        Args:
+            source (str): URL or local PDF path.
+            refresh (bool): Re-check a source that is already indexed.
+            namespace (Optional[str]): Tenant or session whose collection the
+                source goes into; None for the default collection.
+            progress (Optional[Progress]): Called with the stage entered
+                ('indexing', 'finalizing') and, for indexing, the live
+                IngestionStats of the run.
+            checked (bool): The caller already found the source not indexed
+                (see triage_sources), so the lookup is not repeated.
+
+        Returns:
+            dict: `status` ('skipped', 'unchanged', 'indexed' or 'invalid')
+            and, when indexed, the number of chunks, added and removed.
+        """
+        async with self._scope(namespace) as (manager, vector_store):
+            pipeline = self.pipeline if manager is self.vector_store_manager else IngestionPipeline(
+                vector_store, self._config.ingestion_config
+            )
+            if not refresh and not checked and await asyncio.to_thread(manager.document_exists, source):
+                return {"source": source, "status": "skipped"}
+
+            source_type = determine_source_type(source)
+            if source_type == "unknown":
+                print(f"URL '{source}' is not a valid source.")
+                return {"source": source, "status": "invalid"}
+            elif source_type == "pdf":
+                loader = PDFDataLoader(source)
+            else:
+                loader = WebDataLoader(url=source)
+
+            async with self._load_slots:
+                record = await asyncio.to_thread(manager.get_source_record, source) if refresh else None
+                docs, fingerprint = await asyncio.to_thread(
+                    loader.load_if_changed,
+                    record.fingerprint if record is not None else None
+                )
+                if docs is None:
+                    # Keep e.g. a touched file's new mtime so it is not hashed again
+                    if record is not None and fingerprint != record.fingerprint and manager.registry is not None:
+                        record.fingerprint = fingerprint
+                        await asyncio.to_thread(manager.registry.record, record)
+                    print(f"URL '{source}' is unchanged.")
+                    return {"source": source, "status": "unchanged"}
+
+                # Split and index chunks; chunks already stored are not re-embedded
+                previous = set(await asyncio.to_thread(manager.source_point_ids, source)) if refresh else set()
+                stats = IngestionStats()
+                if progress is not None:
+                    progress(STAGE_INDEXING, stats)
+                await pipeline.run(docs, stats=stats)
+                digest = stats.sources[0]
+
+                # Drop chunks the new version no longer has, after the new ones are in
+                if progress is not None:
+                    progress(STAGE_FINALIZING)
+                stale = list(previous - set(digest.point_ids))
+                if stale:
+                    await asyncio.to_thread(manager.delete_points, stale)
+                await asyncio.to_thread(manager.record_source, digest.to_record(source, fingerprint))
+                await asyncio.to_thread(manager.persist)
+
+            added = stats.chunks - stats.skipped
+            print(f"URL '{source}' indexed successfully "
+                  f"({stats.chunks} chunks, {added} new, {len(stale)} removed, "
+                  f"{stats.chunks_per_second:.1f} chunks/s).")
+            return {
+                "source": source,
+                "status": "indexed",
+                "chunks": stats.chunks,
+                "added": added,
+                "removed": len(stale)
+            }
+
+    async def triage_sources(
+        self,
+        sources: List[str],
+        refresh: bool = False,
+        namespace: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Sort the sources of a bulk load before any of them is fetched.
+
+        Repeated sources are reported once as loaded and then as
+        'duplicate', sources of unknown type as 'invalid', and, without
+        `refresh`, sources already indexed as 'skipped'; the latter are
+        found with one batched lookup (a pipelined registry check and one
+        Qdrant facet query) instead of one per source.
+
+        Args:
+            sources (List[str]): URLs or local PDF paths.
+            refresh (bool): Re-check sources that are already indexed.
+            namespace (Optional[str]): Tenant or session; None for the
+                default collection.
+
+        Returns:
+            List[dict]: One result per source, in order; sources left to
+            load have status 'pending'.
+        """
+        results, seen = [], set()
+        for source in sources:
+            source = source.strip()
+            if source in seen:
+                results.append({"source": source, "status": "duplicate"})
+                continue
+            seen.add(source)
+            status = "invalid" if determine_source_type(source) == "unknown" else "pending"
+            results.append({"source": source, "status": status})
+
+        pending = [result["source"] for result in results if result["status"] == "pending"]
+        if pending and not refresh:
+            async with self._scope(namespace) as (manager, _):
+                existing = await asyncio.to_thread(manager.existing_sources, pending)
+            for result in results:
+                if result["status"] == "pending" and result["source"] in existing:
+                    result["status"] = "skipped"
+        return results
+
+    async def load_sources(
+        self,
+        sources: List[str],
+        refresh: bool = False,
+        namespace: Optional[str] = None,
+        fanout: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Load many sources, `fanout` at a time.
+
+        The sources are triaged first (see triage_sources); the remaining
+        ones go through load_source concurrently, still bounded overall by
+        load_concurrency.
+
+        Args:
+            sources (List[str]): URLs or local PDF paths.
+            refresh (bool): Re-check sources that are already indexed.
+            namespace (Optional[str]): Tenant or session; None for the
+                default collection.
+            fanout (Optional[int]): Sources loaded at once. Defaults to
+                the configured load_fanout.
+
+        Returns:
+            List[dict]: One result per source, in order; failures have
+            status 'error' and the error message.
+        """
+        results = await self.triage_sources(sources, refresh=refresh, namespace=namespace)
+        slots = asyncio.Semaphore(max(1, fanout or self._config.load_fanout))
+
+        async def load(index: int) -> None:
+            source = results[index]["source"]
+            async with slots:
+                try:
+                    results[index] = await self.load_source(
+                        source, refresh=refresh, namespace=namespace, checked=not refresh
+                    )
+                except Exception as e:
+                    results[index] = {"source": source, "status": "error", "error": str(e)}
+
+        await asyncio.gather(*(
+            load(index) for index, result in enumerate(results) if result["status"] == "pending"
+        ))
+        return results
+
+    async def queue_sources(
+        self,
+        sources: List[str],
+        refresh: bool = False,
+        namespace: Optional[str] = None,
+        fanout: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Triage sources like load_sources, then queue a background job per
+        source left to load, `fanout` of them running at once.
+
+        Args:
+            sources (List[str]): URLs or local PDF paths.
+            refresh (bool): Re-check sources that are already indexed.
+            namespace (Optional[str]): Tenant or session; None for the
+                default collection.
+            fanout (Optional[int]): Jobs of this call running at once.
+                Defaults to the configured load_fanout; the job workers
+                bound it too.
+
+        Returns:
+            List[dict]: One result per source, in order; queued sources
+            have status 'queued' and their `job_id`.
+        """
+        results = await self.triage_sources(sources, refresh=refresh, namespace=namespace)
+        pending = [result for result in results if result["status"] == "pending"]
+        jobs = await self.jobs.submit_many(
+            [result["source"] for result in pending],
+            refresh=refresh,
+            namespace=namespace,
+            checked=not refresh,
+            fanout=fanout or self._config.load_fanout
+        )
+        for result, job in zip(pending, jobs):
+            result.update(status="queued", job_id=job.id)
+        return results
+
+    async def refresh_sources(self, namespace: Optional[str] = None) -> List[dict]:
+        """
+        Refresh every registered source, up to load_concurrency at a time.
+
+        Args:
+            namespace (Optional[str]): Tenant or session; None for the
+                default collection.
+
+        Returns:
+            List[dict]: One load_source result per source; failures have
+            status 'error' and the error message.
+        """
+        sources = [record["source"] for record in await self.sources(namespace)]
+
+        async def refresh(source: str) -> dict:
+            try:
+                return await self.load_source(source, refresh=True, namespace=namespace)
+            except Exception as e:
+                return {"source": source, "status": "error", "error": str(e)}
+
+        return await asyncio.gather(*(refresh(source) for source in sources))
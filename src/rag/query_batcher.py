@@ -0,0 +1,127 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+
+class _Query:
+    __slots__ = ("vector_store", "text", "search", "future")
+
+    def __init__(self, vector_store, text: str, search: Dict[str, Any], future: asyncio.Future):
+        self.vector_store = vector_store
+        self.text = text
+        self.search = search
+        self.future = future
+
+
+class QueryBatcher:
+    """
+    Coalesces concurrent dense searches into batches.
+
+    A query waits up to `window_ms` for others to arrive; a batch is sent as
+    soon as it holds `max_batch_size` queries. The questions of a batch are
+    embedded with one embed_documents call (repeated questions once), and
+    each vector store receives its queries as one batched search, so at
+    high QPS the embedding server and Qdrant see one request per batch
+    instead of one per question.
+    """
+
+    def __init__(self, embeddings, window_ms: float = 5.0, max_batch_size: int = 16):
+        """
+        Initialize the batcher.
+
+        Args:
+            embeddings: Embedding model shared by the vector stores searched.
+            window_ms (float): Longest time a query waits for a batch to fill.
+            max_batch_size (int): Queries per batch.
+        """
+        self._embeddings = embeddings
+        self.window = window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: List[_Query] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Running batches, referenced so they are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"batches": 0, "queries": 0, "embedded": 0}
+
+    async def search(self, vector_store, query: str, search: Dict[str, Any]) -> List[Tuple[Document, float]]:
+        """
+        Dense search for one question, batched with concurrent ones.
+
+        Args:
+            vector_store: Store with asimilarity_search_batch_with_score_by_vector.
+            query (str): Question text.
+            search (Dict[str, Any]): Search arguments (k, score_threshold, filter).
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with similarity scores.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_Query(vector_store, query, search, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Query]) -> None:
+        self._stats["batches"] += 1
+        self._stats["queries"] += len(batch)
+        try:
+            texts = list(dict.fromkeys(query.text for query in batch))
+            self._stats["embedded"] += len(texts)
+            vectors = dict(zip(texts, await self._embeddings.aembed_documents(texts)))
+            groups: Dict[int, List[_Query]] = {}
+            for query in batch:
+                groups.setdefault(id(query.vector_store), []).append(query)
+            await asyncio.gather(*(self._search(queries, vectors) for queries in groups.values()))
+        except Exception as e:
+            for query in batch:
+                if not query.future.done():
+                    query.future.set_exception(e)
+
+    @staticmethod
+    async def _search(queries: List[_Query], vectors: Dict[str, List[float]]) -> None:
+        try:
+            results = await queries[0].vector_store.asimilarity_search_batch_with_score_by_vector(
+                [vectors[query.text] for query in queries],
+                [query.search for query in queries]
+            )
+        except Exception as e:
+            for query in queries:
+                if not query.future.done():
+                    query.future.set_exception(e)
+            return
+        for query, result in zip(queries, results):
+            # The caller may have been cancelled while the batch ran
+            if not query.future.done():
+                query.future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Batching counters.
+
+        Returns:
+            Dict[str, float]: Batches sent, queries served, questions
+            embedded (after deduplication) and the mean batch size.
+        """
+        stats = dict(self._stats)
+        stats["mean_batch_size"] = stats["queries"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    async def aclose(self) -> None:
+        """Send the queries still waiting and let running batches finish."""
+        self._dispatch()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
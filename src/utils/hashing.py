@@ -0,0 +1,56 @@
+import hashlib
+import re
+import unicodedata
+import uuid
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so that cosmetic differences do not change its hash.
+
+    Applies Unicode NFC normalization, collapses runs of whitespace to a
+    single space and strips leading/trailing whitespace.
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Normalized text.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash the normalized form of a text.
+
+    Args:
+        text (str): Text to hash.
+
+    Returns:
+        str: Hex-encoded SHA-256 digest of the normalized text.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+# Namespace for chunk point IDs; changing it re-keys every stored chunk
+CHUNK_ID_NAMESPACE = uuid.UUID("5f0c8a52-3c1e-4c47-9a63-0d8f7f6a9e21")
+
+
+def chunk_id(source: str, text: str) -> str:
+    """
+    Derive a deterministic point ID for a chunk.
+
+    The ID is a UUIDv5 of the source and the normalized chunk text, so
+    indexing the same chunk twice targets the same point.
+
+    Args:
+        source (str): Source the chunk was loaded from.
+        text (str): Chunk content.
+
+    Returns:
+        str: UUID string usable as a Qdrant point ID.
+    """
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{source}\n{normalize_text(text)}"))
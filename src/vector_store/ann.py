@@ -0,0 +1,209 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+
+# Rows per block when assigning vectors to centroids
+_BLOCK_ROWS = 8192
+
+
+class IVFConfig:
+    """Configuration for the IVF-flat approximate index of the local store."""
+
+    def __init__(
+        self,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        min_rows: Optional[int] = None,
+        iterations: int = 10,
+        sample_per_list: int = 64,
+        retrain_growth: float = 4.0
+    ):
+        """
+        Initialize IVF configuration.
+
+        Args:
+            nlist (Optional[int]): Number of clusters (build time). Defaults
+                to 4 * sqrt(rows) at training time.
+            nprobe (Optional[int]): Clusters scanned per query (query time).
+                Falls back to LOCAL_IVF_NPROBE, default 8.
+            min_rows (Optional[int]): Below this many rows searches stay
+                exact. Falls back to LOCAL_IVF_MIN_ROWS, default 20000.
+            iterations (int): k-means iterations.
+            sample_per_list (int): Training rows sampled per cluster.
+            retrain_growth (float): Retrain once the index has grown by this
+                factor since the last training, keeping clusters balanced
+                under incremental inserts.
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe or int(os.getenv("LOCAL_IVF_NPROBE", "8"))
+        self.min_rows = min_rows or int(os.getenv("LOCAL_IVF_MIN_ROWS", "20000"))
+        self.iterations = iterations
+        self.sample_per_list = sample_per_list
+        self.retrain_growth = retrain_growth
+
+
+class IVFIndex:
+    """
+    Inverted-file partition of the rows of a LocalVectorIndex.
+
+    Rows are clustered with spherical k-means; a query is compared with the
+    centroids and only the rows of the `nprobe` closest clusters are
+    scored. The vectors themselves stay in the LocalVectorIndex, this class
+    only keeps the centroids and the row -> cluster assignment.
+    """
+
+    def __init__(self, dimension: int, config: Optional[IVFConfig] = None):
+        """
+        Initialize an untrained IVF partition.
+
+        Args:
+            dimension (int): Dimensionality of the vectors.
+            config (Optional[IVFConfig]): IVF configuration.
+        """
+        self.dimension = dimension
+        self.config = config or IVFConfig()
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_rows = 0
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self._lists: Optional[List[np.ndarray]] = None
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def assignments(self) -> np.ndarray:
+        """Cluster of every row (a view, do not modify)."""
+        return self._assignments[:self._size]
+
+    def needs_training(self, rows: int) -> bool:
+        """Whether an index of `rows` rows should be (re)trained now."""
+        if rows < self.config.min_rows:
+            return False
+        return not self.trained or rows >= self.trained_rows * self.config.retrain_growth
+
+    def _nearest(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        labels = np.empty(vectors.shape[0], dtype=np.int32)
+        for start in range(0, vectors.shape[0], _BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + _BLOCK_ROWS], dtype=np.float32)
+            labels[start:start + _BLOCK_ROWS] = np.argmax(block @ centroids.T, axis=1)
+        return labels
+
+    def train(self, vectors: np.ndarray, seed: int = 0) -> None:
+        """
+        Cluster the rows and assign every row to its closest centroid.
+
+        Args:
+            vectors (np.ndarray): Normalised vectors of all rows.
+            seed (int): Seed of the training sample and initial centroids.
+        """
+        rows = vectors.shape[0]
+        nlist = self.config.nlist or int(4 * np.sqrt(rows))
+        # At least ~39 training rows per cluster, as usual for k-means
+        nlist = max(1, min(nlist, rows // 39))
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(rows, nlist * self.config.sample_per_list)
+        picked = np.sort(rng.choice(rows, sample_size, replace=False))
+        sample = np.asarray(vectors[picked], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.config.iterations):
+            labels = self._nearest(sample, centroids)
+            counts = np.bincount(labels, minlength=nlist)
+            nonempty = counts > 0
+            ordered = sample[np.argsort(labels, kind="stable")]
+            bounds = np.concatenate(([0], np.cumsum(counts)))
+            # Per-cluster slice sums beat np.add.reduceat/np.add.at here
+            for label in np.flatnonzero(nonempty):
+                centroids[label] = ordered[bounds[label]:bounds[label + 1]].sum(axis=0)
+            # Re-seed empty clusters from random sample rows
+            centroids[~nonempty] = sample[rng.choice(sample_size, int((~nonempty).sum()))]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids /= norms
+
+        self.centroids = centroids
+        self.trained_rows = rows
+        self._assignments = self._nearest(vectors, centroids)
+        self._size = rows
+        self._lists = None
+
+    def update(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """
+        Assign inserted or overwritten rows to their closest clusters.
+
+        Args:
+            rows (np.ndarray): Row numbers, appended rows in increasing order.
+            vectors (np.ndarray): Normalised vectors of those rows.
+        """
+        if not self.trained or rows.shape[0] == 0:
+            return
+        labels = self._nearest(vectors, self.centroids)
+        required = int(rows.max()) + 1
+        if required > self._assignments.shape[0]:
+            grown = np.zeros(max(required, 2 * self._assignments.shape[0]), dtype=np.int32)
+            grown[:self._size] = self._assignments[:self._size]
+            self._assignments = grown
+
+        appended = rows >= self._size
+        if self._lists is not None and not appended.all():
+            # An overwritten row may move between clusters; rebuild lazily
+            self._lists = None
+        self._assignments[rows] = labels
+        if self._lists is not None:
+            for label in np.unique(labels):
+                self._lists[label] = np.concatenate((self._lists[label], rows[labels == label]))
+        self._size = max(self._size, required)
+
+    def compact(self, kept_rows: np.ndarray) -> None:
+        """Renumber rows after a LocalVectorIndex compaction."""
+        if not self.trained:
+            return
+        self._assignments = self._assignments[kept_rows]
+        self._size = kept_rows.shape[0]
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            assignments = self.assignments
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(assignments[order], np.arange(self.centroids.shape[0] + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.centroids.shape[0])]
+        return self._lists
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """
+        Rows of the clusters closest to the query.
+
+        Args:
+            query (np.ndarray): Normalised query vector.
+            nprobe (Optional[int]): Clusters to scan; config.nprobe by default.
+
+        Returns:
+            np.ndarray: Candidate rows in increasing order.
+        """
+        nprobe = min(nprobe or self.config.nprobe, self.centroids.shape[0])
+        scores = self.centroids @ query
+        probed = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        lists = self._inverted_lists()
+        rows = np.concatenate([lists[label] for label in probed])
+        rows.sort()
+        return rows
+
+    def restore(self, centroids: np.ndarray, assignments: np.ndarray, trained_rows: int) -> None:
+        """
+        Restore a trained partition from a snapshot.
+
+        Args:
+            centroids (np.ndarray): Cluster centroids.
+            assignments (np.ndarray): Cluster of every row.
+            trained_rows (int): Row count at the last training.
+        """
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self._assignments = np.array(assignments, dtype=np.int32).reshape(-1)
+        self._size = self._assignments.shape[0]
+        self.trained_rows = trained_rows
+        self._lists = None
@@ -1,18 +1,87 @@
+import hashlib
+import os
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 from langchain.docstore.document import Document
 
+from src.utils.hashing import chunk_id
+from .ann import IVFConfig
+from .sparse import RETRIEVAL_DENSE, RETRIEVAL_HYBRID
+
+
+def unique_chunks(
+    documents: List[Document],
+    ids: Optional[Sequence[str]] = None
+) -> Tuple[List[Document], List[str]]:
+    """
+    Pair documents with deterministic point IDs, dropping repeats.
+    
+    Args:
+        documents (List[Document]): Chunks to index.
+        ids (Optional[Sequence[str]]): Explicit IDs. Derived from each chunk's
+            `source` metadata and normalized content when omitted.
+    
+    Returns:
+        Tuple[List[Document], List[str]]: First occurrence of every ID, in order.
+    """
+    if ids is None:
+        ids = [
+            chunk_id(str(document.metadata.get("source", "")), document.page_content)
+            for document in documents
+        ]
+    seen = set()
+    unique_documents, unique_ids = [], []
+    for document, point_id in zip(documents, ids):
+        if point_id not in seen:
+            seen.add(point_id)
+            unique_documents.append(document)
+            unique_ids.append(point_id)
+    return unique_documents, unique_ids
+
+
+def namespaced_collection(collection_name: str, namespace: str) -> str:
+    """
+    Collection holding one tenant's or session's chunks.
+
+    Characters Qdrant does not accept in collection names are replaced;
+    a hash suffix then keeps distinct namespaces distinct.
+
+    Args:
+        collection_name (str): Base collection name.
+        namespace (str): Tenant or session identifier.
+
+    Returns:
+        str: e.g. 'default_collection__acme'.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", namespace)[:64]
+    if safe != namespace:
+        safe += "_" + hashlib.sha1(namespace.encode("utf-8")).hexdigest()[:8]
+    return f"{collection_name}__{safe}"
+
+
 class BaseVectorStoreManager(ABC):
     """Abstract base class for vector store management."""
     
-    def __init__(self, embeddings):
+    def __init__(self, embeddings, config: Optional["VectorStoreConfig"] = None):
         """
         Initialize vector store manager.
         
         Args:
             embeddings: Embedding model to use for vectorization.
+            config (Optional[VectorStoreConfig]): Configuration for vector store.
         """
         self._embeddings = embeddings
+        self._config = config or VectorStoreConfig()
+        # SourceRegistry set by subclasses; None disables source records
+        self.registry = None
+        # Managers of namespaced collections, least recently used first
+        self._pool: "OrderedDict[str, BaseVectorStoreManager]" = OrderedDict()
+        # Leases held on pooled managers by collection; leased ones are not evicted
+        self._leases: Dict[str, int] = {}
+        self._pool_lock = threading.Lock()
     
     @abstractmethod
     def create_vector_store(self) -> Any:
@@ -36,6 +105,18 @@ class BaseVectorStoreManager(ABC):
             bool: True if document exists, False otherwise.
         """
         pass
+
+    def existing_sources(self, sources: List[str]) -> Set[str]:
+        """
+        Subset of sources that are already indexed.
+        
+        Args:
+            sources (List[str]): URLs or unique identifiers.
+        
+        Returns:
+            Set[str]: Sources with chunks in the vector store.
+        """
+        return {source for source in sources if self.document_exists(source)}
     
     @abstractmethod
     def add_documents(self, documents: List[Document]) -> None:
@@ -47,6 +128,150 @@ class BaseVectorStoreManager(ABC):
         """
         pass
 
+    def record_source(self, record: Any) -> None:
+        """
+        Store a prebuilt source record, e.g. from a streamed ingestion.
+        
+        Args:
+            record (SourceRecord): Record to store.
+        """
+        if self.registry is not None:
+            self.registry.record(record)
+
+    def get_source_record(self, source: str) -> Any:
+        """
+        Registry record of a source.
+        
+        Args:
+            source (str): URL or unique identifier.
+        
+        Returns:
+            Optional[SourceRecord]: Record, or None if the source is unknown.
+        """
+        return self.registry.get(source) if self.registry is not None else None
+
+    def source_point_ids(self, source: str) -> List[str]:
+        """
+        IDs of the chunks stored for a source, from the registry.
+        
+        Args:
+            source (str): URL or unique identifier.
+        
+        Returns:
+            List[str]: Point IDs.
+        """
+        record = self.get_source_record(source)
+        return record.point_ids if record is not None else []
+
+    @abstractmethod
+    def delete_points(self, ids: List[str]) -> None:
+        """
+        Delete chunks by point ID.
+        
+        Args:
+            ids (List[str]): Point IDs to delete.
+        """
+        pass
+
+    def list_sources(self) -> List[dict]:
+        """
+        Summaries of the registered sources.
+        
+        Returns:
+            List[dict]: Source, chunk count, content hash and ingest time.
+        """
+        if self.registry is None:
+            return []
+        return [record.summary() for record in self.registry.records()]
+
+    def for_namespace(self, namespace: Optional[str]) -> "BaseVectorStoreManager":
+        """
+        Check out the manager of a tenant's or session's collection.
+
+        Managers are pooled per collection (least recently used evicted past
+        VectorStoreConfig.pool_size), so a namespace's store handle, its
+        collection check and its registry are set up once, not per request.
+        The manager is leased until handed back with checkin(), and leased
+        managers are never evicted: a load still writing to an evicted store
+        would otherwise race the new manager of the same collection.
+
+        Args:
+            namespace (Optional[str]): Tenant or session identifier; None or
+                empty for the default collection.
+
+        Returns:
+            BaseVectorStoreManager: Manager scoped to the namespace's collection.
+        """
+        if not namespace:
+            return self
+        collection_name = namespaced_collection(self._config.collection_name, namespace)
+        with self._pool_lock:
+            manager = self._pool.get(collection_name)
+            if manager is not None:
+                self._pool.move_to_end(collection_name)
+            else:
+                manager = self._pool[collection_name] = self._scoped(collection_name)
+            self._leases[collection_name] = self._leases.get(collection_name, 0) + 1
+            self._evict()
+        return manager
+
+    def checkin(self, manager: "BaseVectorStoreManager") -> None:
+        """
+        Hand back a manager checked out with for_namespace().
+
+        Args:
+            manager (BaseVectorStoreManager): The checked out manager.
+        """
+        if manager is self:
+            return
+        collection_name = manager._config.collection_name
+        with self._pool_lock:
+            self._leases[collection_name] -= 1
+            if not self._leases[collection_name]:
+                del self._leases[collection_name]
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Release least recently used managers past the pool limit, skipping
+        leased ones, so the pool may briefly exceed it. Runs under the pool
+        lock: a namespace's next manager is not created while its evicted one
+        is still being released.
+        """
+        limit = self._pool_limit()
+        if limit is None:
+            return
+        for collection_name in list(self._pool):
+            if len(self._pool) <= limit:
+                return
+            if collection_name not in self._leases:
+                self._pool.pop(collection_name).release()
+
+    @abstractmethod
+    def _scoped(self, collection_name: str) -> "BaseVectorStoreManager":
+        """Manager of another collection, sharing this manager's clients."""
+        pass
+
+    def _pool_limit(self) -> Optional[int]:
+        """Pooled namespace managers kept; None keeps all of them."""
+        return self._config.pool_size
+
+    def release(self) -> None:
+        """Drop a namespace manager evicted from the pool, keeping shared clients open."""
+        pass
+
+    def persist(self) -> None:
+        """Flush the store to durable storage, for backends that need it."""
+        pass
+
+    def close(self) -> None:
+        """Release any client held by the manager."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release any client held by the manager from async code."""
+        self.close()
+
 class VectorStoreConfig:
     """Configuration class for vector store settings."""
     
@@ -55,7 +280,19 @@ class VectorStoreConfig:
         collection_name: str = "default_collection",
         vector_size: int = 768,
         distance_metric: str = "Cosine",
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        persist_path: Optional[str] = None,
+        quantization: Optional[str] = None,
+        rescore: bool = True,
+        oversampling: float = 2.0,
+        ann: Optional[IVFConfig] = None,
+        retrieval_mode: Optional[str] = None,
+        indexed_fields: Optional[Dict[str, str]] = None,
+        pool_size: Optional[int] = None,
+        prefer_grpc: Optional[bool] = None,
+        grpc_port: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None,
+        upsert_parallel: Optional[int] = None
     ):
         """
         Initialize vector store configuration.
@@ -65,8 +302,66 @@ class VectorStoreConfig:
             vector_size (int): Dimensionality of vectors.
             distance_metric (str): Distance metric for vector comparison.
             url (Optional[str]): URL for remote vector store.
+            persist_path (Optional[str]): Snapshot directory of the local vector
+                store. Falls back to LOCAL_VECTOR_STORE_PATH; unset keeps the
+                local store in memory only.
+            quantization (Optional[str]): Vector quantization: 'none', 'scalar'
+                (int8, 4x smaller) or 'binary' (1 bit, 32x smaller). Falls back
+                to VECTOR_QUANTIZATION, default 'none'. Qdrant applies it when
+                the collection is created.
+            rescore (bool): Re-rank quantized candidates with the full-precision
+                vectors.
+            oversampling (float): Candidates fetched per requested result
+                before rescoring.
+            ann (Optional[IVFConfig]): Approximate (IVF) search for the local
+                store. Defaults to IVFConfig() when LOCAL_VECTOR_INDEX=ivf,
+                otherwise local search is exact.
+            retrieval_mode (Optional[str]): 'dense', or 'hybrid' to also index
+                BM25 term weights (Qdrant sparse vectors, or an inverted index
+                next to the local store) and fuse both rankings with
+                reciprocal rank fusion. Falls back to RETRIEVAL_MODE, default
+                'dense'.
+            indexed_fields (Optional[Dict[str, str]]): Metadata fields to
+                filter on, mapped to their Qdrant payload index type
+                ('keyword', 'integer', ...). `source` is always indexed.
+                Falls back to QDRANT_INDEXED_FIELDS, e.g. 'page:integer,lang'
+                (type defaults to keyword).
+            pool_size (Optional[int]): Namespaced collections whose store
+                handles are kept ready. Falls back to VECTOR_STORE_POOL_SIZE
+                (default 32).
+            prefer_grpc (Optional[bool]): Talk to Qdrant over gRPC instead of
+                HTTP/JSON. Falls back to QDRANT_PREFER_GRPC (default false).
+            grpc_port (Optional[int]): Qdrant gRPC port. Falls back to
+                QDRANT_GRPC_PORT (default 6334).
+            upsert_batch_size (Optional[int]): Points per Qdrant upsert
+                request. Falls back to QDRANT_UPSERT_BATCH_SIZE (default 256).
+            upsert_parallel (Optional[int]): Upsert requests in flight at once.
+                Falls back to QDRANT_UPSERT_PARALLEL (default 4).
         """
         self.collection_name = collection_name
         self.vector_size = vector_size
         self.distance_metric = distance_metric
-        self.url = url
\ No newline at end of file
+        self.url = url
+        self.persist_path = persist_path or os.getenv("LOCAL_VECTOR_STORE_PATH")
+        self.quantization = quantization or os.getenv("VECTOR_QUANTIZATION", "none")
+        self.rescore = rescore
+        self.oversampling = oversampling
+        if ann is None and os.getenv("LOCAL_VECTOR_INDEX", "flat") == "ivf":
+            ann = IVFConfig()
+        self.ann = ann
+        self.retrieval_mode = (retrieval_mode or os.getenv("RETRIEVAL_MODE", RETRIEVAL_DENSE)).lower()
+        if self.retrieval_mode not in (RETRIEVAL_DENSE, RETRIEVAL_HYBRID):
+            raise ValueError(f"Unsupported retrieval mode: {self.retrieval_mode}")
+        if indexed_fields is None:
+            indexed_fields = {}
+            for field in filter(None, os.getenv("QDRANT_INDEXED_FIELDS", "").split(",")):
+                name, _, schema = field.strip().partition(":")
+                indexed_fields[name] = schema or "keyword"
+        self.indexed_fields = indexed_fields
+        self.pool_size = pool_size or int(os.getenv("VECTOR_STORE_POOL_SIZE", 32))
+        if prefer_grpc is None:
+            prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port or int(os.getenv("QDRANT_GRPC_PORT", 6334))
+        self.upsert_batch_size = upsert_batch_size or int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", 256))
+        self.upsert_parallel = upsert_parallel or int(os.getenv("QDRANT_UPSERT_PARALLEL", 4))
\ No newline at end of file
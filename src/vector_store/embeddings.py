@@ -1,7 +1,197 @@
+import array
+import asyncio
+import base64
+import os
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
 from langchain_ollama.embeddings import OllamaEmbeddings
 
+from src.cache.base import BaseCacheManager
+from src.cache.disk_cache import DiskCacheConfig
+from src.cache.factory import CacheFactory, CacheType
+from src.cache.redis_cache import RedisCacheConfig
+from src.utils.hashing import content_hash
+
+
+def _encode_vector(vector: List[float]) -> str:
+    """Pack a vector as base64 float32 so it fits string-valued caches."""
+    return base64.b64encode(array.array("f", vector).tobytes()).decode("ascii")
+
+
+def _decode_vector(value: str) -> List[float]:
+    """Unpack a vector stored by _encode_vector."""
+    vector = array.array("f")
+    vector.frombytes(base64.b64decode(value))
+    return vector.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper backed by a content-addressed cache.
+
+    Vectors are stored under (model name, hash of the normalized text), so
+    re-ingesting a source, indexing the same text into another collection or
+    repeating a question never re-embeds it. Lookups are done in bulk and
+    only the cache misses are sent to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_manager: BaseCacheManager,
+        model_name: Optional[str] = None,
+        key_prefix: str = "emb"
+    ):
+        """
+        Initialize the caching wrapper.
+
+        Args:
+            embeddings (Embeddings): Embedding model to wrap.
+            cache_manager (BaseCacheManager): Backing store (Redis or disk).
+            model_name (Optional[str]): Name used in cache keys. Defaults to
+                the wrapped model's `model` attribute.
+            key_prefix (str): Prefix of the cache keys.
+        """
+        self._embeddings = embeddings
+        self._cache = cache_manager
+        self._model_name = model_name or getattr(embeddings, "model", type(embeddings).__name__)
+        self._key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return f"{self._key_prefix}:{self._model_name}:{content_hash(text)}"
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[Optional[List[float]]], Dict[str, List[int]]]:
+        """
+        Fetch cached vectors for texts.
+
+        Returns:
+            The vectors found (None for misses) and, for every missing key,
+            the positions of the texts that share it.
+        """
+        keys = [self._key(text) for text in texts]
+        cached = self._cache.get_many(keys)
+
+        vectors: List[Optional[List[float]]] = []
+        missing: Dict[str, List[int]] = {}
+        for position, (key, value) in enumerate(zip(keys, cached)):
+            if value is None:
+                vectors.append(None)
+                missing.setdefault(key, []).append(position)
+            else:
+                vectors.append(_decode_vector(value))
+
+        self.misses += sum(len(positions) for positions in missing.values())
+        self.hits += len(texts) - sum(len(positions) for positions in missing.values())
+        return vectors, missing
+
+    def _store(
+        self,
+        vectors: List[Optional[List[float]]],
+        missing: Dict[str, List[int]],
+        computed: List[List[float]]
+    ) -> Dict[str, str]:
+        """Fill the misses with computed vectors and return the entries to cache."""
+        entries = {}
+        for (key, positions), vector in zip(missing.items(), computed):
+            entries[key] = _encode_vector(vector)
+            for position in positions:
+                vectors[position] = vector
+        return entries
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, only sending cache misses to the wrapped model.
+
+        Args:
+            texts (List[str]): Texts to embed.
+
+        Returns:
+            List[List[float]]: One vector per text.
+        """
+        vectors, missing = self._lookup(texts)
+        if missing:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            computed = self._embeddings.embed_documents(miss_texts)
+            self._cache.set_many(self._store(vectors, missing, computed))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async variant of embed_documents; cache I/O runs in a worker thread.
+
+        Args:
+            texts (List[str]): Texts to embed.
+
+        Returns:
+            List[List[float]]: One vector per text.
+        """
+        vectors, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            computed = await self._embeddings.aembed_documents(miss_texts)
+            await asyncio.to_thread(self._cache.set_many, self._store(vectors, missing, computed))
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Cache counters since start-up.
+
+        Returns:
+            Dict[str, float]: hits, misses and hit_rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+def initialize_embeddings(model_name: Optional[str] = None, cache: Optional[str] = None):
+    """
+    Initializes Ollama embeddings, wrapped in a persistent cache.
+
+    Args:
+        model_name (Optional[str]): Ollama embedding model. Falls back to
+            EMBEDDING_MODEL_NAME (default 'nomic-embed-text').
+        cache (Optional[str]): 'disk', 'redis' or 'none'. Falls back to
+            EMBEDDING_CACHE (default 'disk'). The bound on cached vectors comes
+            from EMBEDDING_CACHE_MAX_ENTRIES (default 100000).
+
+    Returns:
+        Embeddings: Embedding model.
+    """
+    model_name = model_name or os.getenv("EMBEDDING_MODEL_NAME", "nomic-embed-text")
+    cache = (cache or os.getenv("EMBEDDING_CACHE", "disk")).lower()
+    embeddings = OllamaEmbeddings(model=model_name)
+
+    if cache == "none":
+        return embeddings
+
+    max_entries = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 100000))
+    if cache == "redis":
+        cache_manager = CacheFactory.create_cache_manager(
+            CacheType.REDIS,
+            RedisCacheConfig(max_entries=max_entries)
+        )
+    elif cache == "disk":
+        cache_manager = CacheFactory.create_cache_manager(
+            CacheType.DISK,
+            DiskCacheConfig(
+                path=os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3"),
+                max_entries=max_entries
+            )
+        )
+    else:
+        raise ValueError(f"Unsupported embedding cache: {cache}")
 
-def initialize_embeddings():
-    """Initializes OpenAI embeddings."""
-    embeddings = OllamaEmbeddings(model='nomic-embed-text')
-    return embeddings
+    return CachedEmbeddings(embeddings, cache_manager, model_name=model_name)
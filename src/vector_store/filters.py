@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Optional
+
+
+def filter_values(value: Any) -> List[Any]:
+    """Accepted values of one metadata filter condition."""
+    return list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+
+
+def matches_filter(metadata: Dict[str, Any], metadata_filter: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether chunk metadata satisfies a metadata filter.
+
+    Args:
+        metadata (Dict[str, Any]): Chunk metadata.
+        metadata_filter (Optional[Dict[str, Any]]): Metadata key -> required
+            value, or a list of accepted values. All keys must match.
+
+    Returns:
+        bool: True if every condition holds (or there is no filter).
+    """
+    if not metadata_filter:
+        return True
+    return all(metadata.get(key) in filter_values(value) for key, value in metadata_filter.items())
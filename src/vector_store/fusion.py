@@ -0,0 +1,33 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Rank offset of reciprocal rank fusion (Cormack et al., 2009)
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = RRF_K,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked lists by reciprocal rank.
+
+    Each item scores sum(weight / (k + rank)) over the lists it appears in
+    (rank starting at 1), so items ranked well by several retrievers rise
+    to the top without their raw scores having to be comparable.
+
+    Args:
+        rankings (Sequence[Sequence[Hashable]]): Item keys, best first, per retriever.
+        k (int): Rank offset; larger values flatten the head of each list.
+        weights (Optional[Sequence[float]]): Weight per ranking, 1 by default.
+
+    Returns:
+        List[Tuple[Hashable, float]]: (key, fused score), best first. Ties
+        keep the order in which keys were first seen.
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
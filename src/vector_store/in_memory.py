@@ -1,43 +1,672 @@
-from typing import List
-from langchain_core.vectorstores import InMemoryVectorStore
+import asyncio
+import copy
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 from langchain.docstore.document import Document
 
-from .base import BaseVectorStoreManager
+from .ann import IVFConfig
+from .base import BaseVectorStoreManager, VectorStoreConfig, unique_chunks
+from .fusion import reciprocal_rank_fusion
+from .local_index import LocalVectorIndex
+from .mmr import diversify
+from .registry import create_source_registry
+from .snapshot import snapshot_exists
+from .sparse import RETRIEVAL_DENSE, RETRIEVAL_HYBRID, SparseIndex
+
+
+class LocalVectorStore(VectorStore):
+    """
+    LangChain-compatible vector store over a LocalVectorIndex.
+
+    Uses the same deterministic chunk IDs as the Qdrant store, so adding a
+    chunk twice is idempotent and already indexed chunks are not re-embedded.
+
+    In hybrid retrieval mode a BM25 SparseIndex is kept next to the vector
+    index and saved with its snapshot.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        dimension: Optional[int] = None,
+        quantization: Optional[str] = None,
+        rescore: bool = True,
+        oversampling: float = 2.0,
+        ann: Optional[IVFConfig] = None,
+        retrieval_mode: Optional[str] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            embedding (Embeddings): Embedding model.
+            dimension (Optional[int]): Vector size. Inferred from the first
+                vectors added when omitted.
+            quantization (Optional[str]): 'none', 'scalar' or 'binary'.
+            rescore (bool): Re-rank quantized candidates with exact scores.
+            oversampling (float): Candidates scanned per result when rescoring.
+            ann (Optional[IVFConfig]): IVF settings; None keeps search exact.
+            retrieval_mode (Optional[str]): 'dense' or 'hybrid'.
+        """
+        self._embedding = embedding
+        self.retrieval_mode = retrieval_mode or RETRIEVAL_DENSE
+        self.sparse = SparseIndex() if self.retrieval_mode == RETRIEVAL_HYBRID else None
+        self._index_options = {
+            "quantization": quantization,
+            "rescore": rescore,
+            "oversampling": oversampling,
+            "ann": ann
+        }
+        self.index = self._new_index(dimension) if dimension else None
+        self._index_lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def _new_index(self, dimension: int) -> LocalVectorIndex:
+        return LocalVectorIndex(dimension, **self._index_options)
+
+    def _ensure_index(self, dimension: int) -> LocalVectorIndex:
+        with self._index_lock:
+            if self.index is None:
+                self.index = self._new_index(dimension)
+        return self.index
+
+    def _document(self, row: int) -> Document:
+        point_id, text, metadata = self.index.row(row)
+        return Document(id=point_id, page_content=text, metadata=metadata)
+
+    def _new_chunks(
+        self,
+        documents: List[Document],
+        ids: Optional[Sequence[str]]
+    ) -> Tuple[List[Document], List[str]]:
+        documents, ids = unique_chunks(documents, ids)
+        existing = self.index.existing_ids(ids) if self.index is not None else set()
+        new = [(document, point_id) for document, point_id in zip(documents, ids) if point_id not in existing]
+        return [document for document, _ in new], [point_id for _, point_id in new]
+
+    def _insert(self, documents: List[Document], ids: List[str], vectors: List[List[float]]) -> List[str]:
+        if not documents:
+            return []
+        index = self._ensure_index(len(vectors[0]))
+        index.add(
+            ids,
+            vectors,
+            [document.page_content for document in documents],
+            [document.metadata for document in documents]
+        )
+        if self.sparse is not None:
+            self.sparse.add(ids, [document.page_content for document in documents])
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [Document(page_content=text, metadata=metadata) for text, metadata in zip(texts, metadatas)]
+        return self.add_documents(documents, ids=ids)
+
+    def add_documents(
+        self,
+        documents: List[Document],
+        ids: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Embed and insert the documents that are not indexed yet.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (Optional[Sequence[str]]): Explicit IDs.
+
+        Returns:
+            List[str]: IDs of the rows that were written.
+        """
+        documents, ids = self._new_chunks(documents, ids)
+        if not documents:
+            return []
+        vectors = self._embedding.embed_documents([document.page_content for document in documents])
+        return self._insert(documents, ids, vectors)
+
+    async def aadd_documents(
+        self,
+        documents: List[Document],
+        ids: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Async variant of add_documents. The insert runs in a worker thread,
+        as it may (re)train the IVF partition.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (Optional[Sequence[str]]): Explicit IDs.
+
+        Returns:
+            List[str]: IDs of the rows that were written.
+        """
+        documents, ids = self._new_chunks(documents, ids)
+        if not documents:
+            return []
+        vectors = await self._embedding.aembed_documents([document.page_content for document in documents])
+        return await asyncio.to_thread(self._insert, documents, ids, vectors)
+
+    async def aadd_embeddings(
+        self,
+        documents: List[Document],
+        ids: Sequence[str],
+        vectors: List[List[float]],
+        wait: bool = True
+    ) -> List[str]:
+        """
+        Insert documents that were already embedded.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (Sequence[str]): Their IDs.
+            vectors (List[List[float]]): Their embeddings.
+            wait (bool): Accepted for parity with AsyncQdrantVectorStore;
+                local inserts are always applied on return.
+
+        Returns:
+            List[str]: IDs of the rows that were written.
+        """
+        return await asyncio.to_thread(self._insert, documents, list(ids), vectors)
+
+    async def aflush(self, document: Document, point_id: str, vector: List[float]) -> None:
+        """No-op: local inserts are applied before aadd_embeddings returns."""
+
+    def _dense_rows(
+        self,
+        embedding: List[float],
+        k: int,
+        score_threshold: Optional[float] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[int, float]]:
+        rows = self.index.rows_matching(filter) if filter else None
+        if rows is not None and not rows.shape[0]:
+            return []
+        return [
+            (row, score) for row, score in self.index.search(embedding, k, rows)
+            if score_threshold is None or score >= score_threshold
+        ]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        score_threshold: Optional[float] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        Cosine top-k.
+
+        Args:
+            embedding (List[float]): Query vector.
+            k (int): Number of results.
+            score_threshold (Optional[float]): Minimum cosine similarity.
+            filter (Optional[Dict[str, Any]]): Metadata key -> value or list
+                of accepted values; only matching chunks are searched.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with cosine similarities,
+            best first.
+        """
+        if self.index is None:
+            return []
+        return [(self._document(row), score) for row, score in self._dense_rows(embedding, k, score_threshold, filter)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k, **kwargs)
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        embedding = await self._embedding.aembed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def similarity_search_batch_with_score_by_vector(
+        self,
+        embeddings: List[List[float]],
+        searches: Sequence[Dict[str, Any]]
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Run several dense searches at once.
+
+        Unfiltered searches share one batched index scan; filtered ones
+        search their matching rows one by one.
+
+        Args:
+            embeddings (List[List[float]]): Query vectors.
+            searches (Sequence[Dict[str, Any]]): similarity_search_with_score_by_vector
+                arguments (k, score_threshold, filter) of each query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: Results of each query, best first.
+        """
+        if self.index is None:
+            return [[] for _ in searches]
+        results: List[List[Tuple[Document, float]]] = [[] for _ in searches]
+        unfiltered = [position for position, search in enumerate(searches) if not search.get("filter")]
+        if unfiltered:
+            k = max(searches[position].get("k", 4) for position in unfiltered)
+            found = self.index.search_batch([embeddings[position] for position in unfiltered], k)
+            for position, rows in zip(unfiltered, found):
+                search = searches[position]
+                threshold = search.get("score_threshold")
+                results[position] = [
+                    (self._document(row), score) for row, score in rows[:search.get("k", 4)]
+                    if threshold is None or score >= threshold
+                ]
+        for position, search in enumerate(searches):
+            if search.get("filter"):
+                results[position] = self.similarity_search_with_score_by_vector(embeddings[position], **search)
+        return results
+
+    async def asimilarity_search_batch_with_score_by_vector(
+        self,
+        embeddings: List[List[float]],
+        searches: Sequence[Dict[str, Any]]
+    ) -> List[List[Tuple[Document, float]]]:
+        return self.similarity_search_batch_with_score_by_vector(embeddings, searches)
+
+    def _hybrid_rows(
+        self,
+        embedding: List[float],
+        query: str,
+        k: int,
+        score_threshold: Optional[float],
+        fetch_k: int,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[int, float]]:
+        if self.sparse is None:
+            return self._dense_rows(embedding, k, score_threshold, filter)
+        dense = self._dense_rows(embedding, fetch_k, score_threshold, filter)
+        allowed = set(self.index.ids_for_rows(self.index.rows_matching(filter))) if filter else None
+        fused = reciprocal_rank_fusion([
+            self.index.ids_for_rows(row for row, _ in dense),
+            [point_id for point_id, _ in self.sparse.search(query, fetch_k, allowed)]
+        ])[:k]
+        rows = self.index.rows_for_ids(point_id for point_id, _ in fused)
+        return [(row, score) for row, (_, score) in zip(rows, fused)]
+
+    def hybrid_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        query: str,
+        k: int = 4,
+        score_threshold: Optional[float] = None,
+        fetch_k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Fuse dense and BM25 rankings with reciprocal rank fusion.
+
+        Dense candidates below `score_threshold` are dropped before fusion;
+        keyword candidates only need to share a term with the query. Without
+        a sparse index this is a thresholded dense search.
+
+        Args:
+            embedding (List[float]): Query vector.
+            query (str): Query text, for the keyword ranking.
+            k (int): Number of results.
+            score_threshold (Optional[float]): Minimum cosine similarity of
+                dense candidates.
+            fetch_k (Optional[int]): Candidates taken from each ranking.
+                Defaults to max(4 * k, 20).
+            filter (Optional[Dict[str, Any]]): Metadata key -> value or list
+                of accepted values, applied to both rankings.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with RRF scores (cosine
+            similarities without a sparse index), best first.
+        """
+        if self.index is None:
+            return []
+        rows = self._hybrid_rows(embedding, query, k, score_threshold, fetch_k or max(4 * k, 20), filter)
+        return [(self._document(row), score) for row, score in rows]
+
+    async def ahybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        score_threshold: Optional[float] = None,
+        fetch_k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Embed the query and run hybrid_search_with_score_by_vector.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with RRF scores, best first.
+        """
+        embedding = await self._embedding.aembed_query(query)
+        return self.hybrid_search_with_score_by_vector(embedding, query, k, score_threshold, fetch_k, filter)
+
+    def max_marginal_relevance_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        score_threshold: Optional[float] = None,
+        query: Optional[str] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Pick a diverse top-k from a wider candidate pool.
+
+        Candidates come from the store's retrieval mode (hybrid when a query
+        text is given and a sparse index exists) and are re-ranked with
+        maximal marginal relevance over their stored vectors.
+
+        Args:
+            embedding (List[float]): Query vector.
+            k (int): Number of results.
+            fetch_k (int): Candidate pool size.
+            lambda_mult (float): 1 ranks by relevance only, 0 by diversity only.
+            score_threshold (Optional[float]): Minimum cosine similarity of
+                dense candidates.
+            query (Optional[str]): Query text, for the keyword ranking.
+            filter (Optional[Dict[str, Any]]): Metadata key -> value or list
+                of accepted values.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with their search scores,
+            in pick order.
+        """
+        if self.index is None:
+            return []
+        fused = query is not None and self.sparse is not None
+        if fused:
+            rows = self._hybrid_rows(embedding, query, fetch_k, score_threshold, fetch_k, filter)
+        else:
+            rows = self._dense_rows(embedding, fetch_k, score_threshold, filter)
+        if not rows:
+            return []
+        vectors = self.index.vectors[[row for row, _ in rows]]
+        results = [(self._document(row), score) for row, score in rows]
+        return diversify(results, vectors, k, lambda_mult, fused)
+
+    async def amax_marginal_relevance_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        score_threshold: Optional[float] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Embed the query and run max_marginal_relevance_search_with_score_by_vector.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with their search scores,
+            in pick order.
+        """
+        embedding = await self._embedding.aembed_query(query)
+        return self.max_marginal_relevance_search_with_score_by_vector(
+            embedding, k, fetch_k, lambda_mult, score_threshold, query, filter
+        )
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        **kwargs: Any
+    ) -> List[Document]:
+        results = self.max_marginal_relevance_search_with_score_by_vector(embedding, k, fetch_k, lambda_mult)
+        return [document for document, _ in results]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        **kwargs: Any
+    ) -> List[Document]:
+        results = self.max_marginal_relevance_search_with_score_by_vector(
+            self._embedding.embed_query(query), k, fetch_k, lambda_mult, query=query
+        )
+        return [document for document, _ in results]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        if self.index is None:
+            return []
+        return [self._document(row) for row in self.index.rows_for_ids(ids)]
+
+    def existing_ids(self, ids: Sequence[str]) -> Set[str]:
+        return self.index.existing_ids(ids) if self.index is not None else set()
+
+    async def aexisting_ids(self, ids: Sequence[str]) -> Set[str]:
+        return self.existing_ids(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if self.index is None or not ids:
+            return False
+        if self.sparse is not None:
+            self.sparse.delete(ids)
+        return self.index.delete(ids) > 0
+
+    def delete_by_source(self, source: str) -> int:
+        """
+        Delete every chunk loaded from a source.
+
+        Args:
+            source (str): Value of the chunks' `source` metadata.
+
+        Returns:
+            int: Number of chunks removed.
+        """
+        if self.index is None:
+            return 0
+        if self.sparse is not None:
+            self.sparse.delete(self.index.ids_for_source(source))
+        return self.index.delete_by_source(source)
+
+    def save(self, directory: str) -> None:
+        """
+        Write the index to a snapshot directory.
+
+        Args:
+            directory (str): Snapshot directory.
+        """
+        if self.index is not None:
+            self.index.save(directory)
+        if self.sparse is not None:
+            self.sparse.save(directory)
+
+    @classmethod
+    def load(cls, directory: str, embedding: Embeddings, **kwargs: Any) -> "LocalVectorStore":
+        """
+        Open a store from a snapshot, memory-mapping its vectors.
+
+        Args:
+            directory (str): Snapshot directory.
+            embedding (Embeddings): Embedding model.
+            **kwargs: quantization, rescore, oversampling, ann and
+                retrieval_mode options.
+
+        Returns:
+            LocalVectorStore: Store backed by the snapshot.
+        """
+        store = cls(embedding, **kwargs)
+        store.index = LocalVectorIndex.load(directory, **store._index_options)
+        if store.sparse is not None:
+            sparse = SparseIndex.load(directory)
+            if sparse is None or len(sparse) != len(store.index):
+                # Hybrid mode enabled on an existing snapshot: index its texts
+                sparse = SparseIndex()
+                rows = [store.index.row(row) for row in range(len(store.index))]
+                sparse.add([point_id for point_id, _, _ in rows], [text for _, text, _ in rows])
+            store.sparse = sparse
+        return store
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any
+    ) -> "LocalVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas, **kwargs)
+        return store
+
 
 class InMemoryVectorStoreManager(BaseVectorStoreManager):
-    """Manager for in-memory vector store."""
-    
-    def create_vector_store(self) -> InMemoryVectorStore:
+    """Manager for the in-process NumPy vector store."""
+
+    def __init__(
+        self,
+        embeddings,
+        config: VectorStoreConfig = None
+    ):
+        """
+        Initialize in-memory vector store manager.
+
+        Args:
+            embeddings: Embedding model.
+            config (VectorStoreConfig, optional): Configuration for vector store.
         """
-        Create an in-memory vector store.
-        
+        super().__init__(embeddings, config)
+        self._vector_store: Optional[LocalVectorStore] = None
+        # Source records live next to the snapshot, so they never outlive it
+        persist_path = self._config.persist_path
+        self.registry = create_source_registry(
+            "disk",
+            os.path.join(persist_path, "sources.sqlite3") if persist_path else ":memory:"
+        )
+
+    def _scoped(self, collection_name: str) -> "InMemoryVectorStoreManager":
+        """Manager of a namespace's own store, snapshotted under persist_path/namespaces."""
+        config = copy.copy(self._config)
+        config.collection_name = collection_name
+        if self._config.persist_path:
+            config.persist_path = os.path.join(self._config.persist_path, "namespaces", collection_name)
+        return InMemoryVectorStoreManager(self._embeddings, config)
+
+    def _pool_limit(self) -> Optional[int]:
+        # Without snapshots an evicted namespace would lose its chunks
+        return self._config.pool_size if self._config.persist_path else None
+
+    def release(self) -> None:
+        """Snapshot the store of an evicted namespace."""
+        self.persist()
+
+    def create_vector_store(self) -> LocalVectorStore:
+        """
+        Return the manager's in-process vector store, creating it once.
+
         Returns:
-            InMemoryVectorStore: Configured in-memory vector store.
+            LocalVectorStore: Persistent in-process vector store.
         """
-        print("Using InMemoryVectorStore")
-        return InMemoryVectorStore(self._embeddings)
-    
+        if self._vector_store is None:
+            persist_path = self._config.persist_path
+            options = {
+                "quantization": self._config.quantization,
+                "rescore": self._config.rescore,
+                "oversampling": self._config.oversampling,
+                "ann": self._config.ann,
+                "retrieval_mode": self._config.retrieval_mode
+            }
+            if persist_path and snapshot_exists(persist_path):
+                print(f"Using LocalVectorStore from snapshot '{persist_path}'")
+                self._vector_store = LocalVectorStore.load(persist_path, self._embeddings, **options)
+            else:
+                print("Using LocalVectorStore")
+                self._vector_store = LocalVectorStore(self._embeddings, **options)
+        return self._vector_store
+
     def document_exists(self, identifier: str) -> bool:
         """
-        Check if a document exists in the in-memory vector store.
-        
+        Check if chunks from a source exist in the in-memory vector store,
+        using the index's per-source chunk counts.
+
         Args:
             identifier (str): URL or unique identifier.
-        
+
         Returns:
             bool: True if document exists, False otherwise.
         """
-        # Note: InMemoryVectorStore doesn't have a native way to check document existence
-        # This is a placeholder implementation
-        results = self.create_vector_store().similarity_search(identifier, k=1)
-        return len(results) > 0
-    
+        index = self.create_vector_store().index
+        return index is not None and index.has_source(identifier)
+
+    def source_point_ids(self, source: str) -> List[str]:
+        """
+        IDs of the chunks stored for a source. Falls back to scanning the
+        index metadata for sources missing from the registry.
+
+        Args:
+            source (str): URL or unique identifier.
+
+        Returns:
+            List[str]: Point IDs.
+        """
+        ids = super().source_point_ids(source)
+        index = self.create_vector_store().index
+        if ids or index is None or not index.has_source(source):
+            return ids
+        return index.ids_for_source(source)
+
+    def delete_points(self, ids: List[str]) -> None:
+        """
+        Delete chunks by point ID.
+
+        Args:
+            ids (List[str]): Point IDs to delete.
+        """
+        self.create_vector_store().delete(ids)
+
     def add_documents(self, documents: List[Document]) -> None:
         """
         Add documents to the in-memory vector store.
-        
+
         Args:
             documents (List[Document]): Documents to add.
         """
-        vector_store = self.create_vector_store()
-        vector_store.add_documents(documents)
\ No newline at end of file
+        self.create_vector_store().add_documents(documents)
+
+    def persist(self) -> None:
+        """Append new chunks to the snapshot when persist_path is configured."""
+        if self._config.persist_path and self._vector_store is not None:
+            self._vector_store.save(self._config.persist_path)
+
+    def close(self) -> None:
+        """Persist the store, and those of pooled namespaces, before shutdown."""
+        self.persist()
+        for manager in list(self._pool.values()):
+            manager.persist()
@@ -0,0 +1,539 @@
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .ann import IVFConfig, IVFIndex
+from .filters import filter_values, matches_filter
+from .quantization import QUANTIZATION_NONE, create_quantizer
+from .snapshot import read_snapshot, write_snapshot
+
+
+class LocalVectorIndex:
+    """
+    In-process exact cosine index over a contiguous float32 matrix.
+
+    Vectors are L2-normalised on insert and stored row by row in a single
+    matrix whose capacity doubles when full (amortised O(1) appends). IDs,
+    texts and metadata live in parallel columns indexed by row, so a
+    search is one matrix-vector product followed by an argpartition.
+
+    An index opened with `load` maps its snapshot read-only: vectors and
+    payload are paged in by the OS on access, and several processes opening
+    the same snapshot share one page-cached copy. The first write copies the
+    vectors into process memory.
+
+    With quantization enabled, searches scan compact int8 or binary codes
+    kept next to the vectors and only the best `k * oversampling`
+    candidates are rescored against the full-precision rows, so a mapped
+    snapshot pages in just the codes plus a handful of vectors per query.
+
+    With an IVF configuration, indexes past `min_rows` rows are partitioned
+    by k-means and a search only scans the `nprobe` closest clusters.
+    Smaller indexes keep searching exhaustively.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        initial_capacity: int = 1024,
+        quantization: str = QUANTIZATION_NONE,
+        rescore: bool = True,
+        oversampling: float = 2.0,
+        ann: Optional[IVFConfig] = None
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimension (int): Dimensionality of the vectors.
+            initial_capacity (int): Rows allocated up front.
+            quantization (str): 'none', 'scalar' or 'binary'.
+            rescore (bool): Re-rank quantized candidates with exact scores.
+            oversampling (float): Candidates scanned per result when rescoring.
+            ann (Optional[IVFConfig]): IVF settings; None keeps search exact.
+        """
+        self.dimension = dimension
+        self.quantization = quantization or QUANTIZATION_NONE
+        self.rescore = rescore
+        self.oversampling = max(oversampling, 1.0)
+        self._quantizer = create_quantizer(self.quantization)
+        capacity = max(initial_capacity, 1)
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        # Quantized codes, row-aligned with _vectors
+        self._codes: Dict[str, np.ndarray] = {}
+        if self._quantizer is not None:
+            self._codes = {
+                name: np.zeros((capacity, width), dtype=dtype)
+                for name, (width, dtype) in self._quantizer.widths(dimension).items()
+            }
+        self._ann = IVFIndex(dimension, ann) if ann is not None else None
+        self._size = 0
+        self._ids: Sequence[str] = []
+        self._texts: Sequence[str] = []
+        self._metadatas: Sequence[Dict[str, Any]] = []
+        self._row_map: Optional[Dict[str, int]] = {}
+        self._source_counts: Dict[str, int] = {}
+        # Per-row source codes, so source filters are one vectorised lookup
+        self._source_column: Optional[array] = array("i")
+        self._source_codes: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        # Rows [0, _persisted) are already in the snapshot; a rewrite is
+        # needed instead of an append once any of them changes.
+        self._persisted = 0
+        self._needs_rewrite = False
+        self._snapshot_directory: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalised vectors of the live rows (a view, do not modify)."""
+        return self._vectors[:self._size]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @property
+    def _rows(self) -> Dict[str, int]:
+        """ID -> row map, built on first use for indexes opened from a snapshot."""
+        if self._row_map is None:
+            self._row_map = {point_id: row for row, point_id in enumerate(self._ids)}
+        return self._row_map
+
+    def _source_code(self, source: Optional[str]) -> int:
+        if source is None:
+            return -1
+        code = self._source_codes.get(source)
+        if code is None:
+            code = self._source_codes[source] = len(self._source_codes)
+        return code
+
+    @property
+    def _sources(self) -> array:
+        """Source code per row, rebuilt on first use after loading or compacting."""
+        if self._source_column is None:
+            self._source_column = array("i", (
+                self._source_code(metadata.get("source")) for metadata in self._metadatas[:self._size]
+            ))
+        return self._source_column
+
+    def _materialize(self) -> None:
+        """Turn mapped payload columns into lists before an in-place change."""
+        if not isinstance(self._ids, list):
+            self._ids = list(self._ids)
+            self._texts = list(self._texts)
+            self._metadatas = list(self._metadatas)
+
+    def _matrices(self) -> Dict[str, np.ndarray]:
+        return {"vectors": self._vectors, **self._codes}
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the matrices geometrically so that `rows` more rows fit."""
+        required = self._size + rows
+        capacity = max(self._vectors.shape[0], 1)
+        if required <= capacity and self._vectors.flags.writeable:
+            return
+        while capacity < required:
+            capacity *= 2
+        grown = {}
+        for name, matrix in self._matrices().items():
+            grown[name] = np.zeros((capacity, matrix.shape[1]), dtype=matrix.dtype)
+            grown[name][:self._size] = matrix[:self._size]
+        self._vectors = grown.pop("vectors")
+        self._codes = grown
+
+    def _count_source(self, metadata: Dict[str, Any], delta: int) -> None:
+        source = metadata.get("source")
+        if source is None:
+            return
+        count = self._source_counts.get(source, 0) + delta
+        if count > 0:
+            self._source_counts[source] = count
+        else:
+            self._source_counts.pop(source, None)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: Any,
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert or overwrite rows.
+
+        Args:
+            ids (Sequence[str]): Row IDs; existing IDs are overwritten in place.
+            vectors: Array-like of shape (n, dimension).
+            texts (Sequence[str]): Page content per row.
+            metadatas (Sequence[Dict[str, Any]]): Metadata per row.
+        """
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension))
+        codes = self._quantizer.encode(vectors) if self._quantizer is not None else {}
+        written = np.empty(len(ids), dtype=np.int64)
+        with self._lock:
+            self._reserve(len(ids))
+            for position, (point_id, vector, text, metadata) in enumerate(zip(ids, vectors, texts, metadatas)):
+                metadata = dict(metadata or {})
+                row = self._rows.get(point_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[point_id] = row
+                    self._ids.append(point_id)
+                    self._texts.append(text)
+                    self._metadatas.append(metadata)
+                    if self._source_column is not None:
+                        self._source_column.append(self._source_code(metadata.get("source")))
+                else:
+                    self._materialize()
+                    if row < self._persisted:
+                        self._needs_rewrite = True
+                    self._count_source(self._metadatas[row], -1)
+                    self._texts[row] = text
+                    self._metadatas[row] = metadata
+                    if self._source_column is not None:
+                        self._source_column[row] = self._source_code(metadata.get("source"))
+                self._count_source(metadata, 1)
+                self._vectors[row] = vector
+                for name, values in codes.items():
+                    self._codes[name][row] = values[position]
+                written[position] = row
+            if self._ann is not None:
+                self._ann.update(written, vectors)
+                self._train_ann()
+
+    def _train_ann(self) -> None:
+        """(Re)build the IVF partition once the index is large enough."""
+        if self._ann is None or not self._ann.needs_training(self._size):
+            return
+        self._ann.train(self._vectors[:self._size])
+        if self._persisted:
+            self._needs_rewrite = True
+
+    def _select(self, rows: Optional[np.ndarray], scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Top-k of scores computed over `rows` (all rows when None)."""
+        top = self._top_k(scores, k)
+        if rows is None:
+            return top
+        return [(int(rows[position]), score) for position, score in top]
+
+    def search(self, query: Any, k: int = 4, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Cosine top-k: exhaustive or over the probed IVF clusters, scored
+        exactly or through the quantized codes.
+
+        Args:
+            query: Query vector.
+            k (int): Number of results.
+            rows (Optional[np.ndarray]): Restrict the search to these rows
+                (see rows_matching). They are scored exactly, bypassing IVF
+                and quantization, as filtered subsets are small.
+
+        Returns:
+            List[Tuple[int, float]]: (row, cosine similarity), best first.
+            Without rescoring, quantized indexes return approximate scores.
+        """
+        query = self._normalize(np.asarray(query, dtype=np.float32).reshape(self.dimension))
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return []
+            if rows is not None:
+                return self._select(rows, self._vectors[rows] @ query, k)
+            self._train_ann()
+            rows = self._ann.candidates(query) if self._ann is not None and self._ann.trained else None
+            if self._quantizer is None:
+                vectors = self._vectors[:self._size] if rows is None else self._vectors[rows]
+                return self._select(rows, vectors @ query, k)
+            codes = {
+                name: matrix[:self._size] if rows is None else matrix[rows]
+                for name, matrix in self._codes.items()
+            }
+            approximate = self._quantizer.scores(codes, query)
+            if not self.rescore:
+                return self._select(rows, approximate, k)
+            candidates = np.array(
+                [row for row, _ in self._select(rows, approximate, int(np.ceil(k * self.oversampling)))],
+                dtype=np.int64
+            )
+            # Sorted rows keep reads from a mapped snapshot sequential
+            candidates.sort()
+            exact = self._vectors[candidates] @ query
+        return [(int(candidates[position]), score) for position, score in self._top_k(exact, k)]
+
+    def search_batch(self, queries: Any, k: int = 4) -> List[List[Tuple[int, float]]]:
+        """
+        Cosine top-k of several queries.
+
+        On an exact, unquantized index all queries are scored with one
+        matrix-matrix product, which reads the vectors once instead of once
+        per query. Other indexes search query by query.
+
+        Args:
+            queries: Query vectors, shape (queries, dimension).
+            k (int): Number of results per query.
+
+        Returns:
+            List[List[Tuple[int, float]]]: (row, cosine similarity) per
+            query, best first.
+        """
+        queries = self._normalize(np.asarray(queries, dtype=np.float32).reshape(-1, self.dimension))
+        with self._lock:
+            self._train_ann()
+            if self._quantizer is not None or (self._ann is not None and self._ann.trained):
+                return [self.search(query, k) for query in queries]
+            if self._size == 0 or k <= 0:
+                return [[] for _ in queries]
+            scores = queries @ self._vectors[:self._size].T
+        return [self._top_k(row_scores, k) for row_scores in scores]
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Indices of the k largest scores, best first, via argpartition."""
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ordered = candidates[np.argsort(-scores[candidates])]
+        return [(int(row), float(scores[row])) for row in ordered]
+
+    def row(self, row: int) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Payload of a row.
+
+        Returns:
+            Tuple[str, str, Dict[str, Any]]: (id, text, metadata copy).
+        """
+        return self._ids[row], self._texts[row], dict(self._metadatas[row])
+
+    def ids_for_rows(self, rows: Iterable[int]) -> List[str]:
+        """IDs of the given rows, in input order."""
+        return [self._ids[row] for row in rows]
+
+    def rows_for_ids(self, ids: Iterable[str]) -> List[int]:
+        """Rows of the given IDs that are present, in input order."""
+        return [self._rows[point_id] for point_id in ids if point_id in self._rows]
+
+    def existing_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Subset of IDs present in the index."""
+        return {point_id for point_id in ids if point_id in self._rows}
+
+    def has_source(self, source: str) -> bool:
+        """Whether any row has metadata['source'] == source."""
+        return source in self._source_counts
+
+    def source_counts(self) -> Dict[str, int]:
+        """Number of rows per source."""
+        return dict(self._source_counts)
+
+    def ids_for_source(self, source: str) -> List[str]:
+        """IDs of the rows whose metadata['source'] matches (a full scan)."""
+        with self._lock:
+            if source not in self._source_counts:
+                return []
+            return [
+                self._ids[row]
+                for row, metadata in enumerate(self._metadatas)
+                if metadata.get("source") == source
+            ]
+
+    def rows_matching(self, metadata_filter: Dict[str, Any]) -> np.ndarray:
+        """
+        Rows whose metadata satisfies a filter (see matches_filter).
+
+        The `source` condition is resolved on the per-row source codes in
+        one vectorised pass; other conditions are checked only on the rows
+        that survive it.
+
+        Args:
+            metadata_filter (Dict[str, Any]): Metadata key -> value or list
+                of accepted values.
+
+        Returns:
+            np.ndarray: Matching rows, ascending.
+        """
+        conditions = dict(metadata_filter)
+        with self._lock:
+            rows = np.arange(self._size, dtype=np.int64)
+            if "source" in conditions:
+                sources = np.frombuffer(self._sources, dtype=np.int32).copy()
+                codes = [
+                    self._source_codes[source]
+                    for source in filter_values(conditions.pop("source"))
+                    if source in self._source_codes
+                ]
+                rows = np.flatnonzero(np.isin(sources, codes)).astype(np.int64)
+            if not conditions or not rows.shape[0]:
+                return rows
+            return np.fromiter(
+                (row for row in rows.tolist() if matches_filter(self._metadatas[row], conditions)),
+                dtype=np.int64
+            )
+
+    def _compact(self, keep: np.ndarray) -> int:
+        """Drop rows where keep is False; returns the number removed."""
+        removed = int(self._size - keep.sum())
+        if removed == 0:
+            return 0
+        self._materialize()
+        self._reserve(0)
+        self._needs_rewrite = True
+        kept_rows = np.flatnonzero(keep)
+        for matrix in self._matrices().values():
+            matrix[:kept_rows.shape[0]] = matrix[kept_rows]
+        if self._ann is not None:
+            self._ann.compact(kept_rows)
+        self._ids = [self._ids[row] for row in kept_rows]
+        self._texts = [self._texts[row] for row in kept_rows]
+        self._metadatas = [self._metadatas[row] for row in kept_rows]
+        self._size = kept_rows.shape[0]
+        self._row_map = None
+        self._source_column = None
+        self._source_counts = {}
+        for metadata in self._metadatas:
+            self._count_source(metadata, 1)
+        return removed
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Delete rows by ID.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        with self._lock:
+            keep = np.ones(self._size, dtype=bool)
+            keep[self.rows_for_ids(ids)] = False
+            return self._compact(keep)
+
+    def delete_by_source(self, source: str) -> int:
+        """
+        Delete every row whose metadata['source'] matches.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        with self._lock:
+            if source not in self._source_counts:
+                return 0
+            keep = np.fromiter(
+                (metadata.get("source") != source for metadata in self._metadatas),
+                dtype=bool,
+                count=self._size
+            )
+            return self._compact(keep)
+
+    def save(self, directory: str) -> None:
+        """
+        Persist the index as a snapshot.
+
+        Only rows added since the last save are appended, unless rows were
+        overwritten or deleted, in which case the snapshot is rewritten.
+
+        Args:
+            directory (str): Snapshot directory.
+        """
+        with self._lock:
+            append = not self._needs_rewrite and directory == self._snapshot_directory
+            start = self._persisted if append else 0
+            matrices = {name: matrix[start:self._size] for name, matrix in self._matrices().items()}
+            manifest = {
+                "dimension": self.dimension,
+                "quantization": self.quantization,
+                "count": self._size,
+                "source_counts": self._source_counts,
+            }
+            arrays = {}
+            if self._ann is not None and self._ann.trained:
+                matrices["ivf_assignments"] = self._ann.assignments[start:self._size].reshape(-1, 1)
+                arrays["ivf_centroids"] = self._ann.centroids
+                manifest["ivf_trained_rows"] = self._ann.trained_rows
+            write_snapshot(
+                directory,
+                matrices,
+                {
+                    "ids": self._ids[start:self._size],
+                    "texts": self._texts[start:self._size],
+                    "metadatas": self._metadatas[start:self._size],
+                },
+                manifest,
+                start=start,
+                arrays=arrays
+            )
+            self._persisted = self._size
+            self._needs_rewrite = False
+            self._snapshot_directory = directory
+
+    @classmethod
+    def load(
+        cls,
+        directory: str,
+        quantization: Optional[str] = None,
+        rescore: bool = True,
+        oversampling: float = 2.0,
+        ann: Optional[IVFConfig] = None
+    ) -> "LocalVectorIndex":
+        """
+        Open a snapshot without reading it into memory.
+
+        Vectors and codes are read-only np.memmaps and payload columns are
+        decoded lazily, so opening cost does not depend on the corpus size.
+
+        Args:
+            directory (str): Snapshot directory.
+            quantization (Optional[str]): Quantization to use. Defaults to the
+                snapshot's; a different value re-encodes the vectors and the
+                next save rewrites the snapshot.
+            rescore (bool): Re-rank quantized candidates with exact scores.
+            oversampling (float): Candidates scanned per result when rescoring.
+            ann (Optional[IVFConfig]): IVF settings. A partition stored in the
+                snapshot is reused; otherwise one is trained on first use.
+
+        Returns:
+            LocalVectorIndex: Index backed by the snapshot.
+        """
+        snapshot = read_snapshot(directory)
+        stored = snapshot.get("quantization", QUANTIZATION_NONE)
+        index = cls(
+            snapshot["dimension"],
+            initial_capacity=1,
+            quantization=quantization or stored,
+            rescore=rescore,
+            oversampling=oversampling,
+            ann=ann
+        )
+        index._vectors = snapshot["vectors"]
+        if index.quantization == stored:
+            index._codes = {name: snapshot[name] for name in index._codes}
+        elif index._quantizer is not None:
+            index._codes = index._quantizer.encode(np.asarray(snapshot["vectors"]))
+            index._needs_rewrite = True
+        else:
+            index._codes = {}
+            index._needs_rewrite = True
+        if "ivf_centroids" in snapshot:
+            if index._ann is not None:
+                index._ann.restore(
+                    snapshot["ivf_centroids"],
+                    snapshot["ivf_assignments"],
+                    snapshot["ivf_trained_rows"]
+                )
+            else:
+                index._needs_rewrite = True
+        index._size = snapshot["count"]
+        index._ids = snapshot["ids"]
+        index._texts = snapshot["texts"]
+        index._metadatas = snapshot["metadatas"]
+        index._row_map = None
+        index._source_column = None
+        index._source_counts = dict(snapshot.get("source_counts", {}))
+        index._persisted = snapshot["count"]
+        index._snapshot_directory = directory
+        return index
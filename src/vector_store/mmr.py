@@ -0,0 +1,85 @@
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+
+def maximal_marginal_relevance(
+    relevance: Any,
+    vectors: Any,
+    k: int = 4,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Greedily pick k candidates that are relevant but not redundant.
+
+    Each step takes the candidate maximising
+    lambda * relevance - (1 - lambda) * max similarity to those already
+    picked. Pairwise similarities are one (n, n) matrix product up front,
+    and each step updates the running max similarity with one row of it,
+    so selection costs O(n) NumPy work per pick instead of per-pair loops.
+
+    Args:
+        relevance: Array-like of shape (n,), relevance of each candidate to
+            the query (e.g. cosine similarity), higher is better.
+        vectors: Array-like of shape (n, dimension), candidate embeddings.
+        k (int): Number of candidates to pick.
+        lambda_mult (float): 1 ranks by relevance only, 0 by diversity only.
+
+    Returns:
+        List[int]: Positions of the picked candidates, in pick order.
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    k = min(k, relevance.shape[0])
+    if k <= 0:
+        return []
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+    similarity = vectors @ vectors.T
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    redundancy = similarity[first].copy()
+    available = np.ones(relevance.shape[0], dtype=bool)
+    available[first] = False
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
+
+
+def diversify(
+    results: Sequence[Tuple[Document, float]],
+    vectors: Any,
+    k: int = 4,
+    lambda_mult: float = 0.5,
+    fused: bool = False
+) -> List[Tuple[Document, float]]:
+    """
+    Re-rank search results with maximal marginal relevance.
+
+    Args:
+        results (Sequence[Tuple[Document, float]]): Candidates, best first.
+        vectors: Dense embedding of each candidate, shape (n, dimension).
+        k (int): Number of results to keep.
+        lambda_mult (float): 1 ranks by relevance only, 0 by diversity only.
+        fused (bool): Scores are reciprocal rank fusion scores rather than
+            cosine similarities; they are scaled to a best score of 1 so
+            they weigh like similarities.
+
+    Returns:
+        List[Tuple[Document, float]]: Picked results with their original
+        scores, in pick order.
+    """
+    if not results:
+        return []
+    relevance = np.array([score for _, score in results], dtype=np.float32)
+    if fused and relevance.max() > 0:
+        relevance /= relevance.max()
+    return [results[position] for position in maximal_marginal_relevance(relevance, vectors, k, lambda_mult)]
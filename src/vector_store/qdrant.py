@@ -1,9 +1,564 @@
-from typing import List
-from qdrant_client import QdrantClient
-from langchain_qdrant import QdrantVectorStore
+import asyncio
+import copy
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+from langchain_qdrant import QdrantVectorStore, RetrievalMode
 from langchain.docstore.document import Document
 
-from .base import BaseVectorStoreManager, VectorStoreConfig
+from .base import BaseVectorStoreManager, VectorStoreConfig, unique_chunks
+from .filters import filter_values
+from .mmr import diversify
+from .quantization import QUANTIZATION_BINARY, QUANTIZATION_NONE, QUANTIZATION_SCALAR
+from .registry import create_source_registry
+from .sparse import RETRIEVAL_HYBRID, BM25SparseEmbeddings
+
+
+# Payload path of the chunk source written by QdrantVectorStore
+SOURCE_FIELD = "metadata.source"
+
+# Named sparse vector holding BM25 term weights in hybrid mode
+SPARSE_VECTOR_NAME = "bm25"
+
+# Points below which a sync upload runs in-process: upload_points starts a
+# process pool for parallel > 1, which costs more than it saves on small loads
+PARALLEL_UPLOAD_MIN_POINTS = 10000
+
+
+def source_filter(source: str) -> models.Filter:
+    """Filter matching the points of one source."""
+    return models.Filter(
+        must=[models.FieldCondition(key=SOURCE_FIELD, match=models.MatchValue(value=source))]
+    )
+
+
+def metadata_filter(conditions: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+    """
+    Payload filter for a metadata filter (see filters.matches_filter).
+
+    Args:
+        conditions (Optional[Dict[str, Any]]): Metadata key -> value, or a
+            list of accepted values.
+
+    Returns:
+        Optional[models.Filter]: Filter on the `metadata.*` payload fields,
+        or None without conditions.
+    """
+    if not conditions:
+        return None
+    must = []
+    for key, value in conditions.items():
+        values = filter_values(value)
+        match = models.MatchValue(value=values[0]) if len(values) == 1 else models.MatchAny(any=values)
+        must.append(models.FieldCondition(key=f"metadata.{key}", match=match))
+    return models.Filter(must=must)
+
+
+class AsyncQdrantVectorStore(QdrantVectorStore):
+    """
+    QdrantVectorStore whose async API talks to Qdrant through an
+    AsyncQdrantClient instead of running the sync client in a thread pool.
+
+    Documents get deterministic point IDs (see unique_chunks), so adding the
+    same chunk twice is idempotent; chunks whose IDs already exist are
+    skipped before they are embedded.
+
+    In hybrid retrieval mode every point also carries BM25 sparse weights,
+    and ahybrid_search_with_score fuses both rankings inside Qdrant.
+
+    Writes are split into batches of upsert_batch_size points, of which up
+    to upsert_parallel are in flight at once. Bulk loads can upsert with
+    wait=False and call aflush with their last point once at the end
+    instead of waiting for every batch to be applied.
+    """
+
+    def __init__(
+        self,
+        async_client: AsyncQdrantClient,
+        search_params: Optional[models.SearchParams] = None,
+        upsert_batch_size: int = 256,
+        upsert_parallel: int = 4,
+        **kwargs: Any
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            async_client (AsyncQdrantClient): Client used by the async methods.
+            search_params (Optional[models.SearchParams]): Default search
+                parameters, e.g. quantization rescoring.
+            upsert_batch_size (int): Points per upsert request.
+            upsert_parallel (int): Upsert requests in flight at once.
+            **kwargs: Arguments forwarded to QdrantVectorStore.
+        """
+        super().__init__(**kwargs)
+        self._async_client = async_client
+        self.search_params = search_params
+        self.upsert_batch_size = max(1, upsert_batch_size)
+        self.upsert_parallel = max(1, upsert_parallel)
+        self._upsert_slots = asyncio.Semaphore(self.upsert_parallel)
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        Embed the query and search the collection asynchronously.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results to return.
+            **kwargs: Forwarded to asimilarity_search_with_score_by_vector.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with similarity scores.
+        """
+        embedding = await self.embeddings.aembed_query(query)
+        return await self.asimilarity_search_with_score_by_vector(embedding, k=k, **kwargs)
+
+    async def asimilarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        Search the collection with a precomputed query vector.
+
+        Args:
+            embedding (List[float]): Query vector.
+            k (int): Number of results to return.
+            **kwargs: Additional query_points parameters, e.g.
+                score_threshold. A `filter` dict of metadata conditions
+                becomes the payload filter.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with similarity scores.
+        """
+        kwargs.setdefault("search_params", self.search_params)
+        conditions = kwargs.pop("filter", None)
+        if conditions:
+            kwargs["query_filter"] = metadata_filter(conditions)
+        response = await self._async_client.query_points(
+            collection_name=self.collection_name,
+            query=embedding,
+            using=self.vector_name or None,
+            limit=k,
+            with_payload=True,
+            **kwargs
+        )
+        return self._results(response.points)
+
+    async def asimilarity_search_batch_with_score_by_vector(
+        self,
+        embeddings: List[List[float]],
+        searches: Sequence[Dict[str, Any]]
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Run several dense searches in one query_batch_points request.
+
+        Args:
+            embeddings (List[List[float]]): Query vectors.
+            searches (Sequence[Dict[str, Any]]): asimilarity_search_with_score_by_vector
+                arguments (k, score_threshold, filter) of each query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: Results of each query, best first.
+        """
+        requests = [
+            models.QueryRequest(
+                query=embedding,
+                using=self.vector_name or None,
+                filter=metadata_filter(search.get("filter")),
+                limit=search.get("k", 4),
+                score_threshold=search.get("score_threshold"),
+                params=self.search_params,
+                with_payload=True
+            )
+            for embedding, search in zip(embeddings, searches)
+        ]
+        responses = await self._async_client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        return [self._results(response.points) for response in responses]
+
+    def _results(self, points: List[models.ScoredPoint]) -> List[Tuple[Document, float]]:
+        return [
+            (
+                self._document_from_point(
+                    point,
+                    self.collection_name,
+                    self.content_payload_key,
+                    self.metadata_payload_key
+                ),
+                point.score
+            )
+            for point in points
+        ]
+
+    async def _aquery(
+        self,
+        query: str,
+        embedding: List[float],
+        k: int,
+        score_threshold: Optional[float],
+        fetch_k: int,
+        conditions: Optional[Dict[str, Any]] = None,
+        with_vectors: bool = False
+    ) -> List[models.ScoredPoint]:
+        # Filters and thresholds run inside Qdrant, on the payload indexes
+        query_filter = metadata_filter(conditions)
+        if self.retrieval_mode != RetrievalMode.HYBRID:
+            response = await self._async_client.query_points(
+                collection_name=self.collection_name,
+                query=embedding,
+                using=self.vector_name or None,
+                query_filter=query_filter,
+                limit=k,
+                score_threshold=score_threshold,
+                search_params=self.search_params,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+            return response.points
+        sparse = self.sparse_embeddings.embed_query(query)
+        response = await self._async_client.query_points(
+            collection_name=self.collection_name,
+            prefetch=[
+                models.Prefetch(
+                    query=embedding,
+                    using=self.vector_name or None,
+                    filter=query_filter,
+                    limit=fetch_k,
+                    score_threshold=score_threshold,
+                    params=self.search_params
+                ),
+                models.Prefetch(
+                    query=models.SparseVector(indices=sparse.indices, values=sparse.values),
+                    using=self.sparse_vector_name,
+                    filter=query_filter,
+                    limit=fetch_k
+                )
+            ],
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=k,
+            with_payload=True,
+            with_vectors=with_vectors
+        )
+        return response.points
+
+    async def ahybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        score_threshold: Optional[float] = None,
+        fetch_k: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Fuse dense and BM25 rankings with reciprocal rank fusion, in one query.
+
+        Dense candidates below `score_threshold` are dropped before fusion;
+        keyword candidates only need to share a term with the query. In
+        dense mode this is a thresholded dense search.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results.
+            score_threshold (Optional[float]): Minimum cosine similarity of
+                dense candidates.
+            fetch_k (Optional[int]): Candidates taken from each ranking.
+                Defaults to max(4 * k, 20).
+            filter (Optional[Dict[str, Any]]): Metadata key -> value or list
+                of accepted values, applied to both rankings.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with RRF scores (cosine
+            similarities in dense mode), best first.
+        """
+        embedding = await self.embeddings.aembed_query(query)
+        points = await self._aquery(query, embedding, k, score_threshold, fetch_k or max(4 * k, 20), filter)
+        return self._results(points)
+
+    async def amax_marginal_relevance_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        score_threshold: Optional[float] = None,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Pick a diverse top-k from a wider candidate pool.
+
+        Fetches `fetch_k` candidates with their dense vectors in one query
+        (fused in hybrid mode) and re-ranks them with maximal marginal
+        relevance locally.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results.
+            fetch_k (int): Candidate pool size.
+            lambda_mult (float): 1 ranks by relevance only, 0 by diversity only.
+            score_threshold (Optional[float]): Minimum cosine similarity of
+                dense candidates.
+            filter (Optional[Dict[str, Any]]): Metadata key -> value or list
+                of accepted values.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents with their search scores,
+            in pick order.
+        """
+        embedding = await self.embeddings.aembed_query(query)
+        points = await self._aquery(query, embedding, fetch_k, score_threshold, fetch_k, filter, with_vectors=True)
+        vectors = [
+            point.vector.get(self.vector_name) if isinstance(point.vector, dict) else point.vector
+            for point in points
+        ]
+        return diversify(
+            self._results(points),
+            vectors,
+            k,
+            lambda_mult,
+            fused=self.retrieval_mode == RetrievalMode.HYBRID
+        )
+
+    def existing_ids(self, ids: Sequence[str]) -> Set[str]:
+        """
+        Return the subset of IDs already stored, in one retrieve call.
+
+        Args:
+            ids (Sequence[str]): Point IDs to check.
+
+        Returns:
+            Set[str]: IDs present in the collection.
+        """
+        if not ids:
+            return set()
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(ids),
+            with_payload=False,
+            with_vectors=False
+        )
+        return {str(record.id) for record in records}
+
+    async def aexisting_ids(self, ids: Sequence[str]) -> Set[str]:
+        """
+        Async variant of existing_ids.
+
+        Args:
+            ids (Sequence[str]): Point IDs to check.
+
+        Returns:
+            Set[str]: IDs present in the collection.
+        """
+        if not ids:
+            return set()
+        records = await self._async_client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(ids),
+            with_payload=False,
+            with_vectors=False
+        )
+        return {str(record.id) for record in records}
+
+    def add_documents(
+        self,
+        documents: List[Document],
+        ids: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Embed and upsert the documents that are not stored yet.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (Optional[Sequence[str]]): Explicit point IDs.
+
+        Returns:
+            List[str]: IDs of the points that were written.
+        """
+        documents, ids = unique_chunks(documents, ids)
+        existing = self.existing_ids(ids)
+        new = [(document, point_id) for document, point_id in zip(documents, ids) if point_id not in existing]
+        if not new:
+            return []
+        texts = [document.page_content for document, _ in new]
+        ids = [point_id for _, point_id in new]
+        points = self._points(
+            texts,
+            [document.metadata for document, _ in new],
+            ids,
+            self.embeddings.embed_documents(texts)
+        )
+        # upload_points batches and, with parallel > 1, uploads from worker
+        # processes; LangChain's add_texts sends 64-point batches one by one
+        self.client.upload_points(
+            collection_name=self.collection_name,
+            points=points,
+            batch_size=self.upsert_batch_size,
+            parallel=self.upsert_parallel if len(points) >= PARALLEL_UPLOAD_MIN_POINTS else 1,
+            wait=True
+        )
+        return ids
+
+    async def aadd_documents(
+        self,
+        documents: List[Document],
+        ids: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Async variant of add_documents.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (Optional[Sequence[str]]): Explicit point IDs.
+
+        Returns:
+            List[str]: IDs of the points that were written.
+        """
+        documents, ids = unique_chunks(documents, ids)
+        existing = await self.aexisting_ids(ids)
+        new = [(document, point_id) for document, point_id in zip(documents, ids) if point_id not in existing]
+        if not new:
+            return []
+        return await self.aadd_texts(
+            [document.page_content for document, _ in new],
+            [document.metadata for document, _ in new],
+            ids=[point_id for _, point_id in new],
+            **kwargs
+        )
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[Sequence[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Embed texts and upsert them asynchronously.
+
+        Args:
+            texts (Iterable[str]): Texts to add.
+            metadatas (Optional[List[dict]]): Metadata for each text.
+            ids (Optional[Sequence[str]]): Point IDs. Random UUIDs by default.
+
+        Returns:
+            List[str]: IDs of the upserted points.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in texts]
+        vectors = await self.embeddings.aembed_documents(texts)
+        return await self._aupsert(texts, metadatas, ids, vectors)
+
+    async def aadd_embeddings(
+        self,
+        documents: List[Document],
+        ids: Sequence[str],
+        vectors: List[List[float]],
+        wait: bool = True
+    ) -> List[str]:
+        """
+        Upsert documents that were already embedded.
+
+        Lets the ingestion pipeline run embedding and writing as separate
+        stages.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (Sequence[str]): Their point IDs.
+            vectors (List[List[float]]): Their embeddings.
+            wait (bool): Return only once Qdrant has applied the points.
+                With False they are acknowledged when queued; pass the last
+                point written to aflush before relying on them being
+                searchable.
+
+        Returns:
+            List[str]: IDs of the upserted points.
+        """
+        if not documents:
+            return []
+        return await self._aupsert(
+            [document.page_content for document in documents],
+            [document.metadata for document in documents],
+            list(ids),
+            vectors,
+            wait=wait
+        )
+
+    async def aflush(self, document: Document, point_id: str, vector: List[float]) -> None:
+        """
+        Wait until points upserted with wait=False have been applied.
+
+        Qdrant applies the updates of a collection in order, so upserting a
+        point again with wait=True, after the earlier upserts were
+        acknowledged, returns once all of them are applied too. Callers pass
+        one of their own points, so concurrent loads each wait for their
+        own writes.
+
+        Args:
+            document (Document): A document the caller upserted.
+            point_id (str): Its point ID.
+            vector (List[float]): Its embedding.
+        """
+        await self._aupsert([document.page_content], [document.metadata], [point_id], [vector])
+
+    async def _aupsert(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[dict]],
+        ids: List[str],
+        vectors: List[List[float]],
+        wait: bool = True
+    ) -> List[str]:
+        points = self._points(texts, metadatas, ids, vectors)
+
+        async def upsert(batch: List[models.PointStruct]) -> None:
+            async with self._upsert_slots:
+                await self._async_client.upsert(collection_name=self.collection_name, points=batch, wait=wait)
+
+        size = self.upsert_batch_size
+        await asyncio.gather(*(upsert(points[start:start + size]) for start in range(0, len(points), size)))
+        return ids
+
+    def _points(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[dict]],
+        ids: List[str],
+        vectors: List[List[float]]
+    ) -> List[models.PointStruct]:
+        payloads = self._build_payloads(
+            texts,
+            metadatas,
+            self.content_payload_key,
+            self.metadata_payload_key
+        )
+        if self.retrieval_mode == RetrievalMode.HYBRID:
+            sparse = self.sparse_embeddings.embed_documents(texts)
+            vectors = [
+                {
+                    self.vector_name: vector,
+                    self.sparse_vector_name: models.SparseVector(indices=weights.indices, values=weights.values)
+                }
+                for vector, weights in zip(vectors, sparse)
+            ]
+        elif self.vector_name:
+            vectors = [{self.vector_name: vector} for vector in vectors]
+        return [
+            models.PointStruct(id=point_id, vector=vector, payload=payload)
+            for point_id, vector, payload in zip(ids, vectors, payloads)
+        ]
+
 
 class QdrantVectorStoreManager(BaseVectorStoreManager):
     """Manager for Qdrant vector store."""
@@ -20,53 +575,261 @@ class QdrantVectorStoreManager(BaseVectorStoreManager):
             embeddings: Embedding model.
             config (VectorStoreConfig, optional): Configuration for vector store.
         """
-        super().__init__(embeddings)
-        self._config = config or VectorStoreConfig()
-        self._client = QdrantClient(url=self._config.url or "http://localhost:6333")
+        super().__init__(embeddings, config)
+        url = self._url = self._config.url or "http://localhost:6333"
+        # With prefer_grpc the clients speak gRPC (protobuf) on grpc_port
+        # instead of JSON over HTTP, which is cheaper for large upserts
+        transport = {"prefer_grpc": self._config.prefer_grpc, "grpc_port": self._config.grpc_port}
+        self._client = QdrantClient(url=url, **transport)
+        self._async_client = AsyncQdrantClient(url=url, **transport)
+        registry = create_source_registry()
+        # Records are kept per server and collection, so a fresh server or
+        # another collection_name does not inherit sources it never stored
+        self.registry = registry.scoped(self._registry_scope(self._config.collection_name)) if registry else None
+        self._vector_store: Optional[AsyncQdrantVectorStore] = None
+        # Collections known to exist, shared with the namespace managers
+        self._ready_collections: Set[str] = set()
+
+    def _scoped(self, collection_name: str) -> "QdrantVectorStoreManager":
+        """Manager of another collection on the same clients and registry cache."""
+        scoped = copy.copy(self)
+        scoped._config = copy.copy(self._config)
+        scoped._config.collection_name = collection_name
+        scoped._vector_store = None
+        scoped.registry = (
+            self.registry.scoped(self._registry_scope(collection_name)) if self.registry is not None else None
+        )
+        return scoped
+
+    def _registry_scope(self, collection_name: str) -> str:
+        """Registry namespace of a collection on this manager's server."""
+        return f"{self._url}/{collection_name}"
     
-    def create_vector_store(self) -> QdrantVectorStore:
-        """
-        Create a Qdrant vector store.
-        
-        Returns:
-            QdrantVectorStore: Configured Qdrant vector store.
-        """
-        print("Using Qdrant for vector storage")
+    def _ensure_collection(self) -> None:
+        """Create the collection and its payload indexes, once per collection."""
+        if self._config.collection_name in self._ready_collections:
+            return
         
         # Check and create collection if not exists
         try:
-            self._client.get_collection(collection_name=self._config.collection_name)
+            collection = self._client.get_collection(collection_name=self._config.collection_name)
             print(f"Collection '{self._config.collection_name}' already exists.")
         except Exception:
             print(f"Collection '{self._config.collection_name}' does not exist, creating it.")
+            # Records of a collection that was dropped point at nothing
+            if self.registry is not None and self.registry.clear():
+                print(f"Cleared stale source records of '{self._config.collection_name}'.")
             self._client.create_collection(
                 collection_name=self._config.collection_name,
                 vectors_config={
                     "size": self._config.vector_size, 
                     "distance": self._config.distance_metric
-                }
+                },
+                sparse_vectors_config=self._sparse_vectors_config(),
+                quantization_config=self._quantization_config()
             )
+        else:
+            sparse_vectors = collection.config.params.sparse_vectors or {}
+            if self._sparse_vectors_config() and SPARSE_VECTOR_NAME not in sparse_vectors:
+                # Qdrant cannot add a sparse vector to an existing collection
+                raise ValueError(
+                    f"Collection '{self._config.collection_name}' was created without the "
+                    f"'{SPARSE_VECTOR_NAME}' sparse vector that hybrid retrieval needs. Delete and "
+                    f"re-index it, or configure a new collection_name, to use "
+                    f"RETRIEVAL_MODE=hybrid."
+                )
         
-        return QdrantVectorStore(
+        # Keyword index so per-source filters are index lookups, not scans.
+        # Creating an index that already exists is a no-op.
+        self._client.create_payload_index(
+            collection_name=self._config.collection_name,
+            field_name=SOURCE_FIELD,
+            field_schema=models.PayloadSchemaType.KEYWORD
+        )
+        # Indexes for the other metadata fields requests filter on
+        for field, schema in self._config.indexed_fields.items():
+            self._client.create_payload_index(
+                collection_name=self._config.collection_name,
+                field_name=f"metadata.{field}",
+                field_schema=models.PayloadSchemaType(schema)
+            )
+        self._ready_collections.add(self._config.collection_name)
+
+    def create_vector_store(self) -> AsyncQdrantVectorStore:
+        """
+        Return the manager's Qdrant vector store, creating it (and the
+        collection, if missing) on first use.
+
+        Returns:
+            AsyncQdrantVectorStore: Configured Qdrant vector store.
+        """
+        if self._vector_store is None:
+            print(f"Using Qdrant collection '{self._config.collection_name}' for vector storage")
+            # A collection already checked (e.g. before its handle was evicted
+            # from the pool) needs neither our check nor LangChain's
+            known = self._config.collection_name in self._ready_collections
+            self._ensure_collection()
+            self._vector_store = self._new_vector_store(validate=not known)
+        return self._vector_store
+
+    def _new_vector_store(self, validate: bool = True) -> AsyncQdrantVectorStore:
+        """Store handle of the manager's collection; validate=False skips LangChain's collection check."""
+        hybrid = {}
+        if self._config.retrieval_mode == RETRIEVAL_HYBRID:
+            hybrid = {
+                "retrieval_mode": RetrievalMode.HYBRID,
+                "sparse_embedding": BM25SparseEmbeddings(),
+                "sparse_vector_name": SPARSE_VECTOR_NAME
+            }
+        return AsyncQdrantVectorStore(
+            async_client=self._async_client,
+            search_params=self._search_params(),
+            upsert_batch_size=self._config.upsert_batch_size,
+            upsert_parallel=self._config.upsert_parallel,
             client=self._client, 
             collection_name=self._config.collection_name, 
-            embedding=self._embeddings
+            embedding=self._embeddings,
+            validate_collection_config=validate,
+            **hybrid
         )
     
+    def _sparse_vectors_config(self) -> Optional[Dict[str, models.SparseVectorParams]]:
+        """BM25 sparse vector of hybrid mode; Qdrant applies the IDF factor."""
+        if self._config.retrieval_mode != RETRIEVAL_HYBRID:
+            return None
+        return {SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)}
+
+    def _quantization_config(self) -> Optional[models.QuantizationConfig]:
+        """
+        Qdrant quantization for new collections. Quantized vectors are kept
+        in RAM while the originals may stay on disk for rescoring.
+        """
+        quantization = self._config.quantization
+        if quantization == QUANTIZATION_SCALAR:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+        if quantization == QUANTIZATION_BINARY:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        if quantization not in (None, QUANTIZATION_NONE):
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        return None
+
+    def _search_params(self) -> Optional[models.SearchParams]:
+        """Rescoring and oversampling applied to searches on quantized collections."""
+        if self._config.quantization in (None, QUANTIZATION_NONE):
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=self._config.rescore,
+                oversampling=self._config.oversampling
+            )
+        )
+
     def document_exists(self, identifier: str) -> bool:
         """
         Check if a document exists in the Qdrant vector store.
         
+        Looks the source up in the registry first; sources it does not know
+        (e.g. loaded before it existed) are checked with a one-point scroll
+        over the indexed `metadata.source` payload field.
+
         Args:
             identifier (str): URL or unique identifier.
         
         Returns:
             bool: True if document exists, False otherwise.
         """
-        vector_store = self.create_vector_store()
-        results = vector_store.similarity_search(identifier, k=1)
-        return len(results) > 0
+        if self.registry is not None and self.registry.exists(identifier):
+            return True
+        self._ensure_collection()
+        points, _ = self._client.scroll(
+            collection_name=self._config.collection_name,
+            scroll_filter=source_filter(identifier),
+            limit=1,
+            with_payload=False,
+            with_vectors=False
+        )
+        return len(points) > 0
     
+    def existing_sources(self, sources: List[str]) -> Set[str]:
+        """
+        Subset of sources that are already indexed, in two round-trips at
+        most: one registry lookup for all of them, and one facet count over
+        the indexed source field for those the registry does not know.
+
+        Args:
+            sources (List[str]): URLs or unique identifiers.
+
+        Returns:
+            Set[str]: Sources with chunks in the collection.
+        """
+        if not sources:
+            return set()
+        known = self.registry.exists_many(sources) if self.registry is not None else [False] * len(sources)
+        existing = {source for source, found in zip(sources, known) if found}
+        unknown = [source for source, found in zip(sources, known) if not found]
+        if unknown:
+            self._ensure_collection()
+            response = self._client.facet(
+                collection_name=self._config.collection_name,
+                key=SOURCE_FIELD,
+                facet_filter=models.Filter(
+                    must=[models.FieldCondition(key=SOURCE_FIELD, match=models.MatchAny(any=unknown))]
+                ),
+                limit=len(unknown)
+            )
+            existing.update(hit.value for hit in response.hits)
+        return existing
+
+    def source_point_ids(self, source: str) -> List[str]:
+        """
+        IDs of the chunks stored for a source. Falls back to scrolling the
+        indexed source field for sources missing from the registry.
+
+        Args:
+            source (str): URL or unique identifier.
+
+        Returns:
+            List[str]: Point IDs.
+        """
+        ids = super().source_point_ids(source)
+        if ids:
+            return ids
+        self._ensure_collection()
+        offset = None
+        while True:
+            points, offset = self._client.scroll(
+                collection_name=self._config.collection_name,
+                scroll_filter=source_filter(source),
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False
+            )
+            ids.extend(str(point.id) for point in points)
+            if offset is None:
+                return ids
+
+    def delete_points(self, ids: List[str]) -> None:
+        """
+        Delete chunks by point ID.
+
+        Args:
+            ids (List[str]): Point IDs to delete.
+        """
+        if ids:
+            self._client.delete(
+                collection_name=self._config.collection_name,
+                points_selector=models.PointIdsList(points=ids)
+            )
+
     def add_documents(self, documents: List[Document]) -> None:
         """
         Add documents to the Qdrant vector store.
@@ -75,4 +838,13 @@ class QdrantVectorStoreManager(BaseVectorStoreManager):
             documents (List[Document]): Documents to add.
         """
         vector_store = self.create_vector_store()
-        vector_store.add_documents(documents)
\ No newline at end of file
+        vector_store.add_documents(documents)
+
+    def close(self) -> None:
+        """Close the Qdrant client."""
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """Close the sync and async Qdrant clients."""
+        self._client.close()
+        await self._async_client.close()
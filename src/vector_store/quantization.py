@@ -0,0 +1,99 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+QUANTIZATION_NONE = "none"
+QUANTIZATION_SCALAR = "scalar"
+QUANTIZATION_BINARY = "binary"
+
+# Rows scored per block; small enough for the float32 copy to stay in cache
+_BLOCK_ROWS = 4096
+
+
+class ScalarQuantizer:
+    """
+    int8 scalar quantization with one scale per row.
+
+    Each normalised vector is stored as round(v * 127 / max|v|) plus its
+    float32 scale: 4x smaller than float32, with scores close enough to
+    rank candidates before full-precision rescoring.
+    """
+
+    kind = QUANTIZATION_SCALAR
+
+    def widths(self, dimension: int) -> Dict[str, tuple]:
+        """Width and dtype of every matrix the quantizer stores."""
+        return {"codes": (dimension, np.int8), "scales": (1, np.float32)}
+
+    def encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        peaks = np.abs(vectors).max(axis=1, keepdims=True)
+        peaks[peaks == 0] = 1.0
+        codes = np.rint(vectors * (127.0 / peaks)).astype(np.int8)
+        return {"codes": codes, "scales": (peaks / 127.0).astype(np.float32)}
+
+    def scores(self, matrices: Dict[str, np.ndarray], query: np.ndarray) -> np.ndarray:
+        codes, scales = matrices["codes"], matrices["scales"]
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], _BLOCK_ROWS):
+            end = start + _BLOCK_ROWS
+            scores[start:end] = (codes[start:end].astype(np.float32) @ query) * scales[start:end, 0]
+        return scores
+
+
+class BinaryQuantizer:
+    """
+    1-bit quantization: the sign of every component, packed 8 per byte.
+
+    32x smaller than float32. Similarity is estimated from the Hamming
+    distance between sign patterns, which is coarse, so it should be used
+    with rescoring and some oversampling.
+    """
+
+    kind = QUANTIZATION_BINARY
+
+    # Set bits per byte value, for NumPy versions without bitwise_count
+    _POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+    def widths(self, dimension: int) -> Dict[str, tuple]:
+        return {"codes": ((dimension + 7) // 8, np.uint8)}
+
+    def encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        return {"codes": np.packbits(vectors > 0, axis=1)}
+
+    def scores(self, matrices: Dict[str, np.ndarray], query: np.ndarray) -> np.ndarray:
+        codes = matrices["codes"]
+        query_bits = np.packbits(query > 0)
+        dimension = query.shape[0]
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], _BLOCK_ROWS):
+            xor = np.bitwise_xor(codes[start:start + _BLOCK_ROWS], query_bits)
+            if hasattr(np, "bitwise_count"):
+                distance = np.bitwise_count(xor).sum(axis=1, dtype=np.int32)
+            else:
+                distance = self._POPCOUNT[xor].sum(axis=1, dtype=np.int32)
+            scores[start:start + _BLOCK_ROWS] = 1.0 - 2.0 * distance / dimension
+        return scores
+
+
+def create_quantizer(kind: Optional[str]):
+    """
+    Build the quantizer for a VectorStoreConfig.quantization value.
+
+    Args:
+        kind (Optional[str]): 'none', 'scalar' or 'binary'.
+
+    Returns:
+        Quantizer instance, or None for full precision.
+
+    Raises:
+        ValueError: If the quantization kind is unknown.
+    """
+    if kind in (None, QUANTIZATION_NONE):
+        return None
+    quantizers = {
+        QUANTIZATION_SCALAR: ScalarQuantizer,
+        QUANTIZATION_BINARY: BinaryQuantizer
+    }
+    if kind not in quantizers:
+        raise ValueError(f"Unsupported quantization: {kind}")
+    return quantizers[kind]()
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain.docstore.document import Document
+
+from src.cache.base import BaseCacheManager
+from src.cache.disk_cache import DiskCacheConfig, DiskCacheManager
+from src.cache.redis_cache import RedisCacheConfig, RedisCacheManager
+from src.utils.hashing import normalize_text
+
+
+class SourceRecord:
+    """What the registry knows about one ingested source."""
+
+    def __init__(
+        self,
+        source: str,
+        chunk_count: int,
+        content_hash: str,
+        point_ids: Sequence[str],
+        ingested_at: Optional[float] = None,
+        fingerprint: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize a source record.
+
+        Args:
+            source (str): URL or file path the chunks were loaded from.
+            chunk_count (int): Number of distinct chunks indexed.
+            content_hash (str): Hash of the chunk texts, in order.
+            point_ids (Sequence[str]): Vector store IDs of the chunks.
+            ingested_at (Optional[float]): Unix time of the ingestion.
+            fingerprint (Optional[Dict[str, Any]]): Loader fingerprint (HTTP
+                validators, file size/mtime/hash) used to skip unchanged
+                sources on refresh.
+        """
+        self.source = source
+        self.chunk_count = chunk_count
+        self.content_hash = content_hash
+        self.point_ids = list(point_ids)
+        self.ingested_at = ingested_at if ingested_at is not None else time.time()
+        self.fingerprint = fingerprint
+
+    def summary(self) -> Dict[str, Any]:
+        """Record without the point IDs, for listings."""
+        return {
+            "source": self.source,
+            "chunk_count": self.chunk_count,
+            "content_hash": self.content_hash,
+            "ingested_at": self.ingested_at
+        }
+
+    def to_json(self) -> str:
+        return json.dumps({**self.summary(), "point_ids": self.point_ids, "fingerprint": self.fingerprint})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SourceRecord":
+        return cls(**json.loads(raw))
+
+
+class SourceDigest:
+    """
+    Builds a SourceRecord from chunks that arrive one at a time, so a
+    streamed source is registered without keeping its chunks around.
+    """
+
+    def __init__(self):
+        self.point_ids: List[str] = []
+        self._seen = set()
+        self._hash = hashlib.sha256()
+        self._empty = True
+
+    def add(self, document: Document, point_id: str) -> bool:
+        """
+        Account for a chunk, in source order.
+
+        Args:
+            document (Document): Chunk.
+            point_id (str): Its deterministic ID.
+
+        Returns:
+            bool: False if the chunk was already added.
+        """
+        if point_id in self._seen:
+            return False
+        self._seen.add(point_id)
+        self.point_ids.append(point_id)
+        # Same digest as content_hash() of the chunks joined by newlines
+        text = normalize_text(document.page_content)
+        if text:
+            if not self._empty:
+                self._hash.update(b" ")
+            self._hash.update(text.encode("utf-8"))
+            self._empty = False
+        return True
+
+    @property
+    def content_hash(self) -> str:
+        return self._hash.hexdigest()
+
+    def to_record(self, source: str, fingerprint: Optional[Dict[str, Any]] = None) -> SourceRecord:
+        """
+        Record of the chunks added so far.
+
+        Args:
+            source (str): Source identifier.
+            fingerprint (Optional[Dict[str, Any]]): Loader fingerprint.
+
+        Returns:
+            SourceRecord: Record with the chunks' IDs and content hash.
+        """
+        return SourceRecord(
+            source=source,
+            chunk_count=len(self.point_ids),
+            content_hash=self.content_hash,
+            point_ids=self.point_ids,
+            fingerprint=fingerprint
+        )
+
+
+class SourceRegistry:
+    """
+    Keyed registry of ingested sources on top of a cache manager.
+
+    Each source is one entry, so looking a source up costs a single key
+    read instead of an embedding plus a vector search. Registries of
+    namespaced collections share the cache under their own key prefix.
+    """
+
+    KEY_PREFIX = "source:"
+
+    def __init__(self, cache_manager: BaseCacheManager, namespace: Optional[str] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            cache_manager (BaseCacheManager): Store for the records. It should
+                not evict entries.
+            namespace (Optional[str]): Collection the records belong to; None
+                for the default collection.
+        """
+        self._cache = cache_manager
+        self.namespace = namespace
+        self._prefix = f"{namespace}/{self.KEY_PREFIX}" if namespace else self.KEY_PREFIX
+
+    def _key(self, source: str) -> str:
+        return f"{self._prefix}{source}"
+
+    def scoped(self, namespace: str) -> "SourceRegistry":
+        """Registry of another collection on the same cache."""
+        return SourceRegistry(self._cache, namespace)
+
+    def exists(self, source: str) -> bool:
+        """Whether the source has been registered."""
+        return bool(self._cache.is_cached(self._key(source)))
+
+    def exists_many(self, sources: List[str]) -> List[bool]:
+        """Whether each source has been registered, in one lookup."""
+        return self._cache.exists_many([self._key(source) for source in sources])
+
+    def get(self, source: str) -> Optional[SourceRecord]:
+        """Record of a source, or None if it is not registered."""
+        return self.get_many([source])[0]
+
+    def get_many(self, sources: List[str]) -> List[Optional[SourceRecord]]:
+        """Records of several sources in one lookup, None where missing."""
+        values = self._cache.get_many([self._key(source) for source in sources])
+        return [SourceRecord.from_json(value) if value is not None else None for value in values]
+
+    def record(self, record: SourceRecord) -> None:
+        """Register (or replace) a source."""
+        self._cache.set_many({self._key(record.source): record.to_json()})
+
+    def remove(self, source: str) -> None:
+        """Forget a source."""
+        self._cache.delete(self._key(source))
+
+    def clear(self) -> int:
+        """
+        Forget every source of the registry's collection.
+
+        Returns:
+            int: Number of records removed.
+        """
+        keys = self._cache.keys(self._prefix)
+        for key in keys:
+            self._cache.delete(key)
+        return len(keys)
+
+    def sources(self) -> List[str]:
+        """Registered sources, sorted."""
+        return sorted(key[len(self._prefix):] for key in self._cache.keys(self._prefix))
+
+    def records(self) -> List[SourceRecord]:
+        """Records of every registered source."""
+        return [record for record in self.get_many(self.sources()) if record is not None]
+
+
+def create_source_registry(
+    backend: Optional[str] = None,
+    path: Optional[str] = None
+) -> Optional[SourceRegistry]:
+    """
+    Create a source registry.
+
+    Args:
+        backend (Optional[str]): 'disk', 'redis' or 'none'. Falls back to
+            SOURCE_REGISTRY (default 'disk').
+        path (Optional[str]): SQLite file of the disk backend. Falls back to
+            SOURCE_REGISTRY_PATH (default '.cache/sources.sqlite3').
+
+    Returns:
+        Optional[SourceRegistry]: Registry, or None when disabled.
+    """
+    backend = (backend or os.getenv("SOURCE_REGISTRY", "disk")).lower()
+    if backend == "none":
+        return None
+    if backend == "redis":
+        return SourceRegistry(RedisCacheManager(RedisCacheConfig()))
+    if backend == "disk":
+        path = path or os.getenv("SOURCE_REGISTRY_PATH", ".cache/sources.sqlite3")
+        return SourceRegistry(DiskCacheManager(DiskCacheConfig(path=path, max_entries=0)))
+    raise ValueError(f"Unsupported source registry: {backend}")
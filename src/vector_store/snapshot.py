@@ -0,0 +1,220 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+
+# Suffix of raw matrix files by dtype, e.g. vectors.f32, codes.i8
+_DTYPE_SUFFIXES = {"float32": "f32", "int8": "i8", "uint8": "u8", "int32": "i32"}
+
+# Payload columns: name -> (encode, decode)
+COLUMNS: Dict[str, tuple] = {
+    "ids": (lambda value: value.encode("utf-8"), lambda raw: raw.decode("utf-8")),
+    "texts": (lambda value: value.encode("utf-8"), lambda raw: raw.decode("utf-8")),
+    "metadatas": (
+        lambda value: json.dumps(value, default=str).encode("utf-8"),
+        lambda raw: json.loads(raw.decode("utf-8"))
+    ),
+}
+
+
+def _map(path: str, dtype, shape=None) -> np.ndarray:
+    """Read-only memory map; zero-length files map to an empty array."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(shape or (0,), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class MappedColumn:
+    """
+    Append-only column backed by a memory-mapped blob and offsets file.
+
+    Rows from the snapshot are decoded lazily on access, so opening a
+    snapshot does not read its payload; rows appended afterwards are kept
+    in an in-memory tail until the next save.
+    """
+
+    def __init__(self, directory: str, name: str, decode: Callable[[bytes], Any], count: int):
+        self._blob = _map(os.path.join(directory, f"{name}.bin"), np.uint8)
+        self._offsets = _map(os.path.join(directory, f"{name}.idx"), np.int64)
+        self._decode = decode
+        # Rows past the manifest count belong to a save still in progress
+        self._base = min(max(len(self._offsets) - 1, 0), count)
+        self._tail: List[Any] = []
+
+    def __len__(self) -> int:
+        return self._base + len(self._tail)
+
+    def __getitem__(self, row: int) -> Any:
+        if isinstance(row, slice):
+            return [self[index] for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if row < self._base:
+            start, end = self._offsets[row], self._offsets[row + 1]
+            return self._decode(self._blob[start:end].tobytes())
+        return self._tail[row - self._base]
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def append(self, value: Any) -> None:
+        self._tail.append(value)
+
+
+def _target(path: str, append: bool) -> str:
+    """
+    File to write: the file itself when appending, otherwise a temporary
+    sibling that replaces it afterwards. Rewriting in place would truncate
+    a file other processes may have memory-mapped.
+    """
+    return path if append else path + ".tmp"
+
+
+def _truncate(path: str, size: int) -> None:
+    """
+    Cut a file back to the bytes the manifest accounts for.
+
+    A save that crashed before writing its manifest leaves rows past the
+    persisted count; appending after them would misalign every later row.
+    Readers never map past the manifest count, so the cut bytes are unused.
+    """
+    actual = os.path.getsize(path) if os.path.exists(path) else 0
+    if actual < size:
+        raise ValueError(f"Snapshot file {path} holds {actual} bytes, expected at least {size}")
+    if actual > size:
+        os.truncate(path, size)
+
+
+def _write_column(directory: str, name: str, values: Sequence[Any], start: int) -> None:
+    encode = COLUMNS[name][0]
+    blob_path = os.path.join(directory, f"{name}.bin")
+    index_path = os.path.join(directory, f"{name}.idx")
+    append = start > 0
+
+    offset = 0
+    if append:
+        _truncate(index_path, (start + 1) * 8)
+        offset = int(np.fromfile(index_path, dtype=np.int64, count=1, offset=start * 8)[0])
+        _truncate(blob_path, offset)
+    offsets = [] if append else [0]
+    with open(_target(blob_path, append), "ab" if append else "wb") as blob:
+        for value in values:
+            raw = encode(value)
+            blob.write(raw)
+            offset += len(raw)
+            offsets.append(offset)
+    with open(_target(index_path, append), "ab" if append else "wb") as index:
+        index.write(np.asarray(offsets, dtype=np.int64).tobytes())
+
+
+def write_snapshot(
+    directory: str,
+    matrices: Dict[str, np.ndarray],
+    columns: Dict[str, Sequence[Any]],
+    manifest: Dict[str, Any],
+    start: int = 0,
+    arrays: Optional[Dict[str, np.ndarray]] = None
+) -> None:
+    """
+    Write (or extend) a snapshot.
+
+    Appends first cut the files back to the persisted row count, then
+    extend them in place; rewrites go to temporary files that replace the
+    old ones, so processes mapping the previous snapshot keep a
+    consistent view. The manifest is written last, so a reader never sees a
+    row count larger than the data on disk.
+
+    Args:
+        directory (str): Snapshot directory.
+        matrices (Dict[str, np.ndarray]): Row-aligned 2-D arrays to write from
+            row `start` on; "vectors" holds the float32 embeddings.
+        columns (Dict[str, Sequence[Any]]): Payload columns for the same rows.
+        manifest (Dict[str, Any]): Manifest entries (dimension, count, ...).
+        start (int): First row to write. 0 rewrites the snapshot; a value
+            equal to the persisted count appends the new rows.
+        arrays (Optional[Dict[str, np.ndarray]]): Small arrays that are not
+            row-aligned (e.g. IVF centroids); rewritten on every save.
+    """
+    os.makedirs(directory, exist_ok=True)
+    append = start > 0
+
+    matrix_entries = {}
+    matrix_paths = []
+    for name, matrix in matrices.items():
+        dtype = np.dtype(matrix.dtype).name
+        file_name = f"{name}.{_DTYPE_SUFFIXES[dtype]}"
+        matrix_entries[name] = {"file": file_name, "dtype": dtype, "width": int(matrix.shape[1])}
+        matrix_paths.append(os.path.join(directory, file_name))
+        if append:
+            _truncate(matrix_paths[-1], start * matrix.shape[1] * matrix.dtype.itemsize)
+        with open(_target(matrix_paths[-1], append), "ab" if append else "wb") as handle:
+            handle.write(np.ascontiguousarray(matrix).tobytes())
+    for name in COLUMNS:
+        _write_column(directory, name, columns[name], start)
+    for name, array in (arrays or {}).items():
+        path = os.path.join(directory, f"{name}.npy")
+        with open(path + ".tmp", "wb") as handle:
+            np.save(handle, array)
+        os.replace(path + ".tmp", path)
+
+    if not append:
+        paths = matrix_paths + [
+            os.path.join(directory, f"{name}.{extension}")
+            for name in COLUMNS
+            for extension in ("bin", "idx")
+        ]
+        for path in paths:
+            os.replace(path + ".tmp", path)
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path + ".tmp", "w") as handle:
+        json.dump({
+            "version": SNAPSHOT_VERSION,
+            "matrices": matrix_entries,
+            "arrays": sorted(arrays or {}),
+            **manifest
+        }, handle)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def snapshot_exists(directory: str) -> bool:
+    """Whether a snapshot manifest exists in the directory."""
+    return os.path.isfile(os.path.join(directory, MANIFEST_FILE))
+
+
+def read_snapshot(directory: str) -> Dict[str, Any]:
+    """
+    Open a snapshot without reading its data.
+
+    Args:
+        directory (str): Snapshot directory.
+
+    Returns:
+        Dict[str, Any]: The manifest plus one read-only np.memmap per matrix
+        (`vectors` has shape (count, dimension)), the small arrays, and one
+        MappedColumn per payload column.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as handle:
+        manifest = json.load(handle)
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+
+    count = manifest["count"]
+    snapshot = dict(manifest)
+    for name, entry in manifest["matrices"].items():
+        snapshot[name] = _map(
+            os.path.join(directory, entry["file"]),
+            np.dtype(entry["dtype"]),
+            (count, entry["width"])
+        )
+    for name in manifest.get("arrays", []):
+        snapshot[name] = np.load(os.path.join(directory, f"{name}.npy"))
+    for name, (_, decode) in COLUMNS.items():
+        snapshot[name] = MappedColumn(directory, name, decode, count)
+    return snapshot
@@ -0,0 +1,284 @@
+import math
+import os
+import re
+import threading
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from langchain_qdrant import SparseEmbeddings, SparseVector
+
+RETRIEVAL_DENSE = "dense"
+RETRIEVAL_HYBRID = "hybrid"
+
+# Words joined by '-', '.', '_' or '/' stay one token (ERR-1042, v2.3.1),
+# so identifiers and error codes match exactly.
+_TOKEN = re.compile(r"\w+(?:[-./]\w+)*")
+_PART = re.compile(r"[^\W_]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or "
+    "that the this to was were will with".split()
+)
+
+SPARSE_FILE = "sparse.npz"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased terms of a text for keyword matching.
+
+    Compound tokens (ERR-1042, snake_case, v2.3.1) are kept whole and also
+    contribute their alphanumeric parts, so both the exact identifier and
+    its pieces match. Common English stopwords are dropped.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        List[str]: Terms, with repeats.
+    """
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        parts = _PART.findall(token)
+        if len(parts) > 1 or parts != [token]:
+            terms.extend(part for part in parts if part not in _STOPWORDS)
+        if token not in _STOPWORDS:
+            terms.append(token)
+    return terms
+
+
+def term_counts(text: str) -> Counter:
+    """Term frequencies of a text, keyed by 32-bit term hash."""
+    return Counter(zlib.crc32(term.encode("utf-8")) for term in tokenize(text))
+
+
+class BM25SparseEmbeddings(SparseEmbeddings):
+    """
+    BM25 term weights as Qdrant sparse vectors.
+
+    Documents get the saturated, length-normalised term frequency of BM25;
+    the IDF factor is applied by Qdrant at query time (Modifier.IDF), so
+    weights never need recomputing as the collection grows. Queries are
+    the set of their terms with weight 1.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_length: float = 80.0):
+        """
+        Initialize the encoder.
+
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Length normalisation.
+            avg_length (float): Expected terms per chunk; about 80 for the
+                default 500-character chunks.
+        """
+        self.k1 = k1
+        self.b = b
+        self.avg_length = avg_length
+
+    def _encode(self, text: str) -> SparseVector:
+        counts = term_counts(text)
+        norm = self.k1 * (1 - self.b + self.b * sum(counts.values()) / self.avg_length)
+        indices = sorted(counts)
+        return SparseVector(
+            indices=indices,
+            values=[counts[term] * (self.k1 + 1) / (counts[term] + norm) for term in indices]
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        return [self._encode(text) for text in texts]
+
+    def embed_query(self, text: str) -> SparseVector:
+        indices = sorted(term_counts(text))
+        return SparseVector(indices=indices, values=[1.0] * len(indices))
+
+
+class SparseIndex:
+    """
+    In-process BM25 inverted index, keyed by point ID.
+
+    Postings are compact int32/float32 arrays per hashed term, so a query
+    scores all matching chunks with a few vectorised operations per term.
+    Deleted or overwritten chunks are tombstoned and dropped from the
+    postings on the next save.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Length normalisation.
+        """
+        self.k1 = k1
+        self.b = b
+        # term -> (document ordinals, term frequencies)
+        self._postings: Dict[int, Tuple[array, array]] = {}
+        self._ids: List[str] = []
+        self._ordinals: Dict[str, int] = {}
+        self._lengths = array("f")
+        self._alive = array("b")
+        self._live = 0
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _remove(self, point_id: str) -> None:
+        ordinal = self._ordinals.pop(point_id, None)
+        if ordinal is not None:
+            self._alive[ordinal] = 0
+            self._live -= 1
+            self._total_length -= self._lengths[ordinal]
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        Index or re-index chunks.
+
+        Args:
+            ids (Sequence[str]): Point IDs; existing IDs are replaced.
+            texts (Sequence[str]): Chunk texts.
+        """
+        counts = [term_counts(text) for text in texts]
+        with self._lock:
+            for point_id, terms in zip(ids, counts):
+                self._remove(point_id)
+                ordinal = len(self._ids)
+                self._ids.append(point_id)
+                self._ordinals[point_id] = ordinal
+                length = float(sum(terms.values()))
+                self._lengths.append(length)
+                self._alive.append(1)
+                self._live += 1
+                self._total_length += length
+                for term, count in terms.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = (array("i"), array("f"))
+                    postings[0].append(ordinal)
+                    postings[1].append(count)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """Remove chunks by point ID."""
+        with self._lock:
+            for point_id in ids:
+                self._remove(point_id)
+
+    def search(self, query: str, k: int = 4, allowed: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        BM25 top-k.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of results.
+            allowed (Optional[Set[str]]): Only rank these point IDs.
+
+        Returns:
+            List[Tuple[str, float]]: (point ID, BM25 score), best first;
+            only chunks sharing at least one term with the query.
+        """
+        terms = term_counts(query)
+        with self._lock:
+            if not self._live or k <= 0:
+                return []
+            alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+            lengths = np.frombuffer(self._lengths, dtype=np.float32)
+            norms = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / self._live))
+            scores = np.zeros(len(self._ids), dtype=np.float32)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                ordinals = np.array(postings[0], dtype=np.int32)
+                frequencies = np.array(postings[1], dtype=np.float32)
+                live = alive[ordinals]
+                ordinals, frequencies = ordinals[live], frequencies[live]
+                if not ordinals.shape[0]:
+                    continue
+                df = ordinals.shape[0]
+                idf = math.log(1 + (self._live - df + 0.5) / (df + 0.5))
+                scores[ordinals] += idf * frequencies * (self.k1 + 1) / (frequencies + norms[ordinals])
+            del alive, lengths
+            matched = np.flatnonzero(scores > 0)
+            if allowed is not None:
+                matched = matched[np.fromiter(
+                    (self._ids[ordinal] in allowed for ordinal in matched), dtype=bool, count=matched.shape[0]
+                )]
+            if not matched.shape[0]:
+                return []
+            k = min(k, matched.shape[0])
+            top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(self._ids[ordinal], float(scores[ordinal])) for ordinal in top]
+
+    def save(self, directory: str) -> None:
+        """
+        Write the live postings to `sparse.npz` in a snapshot directory.
+
+        Args:
+            directory (str): Snapshot directory.
+        """
+        with self._lock:
+            live = [ordinal for ordinal, alive in enumerate(self._alive) if alive]
+            remap = np.full(len(self._ids), -1, dtype=np.int32)
+            remap[live] = np.arange(len(live), dtype=np.int32)
+            terms, offsets, ordinals, frequencies = [], [0], [], []
+            for term, (term_ordinals, term_frequencies) in self._postings.items():
+                mapped = remap[np.array(term_ordinals, dtype=np.int32)]
+                kept = mapped >= 0
+                if not kept.any():
+                    continue
+                terms.append(term)
+                ordinals.append(mapped[kept])
+                frequencies.append(np.array(term_frequencies, dtype=np.float32)[kept])
+                offsets.append(offsets[-1] + int(kept.sum()))
+            os.makedirs(directory, exist_ok=True)
+            temporary = os.path.join(directory, f".{SPARSE_FILE}")
+            with open(temporary, "wb") as handle:
+                np.savez(
+                    handle,
+                    ids=np.array([self._ids[ordinal] for ordinal in live], dtype=str),
+                    lengths=np.array([self._lengths[ordinal] for ordinal in live], dtype=np.float32),
+                    terms=np.array(terms, dtype=np.uint32),
+                    offsets=np.array(offsets, dtype=np.int64),
+                    ordinals=np.concatenate(ordinals) if ordinals else np.zeros(0, dtype=np.int32),
+                    frequencies=np.concatenate(frequencies) if frequencies else np.zeros(0, dtype=np.float32)
+                )
+            os.replace(temporary, os.path.join(directory, SPARSE_FILE))
+
+    @classmethod
+    def load(cls, directory: str, k1: float = 1.2, b: float = 0.75) -> Optional["SparseIndex"]:
+        """
+        Read the postings saved in a snapshot directory.
+
+        Args:
+            directory (str): Snapshot directory.
+            k1 (float): Term frequency saturation.
+            b (float): Length normalisation.
+
+        Returns:
+            Optional[SparseIndex]: Index, or None if the snapshot has none.
+        """
+        path = os.path.join(directory, SPARSE_FILE)
+        if not os.path.exists(path):
+            return None
+        index = cls(k1, b)
+        with np.load(path) as data:
+            index._ids = data["ids"].tolist()
+            index._ordinals = {point_id: ordinal for ordinal, point_id in enumerate(index._ids)}
+            index._lengths = array("f", data["lengths"].tobytes())
+            index._alive = array("b", bytes([1]) * len(index._ids))
+            index._live = len(index._ids)
+            index._total_length = float(data["lengths"].sum())
+            offsets, ordinals, frequencies = data["offsets"], data["ordinals"], data["frequencies"]
+            for position, term in enumerate(data["terms"].tolist()):
+                start, end = offsets[position], offsets[position + 1]
+                index._postings[term] = (
+                    array("i", ordinals[start:end].astype(np.int32).tobytes()),
+                    array("f", frequencies[start:end].astype(np.float32).tobytes())
+                )
+        return index